@@ -9,13 +9,18 @@ This application combines:
 - Admin scraper controls
 """
 
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, render_template, jsonify, request, send_file, Response, stream_with_context, url_for
 from flask_cors import CORS
-import pandas as pd
 import datetime
+import math
 import os
-import glob
+import re
+import threading
+import time
 from pathlib import Path
+from src.analytics.catalog import RawCatalog
+from src.web.metrics import WebMetrics
+from src.web.offload import OffloadPool, offload
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -25,32 +30,198 @@ CORS(app)  # Enable CORS for API access
 class Config:
     DATA_RAW_DIR = Path("data/raw")
     DATA_PROCESSED_DIR = Path("data/processed")
+    MODEL_DIR = Path("data/models")
+    ESTIMATE_MAX_BATCH = 5000
+    EVENTS_MAX_LIMIT = 5000
+    SUGGEST_MAX_LIMIT = 50
+    TREND_MAX_MANUFACTURERS = 10
+    TREND_MAX_WINDOW = 365
+    JOB_CACHE_DIR = Path("data/cache/jobs")
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+    ALERTS_DB = Path("data/alerts/alerts.db")
+    # Heavy API handlers per worker: running at once, and waiting before 503s.
+    # Keep the sum below GUNICORN_THREADS so threads stay free for cheap requests
+    OFFLOAD_WORKERS = int(os.environ.get('OFFLOAD_WORKERS', '2'))
+    OFFLOAD_QUEUE = int(os.environ.get('OFFLOAD_QUEUE', '4'))
+    METRICS_DIR = Path("data/metrics/web")
+    SERVING_MODE = os.environ.get('SERVING_MODE', 'sync')
+    # Live feed streams per worker, and how long one stream lasts before the
+    # client reconnects. Only served in threaded mode: a stream holds its thread
+    LIVE_MAX_CLIENTS = int(os.environ.get('LIVE_MAX_CLIENTS', '4'))
+    LIVE_MAX_SECONDS = int(os.environ.get('LIVE_MAX_SECONDS', '300'))
+    HOT_SNAPSHOT_DIR = Path("data/processed/hot")
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
 app.config.from_object(Config)
 
+metrics = WebMetrics(Config.METRICS_DIR)
+metrics.init_app(app)
+
 # ==================== UTILITY FUNCTIONS ====================
 
+# pandas and the analytics modules are imported where they are first used,
+# so a new worker answers cheap requests (pages, /ready, /metrics) at once
+# while warm_up loads the data in the background
+
+raw_catalog = RawCatalog(Config.DATA_RAW_DIR, Config.DATA_PROCESSED_DIR / "raw_catalog.json")
+
+def get_catalog():
+    """Catalog of the raw daily files, refreshed when data/raw changes"""
+    with metrics.phase('catalog'):
+        return raw_catalog.refresh()
+
+_raw_frames = None
+_job_queue = None
+_alert_store = None
+_live_feed = None
+_init_lock = threading.Lock()
+
+def get_raw_frames():
+    """The worker's cache of parsed raw files and dashboard panels"""
+    global _raw_frames
+    if _raw_frames is None:
+        with _init_lock:
+            if _raw_frames is None:
+                from src.analytics.dashboard import RawFrameCache
+                _raw_frames = RawFrameCache()
+    return _raw_frames
+
+def load_recent_data(days=30):
+    """The last ``days`` raw files as one frame, each file parsed once"""
+    catalog = get_catalog()
+    with metrics.phase('load'):
+        return get_raw_frames().recent(catalog, days)
+
+def recent_panel(compute):
+    """A dashboard panel over the recent data, computed once per data change"""
+    load_recent_data()
+    return get_raw_frames().panel(get_catalog(), compute)
+
+def price_trends(catalog, step=7):
+    """Price summary of every ``step``-th raw file, each file summarised once"""
+    with metrics.phase('load'):
+        return get_raw_frames().price_trends(catalog, step)
+
 def get_latest_data_file():
-    """Get the most recent CSV file (today or yesterday)"""
-    today = datetime.date.today()
-    yesterday = today - datetime.timedelta(days=1)
-    
-    today_file = Config.DATA_RAW_DIR / f"car_data_{today}.csv"
-    yesterday_file = Config.DATA_RAW_DIR / f"car_data_{yesterday}.csv"
-    
-    if today_file.exists():
-        return today_file
-    elif yesterday_file.exists():
-        return yesterday_file
-    else:
-        # Return most recent file
-        files = sorted(Config.DATA_RAW_DIR.glob("car_data_*.csv"))
-        return files[-1] if files else None
+    """Get the most recent CSV file"""
+    return get_catalog().latest()
+
+api_pool = OffloadPool(Config.OFFLOAD_WORKERS, Config.OFFLOAD_QUEUE)
+
+def get_job_queue():
+    """The worker's background job queue"""
+    global _job_queue
+    if _job_queue is None:
+        with _init_lock:
+            if _job_queue is None:
+                from src.analytics.jobs import JobQueue
+                _job_queue = JobQueue(Config.JOB_CACHE_DIR, max_workers=Config.JOB_WORKERS)
+    return _job_queue
+
+def get_alert_store():
+    """The saved-search alert store"""
+    global _alert_store
+    if _alert_store is None:
+        with _init_lock:
+            if _alert_store is None:
+                from src.analytics.alerts import AlertStore
+                _alert_store = AlertStore(Config.ALERTS_DB)
+    return _alert_store
+
+def get_live_feed():
+    """The worker's live listing feed"""
+    global _live_feed
+    if _live_feed is None:
+        with _init_lock:
+            if _live_feed is None:
+                from src.web.live import LiveFeed
+                _live_feed = LiveFeed(Config.DATA_RAW_DIR)
+    return _live_feed
+
+@metrics.add_source
+def cache_metrics():
+    """Counters kept by the caches and the offload pool, for /metrics"""
+    stats = _raw_frames.stats if _raw_frames is not None else {}
+    counters = {('cache_requests_total', (('cache', cache), ('result', result))): n
+                for (cache, result), n in stats.items()}
+    counters[('offload_rejected_total', ())] = api_pool.rejected
+    counters[('offload_timeouts_total', ())] = api_pool.timed_out
+    return counters
+
+_warm = threading.Event()
+_warm_state = {}
+
+def warm_up():
+    """Load the hot data snapshot (see dashboard.build_snapshot) and fill the
+    caches the landing page and dashboard read, then mark the worker ready"""
+    started = time.perf_counter()
+    try:
+        from src.analytics import dashboard
+        catalog = get_catalog()
+        if catalog.entries:
+            _warm_state['snapshot'] = get_raw_frames().load_snapshot(catalog, Config.HOT_SNAPSHOT_DIR)
+            for compute in dashboard.PANELS:
+                recent_panel(compute)
+            price_trends(catalog)
+            get_raw_frames().latest_page(catalog)
+        from src.analytics.suggest import SuggestIndex
+        get_store(Config.DATA_PROCESSED_DIR / "suggest", SuggestIndex)
+    except Exception as e:
+        # Serve anyway: requests compute what the warm-up could not
+        _warm_state['error'] = str(e)
+        app.logger.exception("Warm-up failed")
+    _warm_state['seconds'] = round(time.perf_counter() - started, 3)
+    _warm.set()
+
+def start_warm_up():
+    """Run warm_up once in the background (gunicorn_config.py calls this in each worker)"""
+    with _init_lock:
+        if _warm_state.get('started'):
+            return
+        _warm_state['started'] = True
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+def data_version():
+    """Changes whenever the raw files or the processed stores change"""
+    from src.analytics.storage import store_version
+    public_parquet = Config.DATA_PROCESSED_DIR / "car_auction_public.parquet"
+    parquet_version = public_parquet.stat().st_mtime_ns if public_parquet.exists() else None
+    return f"{get_catalog().version}-{parquet_version}-{store_version(Config.DATA_PROCESSED_DIR / 'cube')}"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(path, loader):
+    """Load a processed-data store once per worker, reloading it after
+    clean_data.py rebuilds it. Returns None if it has not been built."""
+    from src.analytics.storage import store_version
+    version = store_version(path)
+    if version is None:
+        return None
+    cached = _stores.get(path)
+    if cached and cached[0] == version:
+        metrics.count_cache(path.name, hit=True)
+        return cached[1]
+    with _stores_lock, metrics.phase('load'):
+        cached = _stores.get(path)
+        metrics.count_cache(path.name, hit=bool(cached and cached[0] == version))
+        if cached and cached[0] == version:
+            return cached[1]
+        store = loader(path)
+        _stores[path] = (version, store)
+    return store
+
+def export_response(fmt, filters=None):
+    """Stream the processed dataset (optionally filtered) as a download"""
+    from src.analytics.export import FORMATS as EXPORT_FORMATS, stream_export
+    chunks = stream_export(fmt, Config.DATA_PROCESSED_DIR / "car_auction_public.parquet", **(filters or {}))
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename=car_auction_export.{fmt}'})
 
 def clean_price(price_str):
     """Clean price strings and convert to float"""
+    import pandas as pd
     if pd.isna(price_str) or str(price_str) == 'N/A':
         return None
     try:
@@ -61,6 +232,7 @@ def clean_price(price_str):
 
 def clean_mileage(mileage_str):
     """Clean mileage strings and convert to float"""
+    import pandas as pd
     if pd.isna(mileage_str) or str(mileage_str) == 'N/A':
         return None
     try:
@@ -81,37 +253,11 @@ def view_today():
                                  error="No data files available",
                                  message="Please run the scraper to collect data.")
         
-        data = pd.read_csv(file_path)
+        table_html, stats = get_raw_frames().latest_page(get_catalog())
         
-        # Add some computed columns for display
-        data['Price_Clean'] = data['Price'].apply(clean_price)
-        data['Mileage_Clean'] = data['Mileage'].apply(clean_mileage)
-        
-        # Get stats
-        stats = {
-            'total': len(data),
-            'avg_price': round(data['Price_Clean'].mean(), 2) if data['Price_Clean'].notna().any() else 0,
-            'registered': len(data[data['Registration Status'] == 'Yes']),
-            'file_date': file_path.stem.replace('car_data_', ''),
-            'top_manufacturer': data['Manufacturer'].mode()[0] if not data.empty else 'N/A'
-        }
-        
-        # Reorder columns: priority columns first, then the rest
-        priority_columns = ['Manufacturer', 'Model', 'Price', 'Mileage', 'Damage description', 'Link']
-        other_columns = [col for col in data.columns if col not in priority_columns]
-        columns_order = priority_columns + other_columns
-        display_data = data[columns_order].copy()
-        
-        # Make links clickable
-        display_data['Link'] = display_data['Link'].apply(
-            lambda x: f'<a href="{x}" target="_blank">View</a>' if pd.notna(x) else ''
-        )
-        
-        # Convert to HTML table
-        table_html = display_data.to_html(index=False, classes='table table-striped table-hover', 
-                                   escape=False, border=0)
-        
-        return render_template('today.html', table=table_html, stats=stats)
+        # Only while a scrape is being written, and only where streams do not hold a worker
+        live = Config.SERVING_MODE == 'threaded' and get_live_feed().writing() is not None
+        return render_template('today.html', table=table_html, stats=stats, live=live)
     
     except Exception as e:
         return render_template('error.html', 
@@ -141,162 +287,345 @@ def about():
 # ==================== API ENDPOINTS ====================
 
 @app.route('/api/v1/stats/overview')
+@offload(api_pool, timeout=30)
 def api_overview():
     """Get overview statistics from recent data"""
+    from src.analytics import dashboard
     try:
-        # Load recent 30 days
-        recent_files = sorted(glob.glob(str(Config.DATA_RAW_DIR / "car_data_*.csv")))[-30:]
-        data_frames = [pd.read_csv(f) for f in recent_files if os.path.exists(f)]
-        
-        if not data_frames:
+        df = load_recent_data()
+        if df.empty:
             return jsonify({'error': 'No data available'}), 404
         
-        df = pd.concat(data_frames, ignore_index=True)
-        df['Price_Clean'] = df['Price'].apply(clean_price)
-        df['Mileage_Clean'] = df['Mileage'].apply(clean_mileage)
-        
-        # Filter valid prices for calculations
-        valid_prices = df['Price_Clean'].dropna()
-        valid_mileage = df['Mileage_Clean'].dropna()
-        
-        stats = {
-            'total_listings': int(len(df)),
-            'unique_vehicles': int(df['Link'].nunique() if 'Link' in df else 0),
-            'manufacturers': int(df['Manufacturer'].nunique()),
-            'avg_price': float(round(valid_prices.mean(), 2)) if len(valid_prices) > 0 else 0,
-            'median_price': float(round(valid_prices.median(), 2)) if len(valid_prices) > 0 else 0,
-            'min_price': float(round(valid_prices.min(), 2)) if len(valid_prices) > 0 else 0,
-            'max_price': float(round(valid_prices.max(), 2)) if len(valid_prices) > 0 else 0,
-            'avg_mileage': float(round(valid_mileage.mean(), 2)) if len(valid_mileage) > 0 else 0,
-            'top_manufacturers': {k: int(v) for k, v in df['Manufacturer'].value_counts().head(10).to_dict().items()},
-            'fuel_types': {k: int(v) for k, v in df['Fuel Type'].value_counts().to_dict().items()} if 'Fuel Type' in df else {},
-            'registration_status': {k: int(v) for k, v in df['Registration Status'].value_counts().to_dict().items()}
-        }
-        
-        return jsonify(stats)
+        return jsonify(recent_panel(dashboard.overview))
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/v1/stats/price-trends')
+@offload(api_pool, timeout=30)
 def api_price_trends():
     """Get price trends over time"""
     try:
-        csv_files = sorted(glob.glob(str(Config.DATA_RAW_DIR / "car_data_*.csv")))
-        
-        trends = []
         # Sample every 7 days for performance
-        for file in csv_files[::7]:
-            date_str = Path(file).stem.replace('car_data_', '')
-            df = pd.read_csv(file)
-            df['Price_Clean'] = df['Price'].apply(clean_price)
-            
-            # Filter out NaN values
-            valid_prices = df['Price_Clean'].dropna()
-            
-            if len(valid_prices) > 0:
-                trends.append({
-                    'date': date_str,
-                    'avg_price': float(round(valid_prices.mean(), 2)),
-                    'median_price': float(round(valid_prices.median(), 2)),
-                    'count': int(len(df))
-                })
-        
-        return jsonify(trends)
+        return jsonify(price_trends(get_catalog(), step=7))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/missing_dates')
+def api_missing_dates():
+    """Get the days with no scrape file between the first and last day on file"""
+    try:
+        catalog = get_catalog()
+        if not catalog.entries:
+            return jsonify({'error': 'No data available'}), 404
+        
+        missing = catalog.missing_dates()
+        return jsonify({
+            'first_date': catalog.entries[0]['date'],
+            'last_date': catalog.entries[-1]['date'],
+            'days_in_range': catalog.days_in_range(),
+            'count': len(missing),
+            'missing_dates': missing,
+            'duplicate_dates': [e['date'] for e in catalog.entries if e['duplicate_of_prior']]
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/events')
+@offload(api_pool, timeout=10)
+def api_events():
+    """Listing lifecycle events (new, price_changed, details_changed, removed, reappeared).
+    ?date=2025-06-01 (default: latest day) or ?start=...&end=..., &type=price_changed,removed&manufacturer=Toyota"""
+    from src.analytics.events import EVENT_TYPES, EventLog
+    types = [t.strip() for t in request.args.get('type', '').split(',') if t.strip()]
+    unknown = [t for t in types if t not in EVENT_TYPES]
+    if unknown:
+        return jsonify({'error': f"Unknown event type(s): {', '.join(unknown)}", 'types': EVENT_TYPES}), 400
+    manufacturers = [m for m in request.args.get('manufacturer', '').split(',') if m.strip()]
+    limit = request.args.get('limit', 500, type=int)
+    if not 1 <= limit <= Config.EVENTS_MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {Config.EVENTS_MAX_LIMIT}'}), 400
+    
+    try:
+        log = get_store(Config.DATA_PROCESSED_DIR / "events", EventLog)
+        if log is None or not log.days:
+            return jsonify({'error': 'Listing events not available'}), 404
+        
+        start = request.args.get('date') or request.args.get('start') or log.latest_date()
+        end = request.args.get('date') or request.args.get('end') or log.latest_date()
+        try:
+            datetime.date.fromisoformat(start)
+            datetime.date.fromisoformat(end)
+        except ValueError:
+            return jsonify({'error': 'Dates must be YYYY-MM-DD'}), 400
+        
+        total, events = log.query(start, end, types=types, manufacturers=manufacturers, limit=limit)
+        return jsonify({
+            'start': start,
+            'end': end,
+            'counts': log.counts(start, end),
+            'total': total,
+            'count': len(events),
+            'events': events
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/stats/quantiles')
+@offload(api_pool, timeout=10)
+def api_price_quantiles():
+    """Price quantiles over any date range and manufacturer set, merged from
+    per-day sketches. ?start=2025-01-01&end=2025-06-30&manufacturer=Toyota,Mazda&q=0.5,0.9"""
+    from src.analytics.sketches import PriceSketches
+    manufacturers = [m for m in request.args.get('manufacturer', '').split(',') if m.strip()] or None
+    start = request.args.get('start')
+    end = request.args.get('end')
+    try:
+        quantiles = [float(q) for q in request.args.get('q', '0.25,0.5,0.75').split(',') if q.strip()]
+        for date in (start, end):
+            if date:
+                datetime.date.fromisoformat(date)
+    except ValueError:
+        return jsonify({'error': 'q must be comma-separated numbers and start/end dates YYYY-MM-DD'}), 400
+    if not quantiles or not all(0 <= q <= 1 for q in quantiles):
+        return jsonify({'error': 'Quantiles must be between 0 and 1'}), 400
+    
+    try:
+        sketches = get_store(Config.DATA_PROCESSED_DIR / "price_sketches", PriceSketches)
+        if sketches is None:
+            return jsonify({'error': 'Price sketches not available'}), 404
+        
+        count, estimates = sketches.quantiles(quantiles, start, end, manufacturers)
+        
+        return jsonify({
+            'start': start,
+            'end': end,
+            'manufacturers': manufacturers,
+            'count': count,
+            'quantiles': {f"{q:g}": v for q, v in zip(quantiles, estimates)},
+            'relative_error': sketches.manifest['relative_accuracy']
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/stats/unique-vehicles')
+@offload(api_pool, timeout=10)
+def api_unique_vehicles():
+    """Distinct vehicles listed over any date range and manufacturer set, from
+    unioned HyperLogLog sketches. ?start=2025-01-01&end=2025-12-31&manufacturer=Toyota"""
+    from src.analytics.sketches import VehicleSketches
+    manufacturers = [m for m in request.args.get('manufacturer', '').split(',') if m.strip()] or None
+    start = request.args.get('start')
+    end = request.args.get('end')
+    try:
+        for date in (start, end):
+            if date:
+                datetime.date.fromisoformat(date)
+    except ValueError:
+        return jsonify({'error': 'start/end must be dates YYYY-MM-DD'}), 400
+    
+    try:
+        sketches = get_store(Config.DATA_PROCESSED_DIR / "vehicle_sketches", VehicleSketches)
+        if sketches is None:
+            return jsonify({'error': 'Vehicle sketches not available'}), 404
+        
+        return jsonify({
+            'start': start,
+            'end': end,
+            'manufacturers': manufacturers,
+            'unique_vehicles': sketches.unique_vehicles(start, end, manufacturers),
+            'standard_error': sketches.manifest['standard_error']
+        })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/v1/manufacturers')
+@offload(api_pool, timeout=30)
 def api_manufacturers():
     """Get manufacturer analysis"""
+    from src.analytics import dashboard
     try:
-        recent_files = sorted(glob.glob(str(Config.DATA_RAW_DIR / "car_data_*.csv")))[-30:]
-        data_frames = [pd.read_csv(f) for f in recent_files]
-        df = pd.concat(data_frames, ignore_index=True)
-        
-        df['Price_Clean'] = df['Price'].apply(clean_price)
+        return jsonify(recent_panel(dashboard.manufacturers))  # Top 50
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def trend_options():
+    """(start, end, freq, window) from the request, or raise ValueError"""
+    from src.analytics.trends import FREQUENCIES
+    start, end = request.args.get('start'), request.args.get('end')
+    try:
+        for value in (start, end):
+            if value:
+                datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError('Dates must be YYYY-MM-DD')
+    freq = request.args.get('freq', 'D').upper()
+    if freq not in FREQUENCIES:
+        raise ValueError(f"freq must be one of: {', '.join(FREQUENCIES)}")
+    window = request.args.get('window', type=int)
+    if window is not None and not 1 <= window <= Config.TREND_MAX_WINDOW:
+        raise ValueError(f'window must be between 1 and {Config.TREND_MAX_WINDOW}')
+    return start, end, freq, window
+
+@app.route('/api/v1/manufacturers/<name>/trend')
+def api_manufacturer_trend(name):
+    """Daily, weekly or monthly price series of one manufacturer over the full history.
+    ?start=2025-01-01&end=2025-06-30&freq=W&window=4"""
+    from src.analytics.trends import TrendSeries
+    try:
+        start, end, freq, window = trend_options()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        trends = get_store(Config.DATA_PROCESSED_DIR / "manufacturer_trends", TrendSeries)
+        if trends is None:
+            return jsonify({'error': 'Manufacturer trends not available'}), 404
         
-        # Remove rows with invalid prices
-        df = df[df['Price_Clean'].notna()]
-        
-        manufacturer_stats = df.groupby('Manufacturer').agg({
-            'Price_Clean': ['mean', 'median', 'count'],
-            'Model': 'nunique'
-        }).round(2)
-        
-        result = []
-        for mfg in manufacturer_stats.index:
-            result.append({
-                'manufacturer': mfg,
-                'avg_price': float(manufacturer_stats.loc[mfg, ('Price_Clean', 'mean')]),
-                'median_price': float(manufacturer_stats.loc[mfg, ('Price_Clean', 'median')]),
-                'count': int(manufacturer_stats.loc[mfg, ('Price_Clean', 'count')]),
-                'unique_models': int(manufacturer_stats.loc[mfg, ('Model', 'nunique')])
-            })
+        position = trends.find(name)
+        if position is None:
+            return jsonify({'error': 'Manufacturer not found'}), 404
         
-        # Sort by count
-        result.sort(key=lambda x: x['count'], reverse=True)
+        points = trends.series(position, start, end, freq, window)
+        return jsonify({
+            'manufacturer': trends.labels[position],
+            'freq': freq,
+            'window': window,
+            'count': len(points),
+            'points': points
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/manufacturers/trends')
+def api_manufacturer_trends():
+    """Price series of several manufacturers for comparison charts.
+    ?names=Toyota,Mazda,Nissan&freq=M&window=3 (start, end as for one manufacturer)"""
+    from src.analytics.trends import TrendSeries
+    names = [n.strip() for n in request.args.get('names', '').split(',') if n.strip()]
+    if not names:
+        return jsonify({'error': 'Give manufacturers as ?names=Toyota,Mazda'}), 400
+    if len(names) > Config.TREND_MAX_MANUFACTURERS:
+        return jsonify({'error': f'At most {Config.TREND_MAX_MANUFACTURERS} manufacturers per request'}), 400
+    try:
+        start, end, freq, window = trend_options()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        trends = get_store(Config.DATA_PROCESSED_DIR / "manufacturer_trends", TrendSeries)
+        if trends is None:
+            return jsonify({'error': 'Manufacturer trends not available'}), 404
         
-        return jsonify(result[:50])  # Top 50
+        series, not_found = {}, []
+        for name in names:
+            position = trends.find(name)
+            if position is None:
+                not_found.append(name)
+            else:
+                series[trends.labels[position]] = trends.series(position, start, end, freq, window)
+        return jsonify({
+            'freq': freq,
+            'window': window,
+            'series': series,
+            'not_found': not_found
+        })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/v1/damage-analysis')
+@offload(api_pool, timeout=30)
 def api_damage_analysis():
     """Analyze damage types and frequency"""
+    from src.analytics import dashboard
     try:
-        recent_files = sorted(glob.glob(str(Config.DATA_RAW_DIR / "car_data_*.csv")))[-30:]
-        data_frames = [pd.read_csv(f) for f in recent_files]
-        df = pd.concat(data_frames, ignore_index=True)
-        
-        damage_keywords = [
-            'Front Damage', 'Rear Damage', 'Left', 'Right',
-            'Airbags Deployed', 'Water Damage', 'Fire Damage',
-            'Vandalised', 'Stolen', 'Impact Heavy', 'Impact Medium', 'Impact Light'
-        ]
-        
-        damage_counts = {}
-        for keyword in damage_keywords:
-            count = df['Damage description'].str.contains(keyword, case=False, na=False).sum()
-            if count > 0:
-                damage_counts[keyword] = int(count)
-        
-        return jsonify(damage_counts)
+        return jsonify(recent_panel(dashboard.damage_analysis))
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/v1/price-distribution')
+@offload(api_pool, timeout=30)
 def api_price_distribution():
     """Get price distribution by ranges"""
+    from src.analytics import dashboard
     try:
-        recent_files = sorted(glob.glob(str(Config.DATA_RAW_DIR / "car_data_*.csv")))[-30:]
-        data_frames = [pd.read_csv(f) for f in recent_files]
-        df = pd.concat(data_frames, ignore_index=True)
-        
-        df['Price_Clean'] = df['Price'].apply(clean_price)
-        valid_prices = df['Price_Clean'].dropna()
+        return jsonify(recent_panel(dashboard.price_distribution))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/dashboard')
+@offload(api_pool, timeout=30)
+def api_dashboard():
+    """All analytics page panels from one load of the recent data"""
+    from src.analytics import dashboard
+    try:
+        catalog = get_catalog()
+        df = load_recent_data()
+        if df.empty:
+            return jsonify({'error': 'No data available'}), 404
         
-        # Create more granular price buckets for better visualization
-        distribution = {
-            '$0-$500': int(((valid_prices >= 0) & (valid_prices < 500)).sum()),
-            '$500-$1k': int(((valid_prices >= 500) & (valid_prices < 1000)).sum()),
-            '$1k-$2k': int(((valid_prices >= 1000) & (valid_prices < 2000)).sum()),
-            '$2k-$5k': int(((valid_prices >= 2000) & (valid_prices < 5000)).sum()),
-            '$5k-$10k': int(((valid_prices >= 5000) & (valid_prices < 10000)).sum()),
-            '$10k+': int((valid_prices >= 10000).sum())
-        }
+        missing = catalog.missing_dates()
+        return jsonify({
+            'data_version': catalog.version,
+            'overview': recent_panel(dashboard.overview),
+            'price_trends': price_trends(catalog, step=7),
+            'manufacturers': recent_panel(dashboard.manufacturers),
+            'damage_analysis': recent_panel(dashboard.damage_analysis),
+            'price_distribution': recent_panel(dashboard.price_distribution),
+            'missing_dates': {
+                'days_in_range': catalog.days_in_range(),
+                'count': len(missing),
+                'missing_dates': missing
+            }
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/suggest')
+def api_suggest():
+    """Manufacturer and model completions for a typed prefix, most listed first.
+    ?q=toyota%20co&kind=model&manufacturer=Toyota&limit=10"""
+    from src.analytics.suggest import KINDS, SuggestIndex
+    query = request.args.get('q', '')
+    kind = request.args.get('kind') or None
+    manufacturer = request.args.get('manufacturer', '').strip() or None
+    limit = request.args.get('limit', 10, type=int)
+    if kind is not None and kind not in KINDS:
+        return jsonify({'error': f"kind must be one of: {', '.join(KINDS)}"}), 400
+    if not 1 <= limit <= Config.SUGGEST_MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {Config.SUGGEST_MAX_LIMIT}'}), 400
+    
+    try:
+        index = get_store(Config.DATA_PROCESSED_DIR / "suggest", SuggestIndex)
+        if index is None:
+            return jsonify({'error': 'Suggestions not available'}), 404
         
-        return jsonify(distribution)
+        suggestions = index.suggest(query, limit=limit, kind=kind, manufacturer=manufacturer)
+        return jsonify({
+            'query': query,
+            'count': len(suggestions),
+            'suggestions': suggestions
+        })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/v1/search')
+@offload(api_pool, timeout=10)
 def api_search():
     """Search for vehicles"""
+    import pandas as pd
     manufacturer = request.args.get('manufacturer', '').strip()
     model = request.args.get('model', '').strip()
     max_price = request.args.get('max_price', type=float)
@@ -308,7 +637,8 @@ def api_search():
         if not file_path:
             return jsonify({'error': 'No data available'}), 404
         
-        df = pd.read_csv(file_path)
+        with metrics.phase('load'):
+            df = pd.read_csv(file_path)
         
         # Apply filters
         if manufacturer:
@@ -334,6 +664,330 @@ def api_search():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/v1/vehicles/<vehicle_id>/history')
+@offload(api_pool, timeout=5)
+def api_vehicle_history(vehicle_id):
+    """Get the price and mileage timeline of one vehicle"""
+    from src.analytics.price_history import PriceHistoryIndex
+    try:
+        index = get_store(Config.DATA_PROCESSED_DIR / "price_history", PriceHistoryIndex)
+        if index is None:
+            return jsonify({'error': 'Price history not available'}), 404
+        
+        history = index.history(vehicle_id)
+        if history is None:
+            return jsonify({'error': 'Vehicle not found'}), 404
+        
+        return jsonify(history)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/vehicles/history', methods=['GET', 'POST'])
+@offload(api_pool, timeout=10)
+def api_vehicle_history_batch():
+    """Get timelines for many vehicles (?ids=a,b,c or JSON body {"ids": [...]})"""
+    from src.analytics.price_history import PriceHistoryIndex
+    if request.method == 'POST':
+        ids = (request.get_json(silent=True) or {}).get('ids', [])
+    else:
+        ids = [v for v in request.args.get('ids', '').split(',') if v.strip()]
+    
+    if not isinstance(ids, list) or not ids:
+        return jsonify({'error': 'No vehicle ids given'}), 400
+    if len(ids) > 1000:
+        return jsonify({'error': 'At most 1000 vehicle ids per request'}), 400
+    
+    try:
+        index = get_store(Config.DATA_PROCESSED_DIR / "price_history", PriceHistoryIndex)
+        if index is None:
+            return jsonify({'error': 'Price history not available'}), 404
+        
+        histories = index.histories(ids)
+        return jsonify({
+            'count': sum(1 for h in histories.values() if h is not None),
+            'results': histories
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/estimate', methods=['GET', 'POST'])
+@offload(api_pool, timeout=30)
+def api_estimate():
+    """Estimate prices for a batch of vehicles (POST {"vehicles": [...]});
+    GET returns the loaded model version and scoring latency"""
+    from src.analytics.price_model import PriceModel
+    try:
+        model = get_store(Config.MODEL_DIR, PriceModel)
+        if model is None:
+            return jsonify({'error': 'Price model not trained'}), 404
+        
+        if request.method == 'GET':
+            return jsonify({
+                'model_version': model.version,
+                'trained_at': model.manifest.get('trained_at'),
+                'metrics': model.manifest.get('metrics', {}),
+                'scoring': model.latency_summary()
+            })
+        
+        vehicles = (request.get_json(silent=True) or {}).get('vehicles')
+        if not isinstance(vehicles, list) or not vehicles:
+            return jsonify({'error': 'Expected {"vehicles": [...]}'}), 400
+        if len(vehicles) > Config.ESTIMATE_MAX_BATCH:
+            return jsonify({'error': f'At most {Config.ESTIMATE_MAX_BATCH} vehicles per request'}), 400
+        
+        estimates, elapsed_ms = model.estimate(vehicles)
+        
+        return jsonify({
+            'model_version': model.version,
+            'count': len(estimates),
+            'estimates': estimates,
+            'latency_ms': round(elapsed_ms, 3),
+            'scoring': model.latency_summary()
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/comparables')
+@offload(api_pool, timeout=5)
+def api_comparables():
+    """Closest historical listings to a vehicle, with the prices they went for.
+    ?manufacturer=Toyota&model=Corolla&year=2008&mileage=150000&impact_severity=Light&k=10
+    or ?vehicle_id=... to find listings comparable to an indexed vehicle"""
+    import pandas as pd
+    from src.analytics.comparables import MAX_K, QUERY_FLAGS as COMPARABLE_FLAGS, ComparablesIndex
+    k = request.args.get('k', 10, type=int)
+    if not 1 <= k <= MAX_K:
+        return jsonify({'error': f'k must be between 1 and {MAX_K}'}), 400
+    since = request.args.get('since')
+    if since:
+        try:
+            datetime.date.fromisoformat(since)
+        except ValueError:
+            return jsonify({'error': 'Dates must be YYYY-MM-DD'}), 400
+    
+    try:
+        index = get_store(Config.DATA_PROCESSED_DIR / "comparables", ComparablesIndex)
+        if index is None:
+            return jsonify({'error': 'Comparables index not available'}), 404
+        
+        vehicle_id = request.args.get('vehicle_id', '').strip()
+        if vehicle_id:
+            vehicle = index.vehicle(vehicle_id)
+            if vehicle is None:
+                return jsonify({'error': 'Vehicle not found'}), 404
+        else:
+            vehicle = {
+                'manufacturer': request.args.get('manufacturer', '').strip(),
+                'model': request.args.get('model', '').strip(),
+                'year': request.args.get('year', type=float),
+                'mileage': request.args.get('mileage', type=float),
+                'damage_score': request.args.get('damage_score', type=float),
+                'impact_severity': request.args.get('impact_severity', '').strip().title() or None,
+                'fuel_type': request.args.get('fuel_type', '').strip()
+            }
+            for key in ('year', 'mileage', 'damage_score'):
+                if vehicle[key] is not None and not (math.isfinite(vehicle[key]) and vehicle[key] >= 0):
+                    return jsonify({'error': f'{key} must be a non-negative number'}), 400
+            for flag, column in COMPARABLE_FLAGS.items():
+                if request.args.get(flag):
+                    vehicle[column] = request.args[flag].lower() in ('1', 'true', 'yes')
+            vehicle = {key: value for key, value in vehicle.items() if value not in (None, '')}
+            if not vehicle:
+                return jsonify({'error': 'Describe the vehicle (manufacturer, model, year, mileage, ...) or give vehicle_id'}), 400
+        
+        comparables = index.query(vehicle, k=k, since=since, exclude=vehicle_id or None)
+        prices = [c['price'] for c in comparables]
+        
+        return jsonify({
+            'vehicle': vehicle,
+            'count': len(comparables),
+            'price_summary': {
+                'median': float(pd.Series(prices).median()),
+                'mean': round(sum(prices) / len(prices), 2),
+                'min': min(prices),
+                'max': max(prices)
+            } if prices else None,
+            'comparables': comparables
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/cube')
+@offload(api_pool, timeout=10)
+def api_cube():
+    """Drill-down over the precomputed rollup cube.
+    ?group_by=manufacturer,model&fuel_type=Petrol&month_from=2025-01&month_to=2025-06"""
+    from src.analytics.cube import DIMENSIONS as CUBE_DIMENSIONS, RollupCube
+    group_by = [d.strip() for d in request.args.get('group_by', '').split(',') if d.strip()]
+    unknown = [d for d in group_by if d not in CUBE_DIMENSIONS]
+    if unknown:
+        return jsonify({'error': f"Unknown dimension(s): {', '.join(unknown)}",
+                        'dimensions': CUBE_DIMENSIONS}), 400
+    
+    filters = {
+        dim: [v for v in request.args[dim].split(',') if v.strip()]
+        for dim in CUBE_DIMENSIONS if request.args.get(dim)
+    }
+    limit = request.args.get('limit', 100, type=int)
+    if limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
+    month_from, month_to = request.args.get('month_from'), request.args.get('month_to')
+    if any(month and not re.fullmatch(r'\d{4}-(0[1-9]|1[0-2])', month) for month in (month_from, month_to)):
+        return jsonify({'error': 'month_from/month_to must be months YYYY-MM'}), 400
+    
+    try:
+        cube = get_store(Config.DATA_PROCESSED_DIR / "cube", RollupCube)
+        if cube is None:
+            return jsonify({'error': 'Rollup cube not available'}), 404
+        
+        groups, totals = cube.query(group_by, filters, month_from=month_from, month_to=month_to, limit=limit)
+        
+        return jsonify({
+            'group_by': group_by,
+            'filters': filters,
+            'totals': totals,
+            'count': len(groups),
+            'groups': groups
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/export')
+def api_export():
+    """Stream a filtered subset of the processed dataset as csv, jsonl or parquet"""
+    from src.analytics.export import FORMATS as EXPORT_FORMATS
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    start = request.args.get('start')
+    end = request.args.get('end')
+    try:
+        for date in (start, end):
+            if date:
+                datetime.date.fromisoformat(date)
+    except ValueError:
+        return jsonify({'error': 'start/end must be dates YYYY-MM-DD'}), 400
+    
+    filters = {
+        'start': start,
+        'end': end,
+        'manufacturers': [m for m in request.args.get('manufacturer', '').split(',') if m.strip()],
+        'models': [m for m in request.args.get('model', '').split(',') if m.strip()],
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float)
+    }
+    
+    if not (Config.DATA_PROCESSED_DIR / "car_auction_public.parquet").exists():
+        return jsonify({'error': 'Processed data not available'}), 404
+    
+    return export_response(fmt, filters)
+
+@app.route('/api/v1/jobs', methods=['POST'])
+def api_submit_job():
+    """Queue a long-running query ({"kind": ..., "params": {...}}) and return a job id to poll"""
+    body = request.get_json(silent=True) or {}
+    kind = body.get('kind')
+    params = body.get('params') or {}
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params must be an object'}), 400
+    
+    try:
+        job_id, status = get_job_queue().submit(kind, params, data_version())
+        metrics.count_cache('job_results', hit=status == 'done')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': status,
+        'status_url': url_for('api_job', job_id=job_id)
+    }), 200 if status == 'done' else 202
+
+@app.route('/api/v1/jobs/<job_id>')
+def api_job(job_id):
+    """Status of a job, with its result once it is done"""
+    try:
+        status = get_job_queue().status(job_id) if re.fullmatch(r'[0-9a-f]{32}', job_id) else None
+        if status is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if status['status'] == 'done':
+            return jsonify(get_job_queue().result(job_id))
+        return jsonify(status), 200 if status['status'] == 'failed' else 202
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/alerts', methods=['POST'])
+def api_create_alert():
+    """Save a search; listings matching it in future scrapes are queued for the subscriber"""
+    from src.analytics.alerts import validate_search
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({'error': 'Send the search as a JSON object'}), 400
+    try:
+        search = validate_search(body)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        search = get_alert_store().add(search)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # The token is only returned here; it is needed to read or delete the search
+    return jsonify(dict(search, url=url_for('api_alert', search_id=search['id']))), 201
+
+@app.route('/api/v1/alerts/<int:search_id>', methods=['GET', 'DELETE'])
+def api_alert(search_id):
+    """A saved search with its latest matches (?limit=100), or DELETE to remove it.
+    Needs the token returned on creation (X-Alert-Token header or ?token=)"""
+    limit = request.args.get('limit', 100, type=int)
+    token = request.headers.get('X-Alert-Token') or request.args.get('token')
+    try:
+        store = get_alert_store()
+        if request.method == 'DELETE':
+            if not store.delete(search_id, token):
+                return jsonify({'error': 'Saved search not found'}), 404
+            return jsonify({'deleted': search_id})
+        
+        search = store.get(search_id, token)
+        if search is None:
+            return jsonify({'error': 'Saved search not found'}), 404
+        
+        search.pop('subscriber')
+        matches = store.matches(search_id, limit=max(1, min(limit, 1000)))
+        return jsonify(dict(search, count=len(matches), matches=matches))
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/live')
+def api_live():
+    """Server-Sent Events stream of the listings the scraper is writing.
+    Reconnecting with Last-Event-ID (or ?last_event_id=) replays the rows missed"""
+    if Config.SERVING_MODE != 'threaded':
+        # A sync worker would be held for the whole stream
+        return jsonify({'error': 'The live feed is only served with SERVING_MODE=threaded'}), 404
+    
+    feed = get_live_feed()
+    if feed.writing() is None:
+        return '', 204  # No scrape in progress; EventSource stops reconnecting
+    if feed.client_count() >= Config.LIVE_MAX_CLIENTS:
+        return jsonify({'error': 'Too many live connections, try again shortly'}), 503, {'Retry-After': '5'}
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    return Response(feed.stream(last_event_id, max_seconds=Config.LIVE_MAX_SECONDS), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/v1/download/latest')
 def api_download_latest():
     """Download latest CSV file"""
@@ -342,7 +996,7 @@ def api_download_latest():
         if not file_path:
             return jsonify({'error': 'No data available'}), 404
         
-        return send_file(file_path, as_attachment=True)
+        return send_file(file_path.resolve(), as_attachment=True)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -352,14 +1006,31 @@ def api_download_processed():
     """Download processed/cleaned data"""
     try:
         file_path = Config.DATA_PROCESSED_DIR / "car_auction_public.csv"
-        if not file_path.exists():
+        if file_path.exists():
+            return send_file(file_path.resolve(), as_attachment=True)
+        
+        # Only the parquet file is kept in the repository; stream it as CSV
+        if not (Config.DATA_PROCESSED_DIR / "car_auction_public.parquet").exists():
             return jsonify({'error': 'Processed data not available'}), 404
         
-        return send_file(file_path, as_attachment=True)
+        return export_response('csv')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/ready')
+def ready():
+    """Readiness probe: 200 once this worker has warmed up, 503 until then"""
+    start_warm_up()
+    if not _warm.is_set():
+        return jsonify({'ready': False}), 503
+    return jsonify({'ready': True, 'pid': os.getpid(), 'warm_up': _warm_state})
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request and cache metrics of all workers in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # ==================== ERROR HANDLERS ====================
 
 @app.errorhandler(404)
@@ -1,9 +1,19 @@
 import pandas as pd
-import glob
 import re
 from datetime import datetime
 import sqlite3
 import os
+from src.analytics.catalog import RawCatalog
+from src.analytics.price_history import build_price_history
+from src.analytics.cube import update_cube
+from src.analytics.sketches import build_price_sketches, build_vehicle_sketches
+from src.analytics.comparables import update_comparables
+from src.analytics.events import update_events
+from src.analytics.snapshots import SnapshotStore, update_snapshots
+from src.analytics.dashboard import build_snapshot
+from src.analytics.suggest import build_suggest
+from src.analytics.alerts import update_alerts
+from src.analytics.trends import build_manufacturer_trends
 
 def clean_price(price_str):
     """Clean price strings and convert to float"""
@@ -78,33 +88,16 @@ def calculate_damage_score(damage_text):
     return score
 
 def load_all_data():
-    """Load all CSV files with date information"""
-    print("Loading CSV files...")
-    all_data = []
-    csv_files = sorted(glob.glob('data/raw/car_data_*.csv'))
-    
-    total_files = len(csv_files)
-    for idx, file in enumerate(csv_files, 1):
-        if idx % 50 == 0:
-            print(f"  Loaded {idx}/{total_files} files...")
-        
-        # Extract date from filename, handle both Windows and Unix path separators
-        basename = os.path.basename(file)
-        date_str = basename.replace('car_data_', '').replace('.csv', '')
-        try:
-            date = datetime.strptime(date_str, '%Y-%m-%d')
-            df = pd.read_csv(file)
-            df['scrape_date'] = date
-            df['source_file'] = file
-            all_data.append(df)
-        except Exception as e:
-            print(f"  Error loading {file}: {e}")
-    
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=True)
-        print(f"✓ Loaded {len(combined_df)} total records from {len(csv_files)} files")
-        return combined_df
-    return pd.DataFrame()
+    """Load all daily files with date information"""
+    print("Loading daily snapshots...")
+    # Each distinct row is stored once in the snapshot store, so this reads
+    # only the new daily files instead of re-parsing every one of them
+    catalog = RawCatalog().refresh()
+    update_snapshots(catalog)
+    
+    combined_df = SnapshotStore().listings(catalog.raw_dir)
+    print(f"✓ Loaded {len(combined_df)} total records from {len(catalog.entries)} files")
+    return combined_df
 
 def clean_car_data(df):
     """Clean and standardize car auction data"""
@@ -291,7 +284,11 @@ def export_data(public_df, daily_stats, mfg_trends):
     print("✓ Exported CSV files")
     
     # Parquet exports (compressed)
-    public_df.to_parquet('data/processed/car_auction_public.parquet', index=False, compression='snappy')
+    # Sorted by date in moderate row groups so /api/v1/export can stream it
+    # batch by batch and skip row groups outside a requested date range
+    public_df.sort_values(['scrape_date', 'Manufacturer'], kind='stable').to_parquet(
+        'data/processed/car_auction_public.parquet', index=False, compression='snappy', row_group_size=50000
+    )
     print("✓ Exported Parquet files")
     
     # SQLite database
@@ -350,6 +347,20 @@ def main():
     # Export everything
     export_data(public_df, daily_stats, mfg_trends)
     
+    # Build indexes served by the API
+    catalog = RawCatalog().refresh()
+    print(f"\n✓ Raw catalog: {len(catalog.entries)} files, {len(catalog.missing_dates())} missing days")
+    update_events(catalog)
+    update_alerts(catalog)
+    build_price_history(df)
+    build_manufacturer_trends(mfg_trends)
+    update_cube(df)
+    build_price_sketches(df)
+    build_vehicle_sketches(df)
+    update_comparables(df)
+    build_suggest(df)
+    build_snapshot(catalog)
+    
     print("\n" + "=" * 60)
     print("✅ Data cleaning pipeline completed successfully!")
     print("=" * 60)
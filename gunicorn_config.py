@@ -1,4 +1,19 @@
+import os
+
 bind = '0.0.0.0:8000'  # The address and port Gunicorn should bind to
-workers = 4  # The number of worker processes to spawn
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))  # The number of worker processes to spawn
 module = 'app_main:app'  # Main application with full features (scraper + analytics + API)
-errorlog = '/home/ubuntu/Website-Scrapper/gunicorn_error.log'
\ No newline at end of file
+errorlog = '/home/ubuntu/Website-Scrapper/gunicorn_error.log'
+
+# SERVING_MODE=threaded: each worker serves GUNICORN_THREADS requests at once,
+# while heavy API handlers are limited to OFFLOAD_WORKERS per worker (see
+# src/web/offload.py), so slow requests cannot starve cheap ones
+if os.environ.get('SERVING_MODE', 'sync') == 'threaded':
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+def post_worker_init(worker):
+    # Load the hot data in the background while the worker starts serving;
+    # /ready answers 200 once it is done
+    from app_main import start_warm_up
+    start_warm_up()
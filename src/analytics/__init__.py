@@ -0,0 +1,25 @@
+"""
+Car Auction Analytics Package
+
+This package contains the precomputed stores and indexes that clean_data.py
+builds under data/processed/ and app_main.py serves through the API.
+
+Modules:
+    storage: Array store layout shared by the on-disk indexes
+    catalog: Catalog of the raw daily files (rows, hashes, gaps)
+    snapshots: Raw daily files stored as distinct rows with validity intervals
+    events: Day-over-day listing lifecycle events (new, price changes, removals)
+    alerts: Saved-search alerts matched against each new raw file, with an outbox
+    price_history: Per-vehicle price timelines with O(log n) lookup
+    price_model: XGBoost price estimation model training and batch scoring
+    comparables: Nearest-neighbour search for comparable vehicles
+    suggest: Manufacturer/model autocomplete over a sorted prefix index
+    trends: Per-manufacturer daily price series with range, resampling and moving averages
+    cube: Incrementally updated rollup cube of price statistics
+    sketches: Mergeable per-day price quantile and distinct-vehicle sketches
+    export: Streaming filtered export of the processed dataset
+    dashboard: Analytics page panels over the recent raw files
+    jobs: Background analytics jobs with an on-disk result cache
+"""
+
+__version__ = "1.0.0"
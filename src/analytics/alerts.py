@@ -0,0 +1,339 @@
+"""
+Saved-search alerts.
+
+A saved search names what a subscriber wants to hear about -- manufacturer,
+model, price band, year range, no airbag deployment, registered or not --
+and every new raw daily file is matched against all saved searches in one
+pass. Matches go to an outbox for a delivery job (email, webhook, ...) to
+send and mark delivered.
+
+The store is a SQLite database, ``data/alerts/alerts.db``:
+
+    searches   the saved searches (``FIELDS``) and their access tokens
+    outbox     one row per (search, vehicle), the first time a listing of
+               the vehicle matched; delivered_at is set once delivered
+    evaluated  the raw files matched so far (date, content hash, matches)
+
+``AlertMatcher`` indexes the searches rather than the listings. A search's
+manufacturer and model (normalized as in suggest.py; either may be left
+out) are its posting key, and the keys are kept as one sorted array. Each
+listing looks up its four possible keys -- manufacturer + model,
+manufacturer + any model, any manufacturer + model, any -- with
+``searchsorted``, which yields every (listing, search) candidate pair
+without visiting unrelated searches; the price, year, airbag and
+registration conditions are then checked on all pairs at once. The cost is
+proportional to the listings plus the candidate pairs, not to listings ×
+searches.
+
+``update_alerts`` matches the catalog's files after the last one evaluated
+(on the first run only the latest, so a new store does not alert on the
+whole history). A search only sees files evaluated after it was saved. A
+file that changed since it was evaluated is matched again; the outbox keeps
+one row per search and vehicle, so nothing is sent twice.
+
+Usage:
+    python -m src.analytics.alerts            # match the new raw files
+    python -m src.analytics.alerts outbox     # print the undelivered matches as JSON lines
+"""
+
+import json
+import math
+import secrets
+import sqlite3
+import sys
+from contextlib import closing, contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.catalog import RawCatalog
+from src.analytics.events import read_day
+from src.analytics.suggest import manufacturer_key, normalize
+
+ALERTS_DB = Path("data/alerts/alerts.db")
+FIELDS = ['subscriber', 'manufacturer', 'model', 'min_price', 'max_price', 'min_year', 'max_year',
+          'no_airbags', 'registered']
+SEPARATOR = '\x1f'
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    subscriber TEXT NOT NULL,
+    manufacturer TEXT,
+    model TEXT,
+    min_price REAL,
+    max_price REAL,
+    min_year INTEGER,
+    max_year INTEGER,
+    no_airbags INTEGER NOT NULL DEFAULT 0,
+    registered INTEGER,
+    token TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    search_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    vehicle_id TEXT NOT NULL,
+    manufacturer TEXT,
+    model TEXT,
+    price REAL,
+    year INTEGER,
+    link TEXT,
+    created_at TEXT NOT NULL,
+    delivered_at TEXT,
+    UNIQUE (search_id, vehicle_id)
+);
+CREATE INDEX IF NOT EXISTS outbox_undelivered ON outbox (delivered_at, id);
+CREATE TABLE IF NOT EXISTS evaluated (
+    date TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    listings INTEGER NOT NULL,
+    matches INTEGER NOT NULL,
+    evaluated_at TEXT NOT NULL
+);
+"""
+
+def _flag(value):
+    """A yes/no request parameter: True for 1/true/yes, None when not given"""
+    return None if value in (None, '') else str(value).lower() in ('1', 'true', 'yes')
+
+def validate_search(params):
+    """A saved search from request parameters; raises ValueError if invalid"""
+    unknown = set(params) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    subscriber = str(params.get('subscriber') or '').strip()
+    if not subscriber:
+        raise ValueError("subscriber is required (who to notify)")
+    search = {'subscriber': subscriber}
+    for field in ('manufacturer', 'model'):
+        value = str(params.get(field) or '').strip()
+        if value and not normalize(value):
+            raise ValueError(f"{field} must contain letters or digits")
+        search[field] = value or None
+    for field, kind in (('min_price', float), ('max_price', float), ('min_year', int), ('max_year', int)):
+        value = params.get(field)
+        try:
+            search[field] = kind(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a number")
+        # float() accepts 'nan' and 'inf', which would match nothing or everything
+        if search[field] is not None and not math.isfinite(search[field]):
+            raise ValueError(f"{field} must be a finite number")
+    for low, high in (('min_price', 'max_price'), ('min_year', 'max_year')):
+        if search[low] is not None and search[high] is not None and search[low] > search[high]:
+            raise ValueError(f"{low} must not exceed {high}")
+    search['no_airbags'] = _flag(params.get('no_airbags')) or False
+    search['registered'] = _flag(params.get('registered'))
+    return search
+
+def read_listings(path):
+    """One raw daily file as the columns the matcher checks, indexed by vehicle id"""
+    df = read_day(path)
+    makers, maker_names = pd.factorize(df['Manufacturer'].fillna(''))
+    models, model_names = pd.factorize(df['Model'].fillna(''))
+    return pd.DataFrame({
+        'manufacturer': df['Manufacturer'].to_numpy(dtype=object),
+        'model': df['Model'].to_numpy(dtype=object),
+        'maker_key': np.array([manufacturer_key(m) for m in maker_names], dtype=object)[makers],
+        'model_key': np.array([normalize(m) for m in model_names], dtype=object)[models],
+        'price': df['Price_Clean'].to_numpy(dtype=float),
+        'year': pd.to_numeric(df['Link'].str.extract(r'/(\d{4})-', expand=False), errors='coerce').to_numpy(dtype=float),
+        'airbags': df['Damage description'].str.contains('Airbag', case=False, na=False).to_numpy(dtype=bool),
+        'registered': (df['Registration Status'].fillna('').str.strip().str.lower() == 'yes').to_numpy(dtype=bool),
+        'link': df['Link'].to_numpy(dtype=object)
+    }, index=df.index)
+
+class AlertMatcher:
+    """Saved searches indexed by (manufacturer, model) posting key"""
+
+    def __init__(self, searches):
+        keys = np.array([f"{manufacturer_key(m) if m else ''}{SEPARATOR}{normalize(n) if n else ''}"
+                         for m, n in zip(searches['manufacturer'], searches['model'])], dtype=str)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.ids = searches['id'].to_numpy(dtype=np.int64)[order]
+
+        def bound(column, missing):
+            return pd.to_numeric(searches[column], errors='coerce').fillna(missing).to_numpy(dtype=float)[order]
+
+        self.min_price, self.max_price = bound('min_price', -np.inf), bound('max_price', np.inf)
+        self.min_year, self.max_year = bound('min_year', -np.inf), bound('max_year', np.inf)
+        self.no_airbags = searches['no_airbags'].fillna(0).to_numpy(dtype=bool)[order]
+        # -1: either, 0: not registered, 1: registered
+        self.registered = searches['registered'].fillna(-1).to_numpy(dtype=np.int8)[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, listings):
+        """(listing position, search position) pairs whose posting keys agree"""
+        makers = listings['maker_key'].to_numpy(dtype=str)
+        models = listings['model_key'].to_numpy(dtype=str)
+        any_key = np.full(len(listings), '', dtype=str)
+        rows, positions = [], []
+        for maker, model in ((makers, models), (makers, any_key), (any_key, models), (any_key, any_key)):
+            queries = np.char.add(np.char.add(maker, SEPARATOR), model)
+            lo = np.searchsorted(self.keys, queries, side='left')
+            counts = np.searchsorted(self.keys, queries, side='right') - lo
+            starts = np.cumsum(counts) - counts
+            rows.append(np.repeat(np.arange(len(listings)), counts))
+            positions.append(np.repeat(lo - starts, counts) + np.arange(counts.sum()))
+        # A listing without a model (or manufacturer) repeats a key
+        pairs = np.unique(np.concatenate(rows) * len(self.keys) + np.concatenate(positions))
+        return pairs // len(self.keys), pairs % len(self.keys)
+
+    def match(self, listings):
+        """(listing position, search id) of every listing matching a saved search"""
+        if not len(self) or listings.empty:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        rows, positions = self.candidates(listings)
+        price = listings['price'].to_numpy(dtype=float)[rows]
+        year = listings['year'].to_numpy(dtype=float)[rows]
+        # An unknown price or year only fails a search that sets a bound on it
+        matched = ((price >= self.min_price[positions]) & (price <= self.max_price[positions])) | \
+            (np.isinf(self.min_price[positions]) & np.isinf(self.max_price[positions]))
+        matched &= ((year >= self.min_year[positions]) & (year <= self.max_year[positions])) | \
+            (np.isinf(self.min_year[positions]) & np.isinf(self.max_year[positions]))
+        matched &= ~(self.no_airbags[positions] & listings['airbags'].to_numpy(dtype=bool)[rows])
+        registered = self.registered[positions]
+        matched &= (registered < 0) | (registered == listings['registered'].to_numpy(dtype=np.int8)[rows])
+        return rows[matched], self.ids[positions[matched]]
+
+class AlertStore:
+    """Saved searches, the outbox and the evaluated files in SQLite"""
+
+    def __init__(self, path=ALERTS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+            if 'token' not in [row['name'] for row in conn.execute("PRAGMA table_info(searches)")]:
+                # Searches saved before tokens have none: only the CLI can reach them
+                conn.execute("ALTER TABLE searches ADD COLUMN token TEXT")
+
+    @contextmanager
+    def connect(self):
+        """A connection committed on success and closed afterwards"""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+
+    def add(self, search):
+        """Save a search (as returned by validate_search); returns it with its
+        id and the token needed to read or delete it, which is not shown again"""
+        token = secrets.token_urlsafe(24)
+        record = dict(search, token=token, created_at=datetime.now().isoformat(timespec='seconds'))
+        with self.connect() as conn:
+            cursor = conn.execute(f"INSERT INTO searches ({', '.join(record)}) VALUES ({', '.join('?' * len(record))})",
+                                  list(record.values()))
+        return dict(self.get(cursor.lastrowid, token), token=token)
+
+    def get(self, search_id, token):
+        """The search, or None if there is none or ``token`` is not its token"""
+        with self.connect() as conn:
+            row = conn.execute("SELECT * FROM searches WHERE id = ?", (search_id,)).fetchone()
+        return _search(row) if row and _authorized(row, token) else None
+
+    def delete(self, search_id, token):
+        """Remove a search and its undelivered matches; False if there was
+        none or ``token`` is not its token"""
+        with self.connect() as conn:
+            row = conn.execute("SELECT token FROM searches WHERE id = ?", (search_id,)).fetchone()
+            if not (row and _authorized(row, token)):
+                return False
+            conn.execute("DELETE FROM searches WHERE id = ?", (search_id,))
+            conn.execute("DELETE FROM outbox WHERE search_id = ? AND delivered_at IS NULL", (search_id,))
+        return True
+
+    def searches(self):
+        with self.connect() as conn:
+            return pd.read_sql_query("SELECT * FROM searches ORDER BY id", conn)
+
+    def evaluated(self):
+        """{date: sha256} of the raw files matched so far"""
+        with self.connect() as conn:
+            return dict(conn.execute("SELECT date, sha256 FROM evaluated").fetchall())
+
+    def record(self, entry, listings, rows, search_ids):
+        """Queue the matches of one raw file and mark it evaluated; returns
+        the number of new outbox rows"""
+        now = datetime.now().isoformat(timespec='seconds')
+        matched = listings.iloc[rows]
+        outbox = zip(search_ids.tolist(), [entry['date']] * len(rows), matched.index.tolist(),
+                     matched['manufacturer'].tolist(), matched['model'].tolist(),
+                     [None if np.isnan(p) else p for p in matched['price'].tolist()],
+                     [None if np.isnan(y) else int(y) for y in matched['year'].tolist()],
+                     matched['link'].tolist(), [now] * len(rows))
+        with self.connect() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO outbox (search_id, date, vehicle_id, manufacturer, model, "
+                             "price, year, link, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", outbox)
+            added = conn.total_changes - before
+            conn.execute("INSERT OR REPLACE INTO evaluated VALUES (?, ?, ?, ?, ?, ?)",
+                         (entry['date'], entry['file'], entry['sha256'], len(listings), added, now))
+        return added
+
+    def matches(self, search_id, limit=100):
+        """The latest matches of one search, newest first"""
+        with self.connect() as conn:
+            rows = conn.execute("SELECT * FROM outbox WHERE search_id = ? ORDER BY id DESC LIMIT ?",
+                                (search_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def pending(self, limit=1000):
+        """Undelivered matches, oldest first"""
+        with self.connect() as conn:
+            rows = conn.execute("SELECT outbox.*, searches.subscriber FROM outbox JOIN searches "
+                                "ON searches.id = outbox.search_id WHERE delivered_at IS NULL "
+                                "ORDER BY outbox.id LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_delivered(self, outbox_ids):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self.connect() as conn:
+            conn.executemany("UPDATE outbox SET delivered_at = ? WHERE id = ?", [(now, i) for i in outbox_ids])
+
+def _authorized(row, token):
+    return bool(row['token'] and token) and secrets.compare_digest(row['token'], str(token))
+
+def _search(row):
+    search = dict(row)
+    del search['token']
+    search['no_airbags'] = bool(search['no_airbags'])
+    search['registered'] = None if search['registered'] is None else bool(search['registered'])
+    return search
+
+def update_alerts(catalog=None, db_path=ALERTS_DB):
+    """Match the raw files not evaluated yet against every saved search"""
+    print("\nMatching saved-search alerts...")
+    catalog = catalog or RawCatalog().refresh()
+    store = AlertStore(db_path)
+    evaluated = store.evaluated()
+    if evaluated:
+        first = min(evaluated)
+        pending = [e for e in catalog.entries if e['date'] >= first and evaluated.get(e['date']) != e['sha256']]
+    else:
+        pending = catalog.entries[-1:]
+    if not pending:
+        print("✓ Alerts already up to date")
+        return
+
+    matcher = AlertMatcher(store.searches())
+    total = 0
+    for entry in pending:
+        listings = read_listings(catalog.path(entry))
+        rows, search_ids = matcher.match(listings)
+        total += store.record(entry, listings, rows, search_ids)
+    print(f"✓ Alerts: matched {len(pending)} files against {len(matcher)} saved searches, {total} new matches")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'outbox':
+        for match in AlertStore().pending():
+            print(json.dumps(match))
+    else:
+        update_alerts()
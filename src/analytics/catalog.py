@@ -0,0 +1,188 @@
+"""
+Catalog of the raw daily scrape files.
+
+One entry per ``data/raw/car_data_<date>.csv``:
+
+    date                scrape date (YYYY-MM-DD)
+    file                file name
+    rows                data rows (excluding the header)
+    bytes               file size
+    mtime_ns            modification time, used to detect changed files
+    sha256              content hash
+    schema_version      1 for the first header layout seen, 2 for the next, ...
+    duplicate_of_prior  content identical to the previous day on file
+
+The catalog is saved as ``data/processed/raw_catalog.json``. ``refresh()``
+costs one ``stat`` of the raw directory while nothing has changed; when a
+file is added, renamed or removed it relists the directory and only reads
+files whose size or mtime differ from their catalog entry.
+
+Usage (refresh the catalog and report gaps in the data):
+    python -m src.analytics.catalog
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+RAW_DIR = Path("data/raw")
+CATALOG_FILE = Path("data/processed/raw_catalog.json")
+FILE_PATTERN = re.compile(r'car_data_(\d{4}-\d{2}-\d{2})\.csv$')
+
+def describe_file(path):
+    """Catalog entry fields read from the file's contents"""
+    content = path.read_bytes()
+    reader = csv.reader(io.StringIO(content.decode('utf-8', errors='replace')))
+    header = next(reader, [])
+    return {
+        'rows': sum(1 for _ in reader),
+        'sha256': hashlib.sha256(content).hexdigest(),
+        'header': header
+    }
+
+class RawCatalog:
+    """Maintained listing of the raw scrape files, ordered by date"""
+
+    def __init__(self, raw_dir=RAW_DIR, catalog_file=CATALOG_FILE):
+        self.raw_dir = Path(raw_dir)
+        self.catalog_file = Path(catalog_file)
+        self.dir_mtime_ns = None
+        self.entries = []
+        self.schemas = []
+        self.by_date = {}
+        self.version = None
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """Bring the catalog up to date with the raw directory; returns self"""
+        if self._dir_mtime_ns() == self.dir_mtime_ns:
+            return self
+        with self.lock:
+            return self._refresh(self._dir_mtime_ns())
+
+    def _dir_mtime_ns(self):
+        try:
+            return os.stat(self.raw_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self, dir_mtime_ns):
+        if dir_mtime_ns == self.dir_mtime_ns:
+            return self
+
+        saved = self.load()
+        if saved.get('dir_mtime_ns') == dir_mtime_ns and dir_mtime_ns is not None:
+            # Another process already caught up with this state of the directory
+            self.set_entries(saved['entries'], saved['schemas'], dir_mtime_ns)
+            return self
+
+        known = {e['file']: e for e in saved.get('entries', [])}
+        headers = {i + 1: s for i, s in enumerate(saved.get('schemas', []))}
+        entries = []
+        if dir_mtime_ns is not None:
+            with os.scandir(self.raw_dir) as listing:
+                for item in listing:
+                    match = FILE_PATTERN.match(item.name)
+                    if not match:
+                        continue
+                    stat = item.stat()
+                    entry = known.get(item.name)
+                    if entry and entry['bytes'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                        entry = dict(entry, header=headers.get(entry['schema_version'], []))
+                    else:
+                        entry = {'date': match.group(1), 'file': item.name, 'bytes': stat.st_size,
+                                 'mtime_ns': stat.st_mtime_ns, **describe_file(Path(item.path))}
+                    entries.append(entry)
+
+        entries.sort(key=lambda e: e['date'])
+        schemas = []
+        for i, entry in enumerate(entries):
+            header = entry.pop('header')
+            if header not in schemas:
+                schemas.append(header)
+            entry['schema_version'] = schemas.index(header) + 1
+            entry['duplicate_of_prior'] = i > 0 and entry['sha256'] == entries[i - 1]['sha256']
+
+        self.set_entries(entries, schemas, dir_mtime_ns)
+        self.save()
+        return self
+
+    def load(self):
+        try:
+            with open(self.catalog_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        self.catalog_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.catalog_file.with_name(f"{self.catalog_file.name}.{os.getpid()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({
+                'dir_mtime_ns': self.dir_mtime_ns,
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+                'schemas': self.schemas,
+                'entries': self.entries
+            }, f, indent=1)
+        os.replace(temp_file, self.catalog_file)
+
+    def set_entries(self, entries, schemas, dir_mtime_ns):
+        self.entries = entries
+        self.schemas = schemas
+        self.by_date = {e['date']: e for e in entries}
+        self.dir_mtime_ns = dir_mtime_ns
+        # Changes whenever any raw file is added, removed or rewritten
+        self.version = hashlib.sha256(''.join(e['sha256'] for e in entries).encode()).hexdigest()[:16]
+
+    def path(self, entry):
+        return self.raw_dir / entry['file']
+
+    def paths(self, last=None):
+        """Raw file paths in date order, optionally only the last ``last`` days on file"""
+        entries = self.entries[-last:] if last else self.entries
+        return [self.path(e) for e in entries]
+
+    def latest(self):
+        return self.path(self.entries[-1]) if self.entries else None
+
+    def dates(self):
+        return [e['date'] for e in self.entries]
+
+    def missing_dates(self):
+        """Days between the first and last file that have no file"""
+        if not self.entries:
+            return []
+        first = date.fromisoformat(self.entries[0]['date'])
+        last = date.fromisoformat(self.entries[-1]['date'])
+        missing = []
+        day = first
+        while day <= last:
+            if day.isoformat() not in self.by_date:
+                missing.append(day.isoformat())
+            day += timedelta(days=1)
+        return missing
+
+    def days_in_range(self):
+        if not self.entries:
+            return 0
+        return (date.fromisoformat(self.entries[-1]['date']) - date.fromisoformat(self.entries[0]['date'])).days + 1
+
+if __name__ == '__main__':
+    catalog = RawCatalog().refresh()
+    missing = catalog.missing_dates()
+    print(f"Total CSV files: {len(catalog.entries)}")
+    if catalog.entries:
+        print(f"Date range: {catalog.entries[0]['date']} to {catalog.entries[-1]['date']}")
+    print(f"Days in range: {catalog.days_in_range()}")
+    print(f"Total rows: {sum(e['rows'] for e in catalog.entries):,}")
+    print(f"Schema versions: {len(catalog.schemas)}")
+    print(f"Duplicates of the prior day: {sum(e['duplicate_of_prior'] for e in catalog.entries)}")
+    print(f"\nMissing days: {len(missing)}")
+    for d in missing:
+        print(d)
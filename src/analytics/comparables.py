@@ -0,0 +1,291 @@
+"""
+Comparable-vehicle search.
+
+The index holds one row per vehicle -- its latest listing -- laid out
+contiguously by manufacturer:
+
+    manufacturers  manufacturer names, one per partition
+    offsets        len(manufacturers) + 1 row offsets into the arrays below
+    vehicle_ids    Vehicle_ID (fixed-width bytes)
+    dates          last scrape date as days since 1970-01-01 (int32)
+    prices         last Price_USD (float64)
+    year, mileage, damage_score, severity
+                   Year, Mileage_Miles, Damage_Score and Impact_Severity
+                   code (float32, NaN when unknown)
+    flags          bit i set when FLAG_FEATURES[i] is true (uint8)
+    models, fuels  codes into the ``models`` / ``fuel_types`` vocabularies
+                   in the manifest (-1 when unknown)
+
+The feature matrix is derived when the index is loaded: the numeric
+features are standardized (mileage on a log scale) and unknown values sit at
+the mean. A query is a weighted squared distance over the features it
+specifies plus mismatch penalties for model, fuel type and flags, computed
+with NumPy over the manufacturer's partitions (one per stored spelling of
+it, matched by ``manufacturer_key`` of suggest.py; every vehicle when no
+manufacturer is given) -- tens of thousands of rows at most, so a
+brute-force scan answers in milliseconds and there is no tree to maintain. Model and fuel type names
+match every vocabulary entry with the same lowercase form.
+``update_comparables`` only reads the scrape days not yet in the index; the
+manifest keeps a digest of each day's rows, and the index is rebuilt when a
+day it holds changed (a rewritten raw file, or newly imputed values) or is
+gone, since that may change which listing is a vehicle's latest.
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.price_model import FLAG_FEATURES, SEVERITY_CODES
+from src.analytics.storage import day_digests, load_arrays, save_arrays
+from src.analytics.suggest import manufacturer_key, manufacturer_positions
+
+COMPARABLES_DIR = Path("data/processed/comparables")
+ARRAYS = ['manufacturers', 'offsets', 'vehicle_ids', 'dates', 'prices', 'year', 'mileage',
+          'damage_score', 'severity', 'flags', 'models', 'fuels']
+NUMERIC = ['year', 'mileage', 'damage_score', 'severity']
+SEVERITY_NAMES = {code: name for name, code in SEVERITY_CODES.items()}
+# Cleaned columns the index is derived from
+COLUMNS = ['scrape_date', 'Vehicle_ID', 'Manufacturer', 'Model', 'Fuel Type', 'Price_USD', 'Year',
+           'Mileage_Miles', 'Damage_Score', 'Impact_Severity'] + FLAG_FEATURES
+
+# Squared-distance weights; numeric features are in standard deviations
+WEIGHTS = {
+    'year': 1.0,
+    'mileage': 0.5,
+    'damage_score': 0.5,
+    'severity': 0.5,
+    'model': 4.0,
+    'fuel_type': 1.0,
+    'flag': 1.0
+}
+MAX_K = 100
+# Query parameter names of the FLAG_FEATURES
+QUERY_FLAGS = {
+    'registered': 'Is_Registered',
+    'airbags': 'Has_Airbag_Deployed',
+    'water_damage': 'Has_Water_Damage',
+    'fire_damage': 'Has_Fire_Damage',
+    'stolen': 'Is_Stolen_Recovered',
+    'vandalised': 'Is_Vandalized'
+}
+
+def _codes(values, vocabulary):
+    """Integer codes of ``values`` in ``vocabulary`` (extended in place), -1 for missing"""
+    lookup = {name: i for i, name in enumerate(vocabulary)}
+    codes = np.full(len(values), -1, dtype=np.int32)
+    for i, value in enumerate(values):
+        if isinstance(value, str) and value.strip():
+            key = value.strip()
+            if key not in lookup:
+                lookup[key] = len(vocabulary)
+                vocabulary.append(key)
+            codes[i] = lookup[key]
+    return codes
+
+def latest_listings(df):
+    """Latest listing of each vehicle in the cleaned listings"""
+    listings = df.dropna(subset=['Vehicle_ID', 'Manufacturer'])
+    return listings.sort_values('scrape_date', kind='stable').drop_duplicates('Vehicle_ID', keep='last')
+
+def listing_arrays(listings, models, fuel_types):
+    """Index columns (unsorted) for listings; extends the vocabularies"""
+    flags = np.zeros(len(listings), dtype=np.uint8)
+    for bit, col in enumerate(FLAG_FEATURES):
+        flags |= listings[col].fillna(False).to_numpy(dtype=bool).astype(np.uint8) << bit
+    return {
+        'manufacturer': listings['Manufacturer'].astype(str).str.strip().to_numpy(),
+        'vehicle_ids': listings['Vehicle_ID'].astype(str).to_numpy().astype('S'),
+        'dates': listings['scrape_date'].to_numpy().astype('datetime64[D]').astype(np.int32),
+        'prices': listings['Price_USD'].to_numpy(dtype=np.float64),
+        'year': pd.to_numeric(listings['Year'], errors='coerce').to_numpy(dtype=np.float32),
+        'mileage': pd.to_numeric(listings['Mileage_Miles'], errors='coerce').to_numpy(dtype=np.float32),
+        'damage_score': pd.to_numeric(listings['Damage_Score'], errors='coerce').to_numpy(dtype=np.float32),
+        'severity': listings['Impact_Severity'].map(SEVERITY_CODES).to_numpy(dtype=np.float32),
+        'flags': flags,
+        'models': _codes(listings['Model'].tolist(), models),
+        'fuels': _codes(listings['Fuel Type'].tolist(), fuel_types)
+    }
+
+def update_comparables(df, output_dir=COMPARABLES_DIR):
+    """Fold scrape days not yet in the index into it; rebuilds the index if
+    a day already in it has changed"""
+    print("\nUpdating comparables index...")
+    output_dir = Path(output_dir)
+
+    empty = {'days': {}, 'models': [], 'fuel_types': []}
+    try:
+        stored, manifest = load_arrays(output_dir, ARRAYS, mmap=False)
+    except (OSError, ValueError):
+        stored, manifest = None, empty
+
+    digests = day_digests(df, COLUMNS)
+    if not isinstance(manifest['days'], dict) or \
+            any(digests.get(day) != digest for day, digest in manifest['days'].items()):
+        print("  Days already indexed have changed: rebuilding")
+        stored, manifest = None, empty
+
+    days = df['scrape_date'].dt.strftime('%Y-%m-%d')
+    new_days = sorted(set(digests) - set(manifest['days']))
+    if not new_days:
+        print("✓ Comparables index already up to date")
+        return
+
+    models, fuel_types = list(manifest['models']), list(manifest['fuel_types'])
+    columns = listing_arrays(latest_listings(df[days.isin(new_days)]), models, fuel_types)
+    if stored is not None:
+        counts = np.diff(stored['offsets'])
+        columns = {
+            name: np.concatenate([np.repeat(stored['manufacturers'], counts) if name == 'manufacturer'
+                                  else stored[name], values])
+            for name, values in columns.items()
+        }
+
+    # Keep each vehicle's latest listing, then group by manufacturer
+    order = np.lexsort((columns['dates'], columns['vehicle_ids']))
+    ids = columns['vehicle_ids'][order]
+    latest = order[np.append(ids[1:] != ids[:-1], True)]
+    latest = latest[np.argsort(columns['manufacturer'][latest], kind='stable')]
+    columns = {name: values[latest] for name, values in columns.items()}
+
+    manufacturers, starts = np.unique(columns.pop('manufacturer'), return_index=True)
+    arrays = {
+        'manufacturers': manufacturers.astype(str),
+        'offsets': np.append(starts, len(latest)).astype(np.int64),
+        **columns
+    }
+    save_arrays(output_dir, arrays, {
+        'vehicles': len(latest),
+        'days': digests,
+        'models': models,
+        'fuel_types': fuel_types,
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    })
+
+    print(f"✓ Comparables index: applied {len(new_days)} days, {len(latest)} vehicles")
+
+def _lowercase_positions(names):
+    """{lowercased name: positions of the names with that lowercase form}"""
+    positions = {}
+    for i, name in enumerate(names):
+        positions.setdefault(name.lower(), []).append(i)
+    return positions
+
+def _standardize(values, center, scale):
+    standardized = (values - center) / scale
+    return np.where(np.isnan(standardized), 0, standardized).astype(np.float32)
+
+class ComparablesIndex:
+    """Read side of the comparables index; the feature matrix is held in memory"""
+
+    def __init__(self, directory=COMPARABLES_DIR):
+        arrays, self.manifest = load_arrays(directory, ARRAYS)
+        self.manufacturers = arrays['manufacturers']
+        self.offsets = arrays['offsets']
+        self.vehicle_ids = arrays['vehicle_ids']
+        self.dates = arrays['dates']
+        self.prices = arrays['prices']
+        self.raw = {name: np.asarray(arrays[name]) for name in NUMERIC}
+        self.flags = np.asarray(arrays['flags'])
+        self.models = np.asarray(arrays['models'])
+        self.fuels = np.asarray(arrays['fuels'])
+        self.model_names = self.manifest['models']
+        self.fuel_names = self.manifest['fuel_types']
+        # Every spelling of a name is matched: {key: [codes or partitions]}
+        self.model_codes = _lowercase_positions(self.model_names)
+        self.fuel_codes = _lowercase_positions(self.fuel_names)
+        self.partitions = manufacturer_positions(self.manufacturers.tolist())
+        self.partition_of = np.repeat(np.arange(len(self.manufacturers)), np.diff(self.offsets))
+
+        self.scaling = {}
+        self.features = {}
+        for name in NUMERIC:
+            values = self.raw[name].astype(np.float64)
+            if name == 'mileage':
+                values = np.log1p(values)
+            center, scale = 0.0, 1.0
+            if np.isfinite(values).any():
+                center, scale = float(np.nanmean(values)), float(np.nanstd(values)) or 1.0
+            self.scaling[name] = (center, scale)
+            self.features[name] = _standardize(values, center, scale)
+
+    def __len__(self):
+        return len(self.vehicle_ids)
+
+    def scaled(self, name, value):
+        center, scale = self.scaling[name]
+        return ((np.log1p(value) if name == 'mileage' else value) - center) / scale
+
+    def vehicle(self, vehicle_id):
+        """Query attributes of an indexed vehicle, or None"""
+        matches = np.flatnonzero(self.vehicle_ids == str(vehicle_id).strip().encode())
+        if len(matches) == 0:
+            return None
+        return self.describe(matches[0])
+
+    def describe(self, i):
+        """One indexed vehicle as a dict"""
+        year, mileage, damage_score, severity = (self.raw[name][i] for name in NUMERIC)
+        flags = int(self.flags[i])
+        return {
+            'vehicle_id': self.vehicle_ids[i].decode(),
+            'manufacturer': str(self.manufacturers[self.partition_of[i]]),
+            'model': self.model_names[self.models[i]] if self.models[i] >= 0 else None,
+            'year': None if np.isnan(year) else int(year),
+            'mileage': None if np.isnan(mileage) else float(mileage),
+            'damage_score': None if np.isnan(damage_score) else int(damage_score),
+            'impact_severity': None if np.isnan(severity) else SEVERITY_NAMES[int(severity)],
+            'fuel_type': self.fuel_names[self.fuels[i]] if self.fuels[i] >= 0 else None,
+            **{col: bool(flags >> bit & 1) for bit, col in enumerate(FLAG_FEATURES)},
+            'price': float(self.prices[i]),
+            'last_seen': str(np.datetime64(int(self.dates[i]), 'D'))
+        }
+
+    def query(self, vehicle, k=10, since=None, exclude=None):
+        """The ``k`` indexed vehicles closest to ``vehicle`` (a dict with any of
+        manufacturer, model, year, mileage, damage_score, impact_severity,
+        fuel_type and the FLAG_FEATURES), nearest first"""
+        k = max(1, min(int(k), MAX_K))
+        rows = np.arange(len(self))
+        if vehicle.get('manufacturer'):
+            # The partitions of every stored spelling of the manufacturer
+            partitions = self.partitions.get(manufacturer_key(vehicle['manufacturer']))
+            if not partitions:
+                return []
+            rows = np.concatenate([np.arange(self.offsets[p], self.offsets[p + 1]) for p in partitions])
+        distance = np.zeros(len(rows), dtype=np.float32)
+
+        for name in NUMERIC:
+            value = vehicle.get(name)
+            if name == 'severity':
+                value = SEVERITY_CODES.get(vehicle.get('impact_severity'))
+            if value is None:
+                continue
+            diff = self.features[name][rows] - np.float32(self.scaled(name, float(value)))
+            distance += WEIGHTS[name] * diff * diff
+
+        for key, codes, lookup in (('model', self.models, self.model_codes),
+                                   ('fuel_type', self.fuels, self.fuel_codes)):
+            if vehicle.get(key):
+                matching = lookup.get(str(vehicle[key]).strip().lower(), [])
+                distance += WEIGHTS[key] * ~np.isin(codes[rows], matching)
+
+        for bit, col in enumerate(FLAG_FEATURES):
+            if vehicle.get(col) is not None:
+                distance += WEIGHTS['flag'] * ((self.flags[rows] >> bit & 1) != int(bool(vehicle[col])))
+
+        if since:
+            days = (date.fromisoformat(since) - date(1970, 1, 1)).days
+            distance[self.dates[rows] < days] = np.inf
+        if exclude is not None:
+            distance[self.vehicle_ids[rows] == str(exclude).encode()] = np.inf
+
+        candidates = np.flatnonzero(np.isfinite(distance))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(distance[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(distance[candidates], kind='stable')]
+        return [
+            dict(self.describe(rows[i]), distance=round(float(distance[i]), 4))
+            for i in candidates
+        ]
@@ -0,0 +1,202 @@
+"""
+Rollup cube of listing prices.
+
+Listings are aggregated into cells keyed by every combination of
+
+    month            scrape month (YYYY-MM)
+    manufacturer     Manufacturer
+    model            Model
+    year_bucket      model year in 5-year buckets (e.g. "2010-2014")
+    impact_severity  Impact_Severity
+    fuel_type        Fuel Type
+    is_registered    "Yes" / "No"
+
+with missing values stored as "Unknown". Each cell holds additive measures
+of Price_USD (count, sum, sum of squares, min, max), so any rollup over a
+subset of the dimensions is a re-aggregation of cells rather than a scan of
+the listings, and mean and standard deviation are derived at query time.
+
+Cells are stored as one parquet partition per month. ``manifest.json``
+records which scrape days have been applied, with a digest of each day's
+rows, so each run of clean_data.py only aggregates the months with a new,
+changed or removed day. Each of those months is aggregated again from all
+of its listings rather than merged into the stored cells: min and max
+cannot be subtracted, and rewriting a partition is idempotent, so a run
+that dies before the manifest is written leaves nothing to double count.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.storage import day_digests
+
+CUBE_DIR = Path("data/processed/cube")
+DIMENSIONS = ['month', 'manufacturer', 'model', 'year_bucket', 'impact_severity', 'fuel_type', 'is_registered']
+MEASURES = {
+    'count': 'sum',
+    'price_sum': 'sum',
+    'price_sumsq': 'sum',
+    'price_min': 'min',
+    'price_max': 'max'
+}
+YEAR_BUCKET_SIZE = 5
+# Cleaned columns the cells are derived from
+COLUMNS = ['scrape_date', 'Manufacturer', 'Model', 'Year', 'Impact_Severity', 'Fuel Type', 'Is_Registered', 'Price_USD']
+
+def cube_cells(df):
+    """Aggregate cleaned listings into cube cells"""
+    year = pd.to_numeric(df['Year'], errors='coerce')
+    bucket = (year // YEAR_BUCKET_SIZE * YEAR_BUCKET_SIZE).astype('Int64')
+    year_bucket = bucket.astype(str) + '-' + (bucket + YEAR_BUCKET_SIZE - 1).astype(str)
+
+    price = df['Price_USD'].astype(float)
+    cells = pd.DataFrame({
+        'month': df['scrape_date'].to_numpy().astype('datetime64[M]').astype(str),
+        'manufacturer': df['Manufacturer'],
+        'model': df['Model'],
+        'year_bucket': year_bucket.where(bucket.notna()),
+        'impact_severity': df['Impact_Severity'],
+        'fuel_type': df['Fuel Type'],
+        'is_registered': df['Is_Registered'].astype(object).map({True: 'Yes', False: 'No'}),
+        'price': price,
+        'price_sq': price ** 2
+    })
+    cells[DIMENSIONS] = cells[DIMENSIONS].fillna('Unknown').astype(str)
+
+    return cells.dropna(subset=['price']).groupby(DIMENSIONS, sort=False).agg(
+        count=('price', 'count'),
+        price_sum=('price', 'sum'),
+        price_sumsq=('price_sq', 'sum'),
+        price_min=('price', 'min'),
+        price_max=('price', 'max')
+    ).reset_index()
+
+def read_manifest(cube_dir):
+    try:
+        with open(Path(cube_dir) / 'manifest.json') as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+def update_cube(df, cube_dir=CUBE_DIR):
+    """Re-aggregate the months with scrape days not yet in the cube or
+    changed since; rebuilds from scratch if the dimensions have changed
+    since the cube was written"""
+    print("\nUpdating rollup cube...")
+    cube_dir = Path(cube_dir)
+    partition_dir = cube_dir / 'partitions'
+
+    manifest = read_manifest(cube_dir)
+    if manifest is None or manifest.get('dimensions') != DIMENSIONS or not isinstance(manifest.get('days'), dict):
+        shutil.rmtree(cube_dir, ignore_errors=True)
+        manifest = {'dimensions': DIMENSIONS, 'measures': list(MEASURES), 'days': {}, 'months': {}}
+
+    digests = day_digests(df, COLUMNS)
+    new_days = sorted(set(digests) - set(manifest['days']))
+    stale_months = {day[:7] for day, digest in manifest['days'].items() if digests.get(day) != digest}
+    months = stale_months | {day[:7] for day in new_days}
+    if not months:
+        print("✓ Rollup cube already up to date")
+        return
+
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    scrape_months = df['scrape_date'].to_numpy().astype('datetime64[M]')
+    new_cells = cube_cells(df[np.isin(scrape_months, np.array(sorted(months), dtype='datetime64[M]'))])
+    for month, cells in new_cells.groupby('month', sort=True):
+        path = partition_dir / f"{month}.parquet"
+        temp_path = path.with_name(path.name + '.tmp')
+        cells.to_parquet(temp_path, index=False)
+        temp_path.replace(path)
+        manifest['months'][month] = len(cells)
+    for month in months - set(new_cells['month']):
+        # No priced listings in the month
+        (partition_dir / f"{month}.parquet").unlink(missing_ok=True)
+        manifest['months'].pop(month, None)
+
+    # Written last: its mtime is the store version readers reload on
+    manifest['days'] = digests
+    manifest['cells'] = sum(manifest['months'].values())
+    manifest['built_at'] = datetime.now().isoformat(timespec='seconds')
+    temp_manifest = cube_dir / 'manifest.json.tmp'
+    with open(temp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    temp_manifest.replace(cube_dir / 'manifest.json')
+
+    print(f"✓ Rollup cube: applied {len(new_days)} days, aggregated {len(months)} months, "
+          f"{manifest['cells']} cells across {len(manifest['months'])} months")
+
+def summarize(cells):
+    """count/mean/std/min/max from summed measures (a DataFrame of cells or groups)"""
+    n = cells['count'].to_numpy(dtype=float)
+    total = cells['price_sum'].to_numpy(dtype=float)
+    variance = (cells['price_sumsq'].to_numpy(dtype=float) - total ** 2 / n) / np.maximum(n - 1, 1)
+    return pd.DataFrame({
+        'count': cells['count'].to_numpy(dtype=np.int64),
+        'mean': (total / n).round(2),
+        'std': np.where(n > 1, np.sqrt(np.clip(variance, 0, None)), np.nan).round(2),
+        'min': cells['price_min'].to_numpy(dtype=float),
+        'max': cells['price_max'].to_numpy(dtype=float)
+    }, index=cells.index)
+
+class RollupCube:
+    """Read side of the rollup cube; all partitions are held in memory"""
+
+    def __init__(self, directory=CUBE_DIR):
+        directory = Path(directory)
+        self.manifest = read_manifest(directory)
+        paths = sorted((directory / 'partitions').glob('*.parquet'))
+        cells = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True) if paths else \
+            pd.DataFrame(columns=DIMENSIONS + list(MEASURES))
+        for dim in DIMENSIONS:
+            cells[dim] = cells[dim].astype('category')
+        self.cells = cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def values(self, dim):
+        return sorted(self.cells[dim].cat.categories)
+
+    def query(self, group_by=(), filters=None, month_from=None, month_to=None, limit=None):
+        """Roll the cube up to ``group_by`` over the cells matching ``filters``
+        ({dimension: [values]}, case-insensitive) and the inclusive month range.
+
+        Returns (groups, totals) where groups is a list of dicts sorted by
+        count, largest first.
+        """
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for dim, wanted in (filters or {}).items():
+            wanted = {str(v).strip().lower() for v in wanted}
+            categories = [c for c in cells[dim].cat.categories if c.lower() in wanted]
+            mask &= cells[dim].isin(categories).to_numpy()
+        if month_from or month_to:
+            months = [m for m in cells['month'].cat.categories
+                      if (not month_from or m >= month_from) and (not month_to or m <= month_to)]
+            mask &= cells['month'].isin(months).to_numpy()
+        selected = cells[mask]
+
+        totals = selected[list(MEASURES)].agg(MEASURES).to_frame().T
+        totals = summarize(totals).iloc[0] if len(selected) else None
+
+        if group_by:
+            grouped = selected.groupby(list(group_by), observed=True, sort=False).agg(MEASURES)
+            grouped = summarize(grouped).sort_values('count', ascending=False, kind='stable')
+            if limit:
+                grouped = grouped.head(limit)
+            groups = grouped.reset_index()
+        else:
+            groups = pd.DataFrame()
+
+        groups = groups.astype(object).where(groups.notna(), None)
+        return groups.to_dict(orient='records'), _record(totals)
+
+def _record(row):
+    if row is None:
+        return {'count': 0, 'mean': None, 'std': None, 'min': None, 'max': None}
+    return {k: (None if pd.isna(v) else (int(v) if k == 'count' else float(v))) for k, v in row.items()}
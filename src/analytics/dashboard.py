@@ -0,0 +1,272 @@
+"""
+Analytics dashboard panels computed from the recent raw daily files.
+
+``RawFrameCache`` parses each raw CSV once per content hash (from the raw
+file catalog) and keeps the concatenation of the recent window, so the
+dashboard and the individual stats endpoints share one load of the data.
+The panel functions below only read the frame they are given, and their
+results are cached with the window they were computed from. The cache is
+shared by the threads of a worker, so loading a new window and computing a
+panel happen under its lock.
+
+``build_snapshot`` (run by clean_data.py) saves a filled cache -- the recent
+files' frames, the panels and the price trend points -- to
+``data/processed/hot/``, and ``RawFrameCache.load_snapshot`` seeds a new
+worker's cache from it, keeping only what still matches the raw files by
+content hash.
+"""
+
+import json
+import os
+import pickle
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+SNAPSHOT_DIR = Path("data/processed/hot")
+
+PRICE_BUCKETS = [
+    ('$0-$500', 0, 500),
+    ('$500-$1k', 500, 1000),
+    ('$1k-$2k', 1000, 2000),
+    ('$2k-$5k', 2000, 5000),
+    ('$5k-$10k', 5000, 10000),
+    ('$10k+', 10000, None)
+]
+DAMAGE_KEYWORDS = [
+    'Front Damage', 'Rear Damage', 'Left', 'Right',
+    'Airbags Deployed', 'Water Damage', 'Fire Damage',
+    'Vandalised', 'Stolen', 'Impact Heavy', 'Impact Medium', 'Impact Light'
+]
+
+def clean_number_column(values, strip='$,'):
+    """Vectorized clean_price/clean_mileage: strip symbols, 'N/A' and junk become NaN"""
+    values = values.astype('string')
+    for char in strip:
+        values = values.str.replace(char, '', regex=False)
+    return pd.to_numeric(values.str.strip(), errors='coerce')
+
+def read_raw_file(path):
+    """One raw daily CSV with Price_Clean and Mileage_Clean columns added"""
+    df = pd.read_csv(path)
+    df['Price_Clean'] = clean_number_column(df['Price'])
+    df['Mileage_Clean'] = clean_number_column(df['Mileage'], strip=',')
+    return df
+
+class RawFrameCache:
+    """Parsed raw files and per-file trend points, keyed by file name and content hash"""
+
+    def __init__(self):
+        self.frames = {}
+        self.trend_points = {}
+        self.recent_key = None
+        self.recent_frame = None
+        self.panels = {}
+        self.lock = threading.RLock()
+        self.page_key = None
+        self.page = None
+        self.stats = Counter()  # (cache, 'hit' | 'miss') -> lookups
+
+    def frame(self, catalog, entry):
+        key = (entry['file'], entry['sha256'])
+        self.stats[('raw_frames', 'hit' if key in self.frames else 'miss')] += 1
+        if key not in self.frames:
+            self.frames[key] = read_raw_file(catalog.path(entry))
+        return self.frames[key]
+
+    def recent(self, catalog, days=30):
+        """The last ``days`` files on file as one frame (shared: do not modify)"""
+        entries = catalog.entries[-days:]
+        key = tuple((e['file'], e['sha256']) for e in entries)
+        with self.lock:
+            if key != self.recent_key:
+                frames = [self.frame(catalog, e) for e in entries]
+                # Only the current window stays cached
+                self.frames = {k: self.frames[k] for k in key}
+                self.recent_frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                self.recent_key = key
+                self.panels = {}
+            return self.recent_frame
+
+    def panel(self, catalog, compute, days=30):
+        """``compute(recent frame)``, cached until the recent window changes"""
+        with self.lock:
+            df = self.recent(catalog, days)
+            self.stats[('panels', 'hit' if compute.__name__ in self.panels else 'miss')] += 1
+            if compute.__name__ not in self.panels:
+                self.panels[compute.__name__] = compute(df)
+            return self.panels[compute.__name__]
+
+    def price_trends(self, catalog, step=7):
+        """Daily price summary for every ``step``-th file"""
+        trends = []
+        for entry in catalog.entries[::step]:
+            key = (entry['file'], entry['sha256'])
+            self.stats[('trend_points', 'hit' if key in self.trend_points else 'miss')] += 1
+            if key not in self.trend_points:
+                cached = self.frames.get(key)
+                df = cached if cached is not None else read_raw_file(catalog.path(entry))
+                self.trend_points[key] = price_trend_point(df, entry['date'])
+            if self.trend_points[key]:
+                trends.append(self.trend_points[key])
+        return trends
+
+    def latest_page(self, catalog):
+        """Landing page table and stats of the latest file, rendered once per file"""
+        entry = catalog.entries[-1]
+        key = (entry['file'], entry['sha256'])
+        with self.lock:
+            self.stats[('pages', 'hit' if key == self.page_key else 'miss')] += 1
+            if key != self.page_key:
+                self.page = listings_page(self.frame(catalog, entry), Path(entry['file']).stem.replace('car_data_', ''))
+                self.page_key = key
+            return self.page
+
+    def save_snapshot(self, directory=SNAPSHOT_DIR):
+        """Write the cached frames, panels and trend points for load_snapshot"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            with open(directory / 'frames.pkl.tmp', 'wb') as f:
+                pickle.dump(self.frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+            manifest = {
+                'window': self.recent_key,
+                'panels': self.panels,
+                'trend_points': [[file, sha256, point] for (file, sha256), point in self.trend_points.items()],
+                'built_at': datetime.now().isoformat(timespec='seconds')
+            }
+        os.replace(directory / 'frames.pkl.tmp', directory / 'frames.pkl')
+        # Written last: a manifest always describes a complete snapshot
+        with open(directory / 'manifest.json.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(directory / 'manifest.json.tmp', directory / 'manifest.json')
+
+    def load_snapshot(self, catalog, directory=SNAPSHOT_DIR):
+        """Seed the cache from a snapshot; entries whose raw file has changed
+        since are skipped. Returns False if there is no readable snapshot."""
+        directory = Path(directory)
+        try:
+            with open(directory / 'manifest.json') as f:
+                manifest = json.load(f)
+            with open(directory / 'frames.pkl', 'rb') as f:
+                frames = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError):
+            return False
+
+        current = {(e['file'], e['sha256']) for e in catalog.entries}
+        window = tuple(tuple(key) for key in manifest['window'] or ())
+        with self.lock:
+            self.frames.update({key: frame for key, frame in frames.items() if key in current})
+            self.trend_points.update({(file, sha256): point for file, sha256, point in manifest['trend_points']
+                                      if (file, sha256) in current})
+            if window and window == tuple((e['file'], e['sha256']) for e in catalog.entries[-len(window):]):
+                self.recent_frame = pd.concat([self.frames[key] for key in window], ignore_index=True)
+                self.recent_key = window
+                self.panels = dict(manifest['panels'])
+        return True
+
+def build_snapshot(catalog, directory=SNAPSHOT_DIR, days=30):
+    """Compute the recent window, the panels and the trend points and save them
+    for workers to start from"""
+    print("\nBuilding hot data snapshot...")
+    cache = RawFrameCache()
+    for compute in PANELS:
+        cache.panel(catalog, compute, days)
+    cache.price_trends(catalog)
+    cache.save_snapshot(directory)
+    print(f"✓ Hot data snapshot: {len(cache.frames)} recent files, {len(cache.panels)} panels, "
+          f"{len(cache.trend_points)} trend points")
+
+def listings_page(df, file_date):
+    """Table HTML and summary stats of one day's listings, for the landing page"""
+    stats = {
+        'total': len(df),
+        'avg_price': round(df['Price_Clean'].mean(), 2) if df['Price_Clean'].notna().any() else 0,
+        'registered': len(df[df['Registration Status'] == 'Yes']),
+        'file_date': file_date,
+        'top_manufacturer': df['Manufacturer'].mode()[0] if not df.empty else 'N/A'
+    }
+    
+    # Reorder columns: priority columns first, then the rest
+    priority_columns = ['Manufacturer', 'Model', 'Price', 'Mileage', 'Damage description', 'Link']
+    other_columns = [col for col in df.columns if col not in priority_columns]
+    display_data = df[priority_columns + other_columns].copy()
+    display_data['Price_Clean'] = display_data['Price_Clean'].astype('float64')
+    display_data['Mileage_Clean'] = display_data['Mileage_Clean'].astype('float64')
+    
+    # Make links clickable
+    display_data['Link'] = display_data['Link'].apply(
+        lambda x: f'<a href="{x}" target="_blank">View</a>' if pd.notna(x) else ''
+    )
+    
+    table_html = display_data.to_html(index=False, classes='table table-striped table-hover',
+                                      escape=False, border=0)
+    return table_html, stats
+
+def price_trend_point(df, date):
+    valid_prices = df['Price_Clean'].dropna()
+    if len(valid_prices) == 0:
+        return None
+    return {
+        'date': date,
+        'avg_price': float(round(valid_prices.mean(), 2)),
+        'median_price': float(round(valid_prices.median(), 2)),
+        'count': int(len(df))
+    }
+
+def overview(df):
+    valid_prices = df['Price_Clean'].dropna()
+    valid_mileage = df['Mileage_Clean'].dropna()
+    return {
+        'total_listings': int(len(df)),
+        'unique_vehicles': int(df['Link'].nunique() if 'Link' in df else 0),
+        'manufacturers': int(df['Manufacturer'].nunique()),
+        'avg_price': float(round(valid_prices.mean(), 2)) if len(valid_prices) > 0 else 0,
+        'median_price': float(round(valid_prices.median(), 2)) if len(valid_prices) > 0 else 0,
+        'min_price': float(round(valid_prices.min(), 2)) if len(valid_prices) > 0 else 0,
+        'max_price': float(round(valid_prices.max(), 2)) if len(valid_prices) > 0 else 0,
+        'avg_mileage': float(round(valid_mileage.mean(), 2)) if len(valid_mileage) > 0 else 0,
+        'top_manufacturers': {k: int(v) for k, v in df['Manufacturer'].value_counts().head(10).to_dict().items()},
+        'fuel_types': {k: int(v) for k, v in df['Fuel Type'].value_counts().to_dict().items()} if 'Fuel Type' in df else {},
+        'registration_status': {k: int(v) for k, v in df['Registration Status'].value_counts().to_dict().items()}
+    }
+
+def manufacturers(df, top=50):
+    priced = df[df['Price_Clean'].notna()]
+    stats = priced.groupby('Manufacturer').agg(
+        avg_price=('Price_Clean', 'mean'),
+        median_price=('Price_Clean', 'median'),
+        count=('Price_Clean', 'count'),
+        unique_models=('Model', 'nunique')
+    ).round(2).sort_values('count', ascending=False, kind='stable').head(top)
+    return [
+        {
+            'manufacturer': mfg,
+            'avg_price': float(row['avg_price']),
+            'median_price': float(row['median_price']),
+            'count': int(row['count']),
+            'unique_models': int(row['unique_models'])
+        }
+        for mfg, row in stats.iterrows()
+    ]
+
+def damage_analysis(df):
+    descriptions = df['Damage description'].str.lower()
+    damage_counts = {}
+    for keyword in DAMAGE_KEYWORDS:
+        count = descriptions.str.contains(keyword.lower(), regex=False, na=False).sum()
+        if count > 0:
+            damage_counts[keyword] = int(count)
+    return damage_counts
+
+def price_distribution(df):
+    valid_prices = df['Price_Clean'].dropna()
+    return {
+        label: int(((valid_prices >= low) & (valid_prices < high if high else True)).sum())
+        for label, low, high in PRICE_BUCKETS
+    }
+
+PANELS = [overview, manufacturers, damage_analysis, price_distribution]
@@ -0,0 +1,244 @@
+"""
+Day-over-day listing lifecycle events.
+
+Each raw daily file is compared with the previous file on record by a hash
+join on Vehicle_ID, which costs O(rows of the two days) however long the
+history is. Event types:
+
+    new              first time the vehicle is listed
+    price_changed    listed on both days at different prices
+    details_changed  listed on both days with other fields changed
+                     (``changed`` names the columns)
+    removed          listed on the previous day but not today (likely sold)
+    reappeared       not listed on the previous day but seen before
+
+Events are stored as one parquet partition per month under
+``data/processed/events/``, next to ``seen.parquet`` -- the last date and
+price of every vehicle seen so far, which tells new vehicles from
+reappearing ones -- and ``manifest.json``, written last, with the content
+hash of each processed day and its event counts. ``update_events`` only
+diffs the days that have not been processed yet; if an already processed
+file changed or an earlier day was backfilled, it rebuilds from scratch.
+An update is written to a copy of the directory (hard links to the
+unchanged partitions) that is swapped into place once complete, so an
+interrupted run leaves the previous version and is simply repeated.
+
+Usage (bring the events up to date with data/raw):
+    python -m src.analytics.events
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.catalog import RawCatalog
+from src.analytics.dashboard import clean_number_column
+from src.analytics.storage import staging_directory, swap_directory
+
+EVENTS_DIR = Path("data/processed/events")
+EVENT_TYPES = ['new', 'price_changed', 'details_changed', 'removed', 'reappeared']
+DETAIL_COLUMNS = [
+    'Manufacturer', 'Model', 'Registration Status', 'Mileage', 'Keys',
+    'Damage description', 'Transmission', 'Seats', 'Fuel Type'
+]
+COLUMNS = ['date', 'type', 'vehicle_id', 'manufacturer', 'model', 'price', 'previous_price',
+           'previous_date', 'changed']
+
+def read_day(path):
+    """One raw daily file as (object) strings, indexed by vehicle id, with a Price_Clean column"""
+    df = pd.read_csv(path, dtype=object)
+    df['vehicle_id'] = df['Link'].str.extract(r'/(\d{18})/', expand=False)
+    df = df.dropna(subset=['vehicle_id']).drop_duplicates('vehicle_id').set_index('vehicle_id')
+    df['Price_Clean'] = clean_number_column(df['Price'])
+    return df
+
+def _events(date, event_type, rows, price=None, previous_price=None, previous_date=None, changed=None):
+    n = len(rows)
+    return pd.DataFrame({
+        'date': date,
+        'type': event_type,
+        'vehicle_id': rows.index.to_numpy(dtype=object),
+        'manufacturer': rows['Manufacturer'].to_numpy(dtype=object),
+        'model': rows['Model'].to_numpy(dtype=object),
+        'price': rows['Price_Clean'].to_numpy(dtype=float) if price is None else price,
+        'previous_price': np.full(n, np.nan) if previous_price is None else previous_price,
+        'previous_date': np.full(n, None, dtype=object) if previous_date is None else previous_date,
+        'changed': np.full(n, None, dtype=object) if changed is None else changed
+    }, columns=COLUMNS)
+
+def diff_days(date, previous, today, seen):
+    """Events of ``date``: ``today`` against the ``previous`` day's frame
+    (None for the first day), with ``seen`` ({vehicle_id: (date, price)}) of
+    the days before. Updates ``seen``."""
+    previous = previous if previous is not None else today.iloc[0:0]
+    on_both = today.index.intersection(previous.index)
+    added = today[~today.index.isin(previous.index)]
+    removed = previous[~previous.index.isin(today.index)]
+
+    known = np.array([v in seen for v in added.index], dtype=bool)
+    earlier = [seen[v] for v in added.index[known]]
+    frames = [
+        _events(date, 'new', added[~known]),
+        _events(date, 'reappeared', added[known],
+                previous_price=np.array([p for _, p in earlier], dtype=float),
+                previous_date=np.array([d for d, _ in earlier], dtype=object)),
+        _events(date, 'removed', removed, price=np.full(len(removed), np.nan),
+                previous_price=removed['Price_Clean'].to_numpy(dtype=float),
+                previous_date=np.full(len(removed), previous.attrs.get('date'), dtype=object))
+    ]
+
+    if len(on_both):
+        now, before = today.loc[on_both], previous.loc[on_both]
+        now_price = now['Price_Clean'].to_numpy(dtype=float)
+        before_price = before['Price_Clean'].to_numpy(dtype=float)
+        price_changed = ~((now_price == before_price) | (np.isnan(now_price) & np.isnan(before_price)))
+        frames.append(_events(date, 'price_changed', now[price_changed], previous_price=before_price[price_changed],
+                              previous_date=np.full(price_changed.sum(), previous.attrs.get('date'), dtype=object)))
+
+        columns = [c for c in DETAIL_COLUMNS if c in now and c in before]
+        changed_cells = (now[columns].fillna('').to_numpy() != before[columns].fillna('').to_numpy())
+        details_changed = changed_cells.any(axis=1)
+        changed = [','.join(c for c, flag in zip(columns, row) if flag) for row in changed_cells[details_changed]]
+        frames.append(_events(date, 'details_changed', now[details_changed],
+                              previous_date=np.full(details_changed.sum(), previous.attrs.get('date'), dtype=object),
+                              changed=np.array(changed, dtype=object)))
+
+    for vehicle_id, price in zip(today.index, today['Price_Clean'].to_numpy(dtype=float)):
+        seen[vehicle_id] = (date, price)
+    events = pd.concat([f for f in frames if len(f)], ignore_index=True) if any(len(f) for f in frames) \
+        else pd.DataFrame(columns=COLUMNS)
+    return events
+
+def read_manifest(events_dir=EVENTS_DIR):
+    try:
+        with open(Path(events_dir) / 'manifest.json') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def update_events(catalog=None, events_dir=EVENTS_DIR):
+    """Diff the raw days not yet processed and append their events"""
+    print("\nUpdating listing events...")
+    catalog = catalog or RawCatalog().refresh()
+    events_dir = Path(events_dir)
+
+    manifest = read_manifest(events_dir)
+    processed = (manifest or {}).get('days', {})
+    entries = catalog.entries
+    done = entries[:len(processed)]
+    # Incremental only if the processed days are an unchanged prefix of the catalog
+    if manifest is None or manifest.get('event_types') != EVENT_TYPES or len(processed) > len(entries) or \
+            any(processed.get(e['date'], {}).get('sha256') != e['sha256'] for e in done):
+        manifest, processed, done = {'event_types': EVENT_TYPES, 'days': {}}, {}, []
+
+    pending = entries[len(done):]
+    if not pending:
+        print("✓ Listing events already up to date")
+        return
+
+    seen = {}
+    if done:
+        state = pd.read_parquet(events_dir / 'seen.parquet')
+        seen = dict(zip(state['vehicle_id'], zip(state['last_date'], state['last_price'])))
+        previous = read_day(catalog.path(done[-1]))
+        previous.attrs['date'] = done[-1]['date']
+    else:
+        previous = None
+
+    # Built beside the store and swapped in whole
+    staging_dir = staging_directory(events_dir, copy=bool(done))
+    partition_dir = staging_dir / 'partitions'
+    partition_dir.mkdir(exist_ok=True)
+    month_events = {}
+    for entry in pending:
+        today = read_day(catalog.path(entry))
+        today.attrs['date'] = entry['date']
+        events = diff_days(entry['date'], previous, today, seen)
+        month_events.setdefault(entry['date'][:7], []).append(events)
+        counts = events['type'].value_counts()
+        processed[entry['date']] = {'sha256': entry['sha256'],
+                                    **{t: int(counts.get(t, 0)) for t in EVENT_TYPES}}
+        previous = today
+
+    for month, frames in month_events.items():
+        path = partition_dir / f"{month}.parquet"
+        if path.exists():
+            frames = [pd.read_parquet(path)] + frames
+        # A new file, not a write through the hard link to the current store's partition
+        temp_path = path.with_name(path.name + '.tmp')
+        pd.concat(frames, ignore_index=True).astype({'price': float, 'previous_price': float}) \
+            .to_parquet(temp_path, index=False)
+        temp_path.replace(path)
+
+    state = pd.DataFrame({
+        'vehicle_id': list(seen),
+        'last_date': [d for d, _ in seen.values()],
+        'last_price': np.array([p for _, p in seen.values()], dtype=float)
+    })
+    state.to_parquet(staging_dir / 'seen.parquet.tmp', index=False)
+    (staging_dir / 'seen.parquet.tmp').replace(staging_dir / 'seen.parquet')
+
+    # Written last: its mtime is the store version readers reload on
+    manifest['days'] = processed
+    manifest['built_at'] = datetime.now().isoformat(timespec='seconds')
+    (staging_dir / 'manifest.json').unlink(missing_ok=True)
+    with open(staging_dir / 'manifest.json', 'w') as f:
+        json.dump(manifest, f, indent=1)
+    swap_directory(staging_dir, events_dir)
+
+    total = sum(processed[e['date']][t] for e in pending for t in EVENT_TYPES)
+    print(f"✓ Listing events: diffed {len(pending)} days, {total} events, {len(seen)} vehicles seen")
+
+class EventLog:
+    """Read side of the listing events; month partitions are loaded on first use"""
+
+    def __init__(self, directory=EVENTS_DIR):
+        self.directory = Path(directory)
+        self.manifest = read_manifest(directory) or {'days': {}}
+        self.days = sorted(self.manifest['days'])
+        self.partitions = {}
+
+    def latest_date(self):
+        return self.days[-1] if self.days else None
+
+    def counts(self, start, end):
+        """{event type: count} over the inclusive date range, from the manifest"""
+        totals = dict.fromkeys(EVENT_TYPES, 0)
+        for day in self.days:
+            if start <= day <= end:
+                for t in EVENT_TYPES:
+                    totals[t] += self.manifest['days'][day][t]
+        return totals
+
+    def partition(self, month):
+        if month not in self.partitions:
+            path = self.directory / 'partitions' / f"{month}.parquet"
+            self.partitions[month] = pd.read_parquet(path) if path.exists() else pd.DataFrame(columns=COLUMNS)
+        return self.partitions[month]
+
+    def query(self, start, end, types=None, manufacturers=None, limit=None):
+        """Events in the inclusive date range, optionally of the given types
+        and manufacturers (case-insensitive); returns (total, events)"""
+        months = sorted({day[:7] for day in self.days if start <= day <= end})
+        frames = []
+        for month in months:
+            events = self.partition(month)
+            mask = ((events['date'] >= start) & (events['date'] <= end)).to_numpy()
+            if types:
+                mask = mask & events['type'].isin(types).to_numpy()
+            if manufacturers:
+                wanted = {m.strip().lower() for m in manufacturers}
+                mask = mask & events['manufacturer'].str.lower().isin(wanted).to_numpy()
+            frames.append(events[mask])
+        selected = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+        total = len(selected)
+        if limit:
+            selected = selected.head(limit)
+        selected = selected.astype(object).where(selected.notna(), None)
+        return total, selected.to_dict(orient='records')
+
+if __name__ == '__main__':
+    update_events()
@@ -0,0 +1,129 @@
+"""
+Streaming filtered export of the public processed dataset.
+
+Rows are read from ``car_auction_public.parquet`` in record batches with
+the filters pushed down to the parquet scan (row groups whose statistics
+rule out the date or price range are skipped), and each batch is encoded
+and handed out before the next one is read. Memory use is bounded by the
+batch size and the parquet row group size, not by the size of the export.
+
+Formats: ``csv``, ``jsonl`` (one JSON object per line) and ``parquet``
+(one row group per batch).
+"""
+
+import io
+from datetime import datetime, time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PUBLIC_PARQUET = Path("data/processed/car_auction_public.parquet")
+BATCH_SIZE = 10000
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+def export_filter(schema, start=None, end=None, manufacturers=None, models=None,
+                  min_price=None, max_price=None):
+    """pyarrow filter expression for the export parameters (None for no filter)"""
+    conditions = []
+    date_type = schema.field('scrape_date').type
+    if start:
+        conditions.append(pc.field('scrape_date') >= pa.scalar(datetime.fromisoformat(start), date_type))
+    if end:
+        end_of_day = datetime.combine(datetime.fromisoformat(end).date(), time.max)
+        conditions.append(pc.field('scrape_date') <= pa.scalar(end_of_day, date_type))
+    if manufacturers:
+        wanted = pa.array([m.strip().lower() for m in manufacturers])
+        conditions.append(pc.is_in(pc.utf8_lower(pc.field('Manufacturer')), value_set=wanted))
+    if models:
+        wanted = pa.array([m.strip().lower() for m in models])
+        conditions.append(pc.is_in(pc.utf8_lower(pc.field('Model')), value_set=wanted))
+    if min_price is not None:
+        conditions.append(pc.field('Price_USD') >= min_price)
+    if max_price is not None:
+        conditions.append(pc.field('Price_USD') <= max_price)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def record_batches(parquet_path=PUBLIC_PARQUET, batch_size=BATCH_SIZE, columns=None, **filters):
+    """Yield the filtered rows of the public dataset (optionally only ``columns``) as record batches"""
+    dataset = ds.dataset(parquet_path, format='parquet')
+    # No pre-buffering of whole row groups and minimal readahead: the
+    # consumer is a network client, so reading ahead only costs memory
+    scan_options = ds.ParquetFragmentScanOptions(pre_buffer=False, buffer_size=1 << 20)
+    scanner = dataset.scanner(columns=columns, filter=export_filter(dataset.schema, **filters),
+                              batch_size=batch_size, batch_readahead=1, fragment_readahead=1,
+                              use_threads=False, fragment_scan_options=scan_options)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that collects what the parquet writer writes"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def _scrape_day(batch):
+    """scrape_date as a plain YYYY-MM-DD string, as in the CSV exports of clean_data.py"""
+    i = batch.schema.get_field_index('scrape_date')
+    if i < 0 or not pa.types.is_timestamp(batch.schema.field(i).type):
+        return batch
+    days = pc.cast(pc.cast(batch.column(i), pa.date32()), pa.string())
+    return batch.set_column(i, 'scrape_date', days)
+
+def stream_export(fmt, parquet_path=PUBLIC_PARQUET, **filters):
+    """Yield the encoded export in chunks, one per record batch"""
+    batches = record_batches(parquet_path, **filters)
+
+    if fmt == 'parquet':
+        sink = _ChunkSink()
+        schema = pq.read_schema(parquet_path)
+        with pq.ParquetWriter(sink, schema, compression='snappy') as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    elif fmt == 'csv':
+        header = True
+        for batch in batches:
+            buffer = io.BytesIO()
+            pa_csv.write_csv(_scrape_day(batch), buffer, pa_csv.WriteOptions(include_header=header))
+            header = False
+            yield buffer.getvalue()
+
+    elif fmt == 'jsonl':
+        for batch in batches:
+            lines = _scrape_day(batch).to_pandas().to_json(orient='records', lines=True)
+            yield (lines if lines.endswith('\n') else lines + '\n').encode()
+
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
@@ -0,0 +1,327 @@
+"""
+Background jobs for long-running analytics queries.
+
+A job is a query kind plus parameters. Its id is a hash of the kind, the
+parameters and the data version, so re-running a query against unchanged
+data is answered from ``data/cache/jobs/<job_id>.json`` and a new day of
+data gets new ids. Jobs run on a small thread pool inside the web worker.
+While one runs, ``<job_id>.running`` marks it on disk, so identical
+submissions -- from any Gunicorn worker -- attach to it instead of starting
+a second run, and any worker can report its status. The marker is created
+with O_EXCL, so of simultaneous submissions exactly one starts the run; a
+marker is taken over only when the process that wrote it is gone.
+
+Query kinds:
+
+    manufacturer_trends  daily/weekly/monthly price and listing counts per
+                         manufacturer over the full history
+    search               listings matching date/manufacturer/model/price
+                         filters over the full history
+    cube                 a rollup cube slice (see src.analytics.cube)
+
+Parameters are parsed as the synchronous endpoints parse them before the id
+is computed: a bad value is rejected up front rather than cached as a
+failed job, and equivalent spellings (``"Toyota,Mazda"`` and
+``["mazda", "toyota"]``, or a default written out) share one job.
+"""
+
+import hashlib
+import inspect
+import json
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.analytics.cube import CUBE_DIR, DIMENSIONS, RollupCube
+from src.analytics.export import PUBLIC_PARQUET, record_batches
+
+JOB_CACHE_DIR = Path("data/cache/jobs")
+RESULT_MAX_AGE = 7 * 24 * 3600  # seconds; results for old data versions are never asked for again
+SEARCH_MAX_RESULTS = 10000
+MARKER_WRITE_GRACE = 10  # seconds an empty .running marker is taken as still being written
+
+def manufacturer_trends(manufacturers=None, freq='W', parquet_path=PUBLIC_PARQUET):
+    """Average/median price and listings per manufacturer and period over the full history"""
+    if freq not in ('D', 'W', 'M'):
+        raise ValueError("freq must be one of D, W, M")
+    df = pd.concat([b.to_pandas() for b in record_batches(
+        parquet_path, manufacturers=manufacturers, columns=['scrape_date', 'Manufacturer', 'Price_USD'])],
+        ignore_index=True)
+    if df.empty:
+        return {}
+    period = df['scrape_date'].dt.to_period(freq).dt.start_time.dt.strftime('%Y-%m-%d')
+    stats = df.groupby(['Manufacturer', period])['Price_USD'].agg(['mean', 'median', 'count']).round(2)
+    return {
+        mfg: [
+            {'period': p, 'avg_price': float(row['mean']), 'median_price': float(row['median']), 'count': int(row['count'])}
+            for p, row in group.droplevel(0).iterrows()
+        ]
+        for mfg, group in stats.groupby(level=0)
+    }
+
+def search(start=None, end=None, manufacturers=None, models=None, min_price=None, max_price=None,
+           limit=1000, parquet_path=PUBLIC_PARQUET):
+    """Listings matching the filters over the full history (first ``limit`` rows and the total)"""
+    limit = min(int(limit), SEARCH_MAX_RESULTS)
+    rows = []
+    total = 0
+    for batch in record_batches(parquet_path, start=start, end=end, manufacturers=manufacturers,
+                                models=models, min_price=min_price, max_price=max_price):
+        total += batch.num_rows
+        if len(rows) < limit:
+            rows.extend(batch.slice(0, limit - len(rows)).to_pylist())
+    for row in rows:
+        row['scrape_date'] = str(row['scrape_date'])[:10]
+    return {'total': total, 'count': len(rows), 'results': rows}
+
+def cube(group_by=(), filters=None, month_from=None, month_to=None, limit=None, cube_dir=CUBE_DIR):
+    """A rollup cube slice without a row limit"""
+    groups, totals = RollupCube(cube_dir).query(group_by, filters, month_from, month_to, limit)
+    return {'totals': totals, 'count': len(groups), 'groups': groups}
+
+# ---- parameter parsers: each returns the canonical value or raises ValueError ----
+
+def _values(value):
+    """A comma-separated string or a list of strings, as a list"""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError("must be a comma-separated string or a list of strings")
+    return [v.strip() for v in value if v.strip()]
+
+def _names(value):
+    """Manufacturers or models; matched case-insensitively, so order and case do not matter"""
+    return sorted({v.lower() for v in _values(value)}) or None
+
+def _date(value):
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError("must be a date YYYY-MM-DD")
+
+def _month(value):
+    if not isinstance(value, str) or not re.fullmatch(r'\d{4}-(0[1-9]|1[0-2])', value):
+        raise ValueError("must be a month YYYY-MM")
+    return value
+
+def _price(value):
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        price = None
+    if isinstance(value, bool) or price is None or not math.isfinite(price) or price < 0:
+        raise ValueError("must be a non-negative number")
+    return price
+
+def _limit(maximum=None):
+    def parse(value):
+        try:
+            limit = int(value) if isinstance(value, (int, str)) and not isinstance(value, bool) else None
+        except ValueError:
+            limit = None
+        if limit is None or limit < 1 or (maximum and limit > maximum):
+            raise ValueError(f"must be an integer between 1 and {maximum}" if maximum else "must be an integer of at least 1")
+        return limit
+    return parse
+
+def _freq(value):
+    if not isinstance(value, str) or value.upper() not in ('D', 'W', 'M'):
+        raise ValueError("must be one of D, W, M")
+    return value.upper()
+
+def _group_by(value):
+    dims = list(dict.fromkeys(_values(value)))
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"has unknown dimension(s): {', '.join(unknown)}")
+    return dims
+
+def _filters(value):
+    if not isinstance(value, dict):
+        raise ValueError("must be an object of {dimension: values}")
+    unknown = [d for d in value if d not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"has unknown dimension(s): {', '.join(unknown)}")
+    # The cube compares values case-insensitively
+    filters = {dim: sorted({v.lower() for v in _values(values)}) for dim, values in sorted(value.items())}
+    return {dim: values for dim, values in filters.items() if values} or None
+
+JOB_KINDS = {
+    'manufacturer_trends': (manufacturer_trends, {'manufacturers': _names, 'freq': _freq}),
+    'search': (search, {'start': _date, 'end': _date, 'manufacturers': _names, 'models': _names,
+                        'min_price': _price, 'max_price': _price, 'limit': _limit(SEARCH_MAX_RESULTS)}),
+    'cube': (cube, {'group_by': _group_by, 'filters': _filters, 'month_from': _month, 'month_to': _month,
+                    'limit': _limit()})
+}
+
+def parse_params(function, parsers, params):
+    """Canonical parameters of a job; raises ValueError for an unknown or
+    invalid one. Parameters left at the function's default are dropped"""
+    unknown = set(params) - set(parsers)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+    defaults = inspect.signature(function).parameters
+    parsed = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        try:
+            value = parsers[name](value)
+        except ValueError as e:
+            raise ValueError(f"{name} {e}")
+        if value is not None and value != defaults[name].default:
+            parsed[name] = value
+    return parsed
+
+def job_id(kind, params, data_version):
+    key = json.dumps({'kind': kind, 'params': params, 'data_version': data_version}, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True  # Another user's process
+    except OSError:
+        return False
+
+class JobQueue:
+    """Thread pool plus on-disk result cache for analytics jobs"""
+
+    def __init__(self, cache_dir=JOB_CACHE_DIR, max_workers=2, kinds=JOB_KINDS):
+        self.cache_dir = Path(cache_dir)
+        self.kinds = kinds
+        self.max_workers = max_workers
+        self.executor = None
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def path(self, job_id, suffix='.json'):
+        return self.cache_dir / f"{job_id}{suffix}"
+
+    def submit(self, kind, params, data_version):
+        """Queue a job (or attach to an identical one); returns (job_id, status)"""
+        if not isinstance(kind, str) or kind not in self.kinds:
+            raise ValueError(f"Unknown job kind: {kind}")
+        params = parse_params(*self.kinds[kind], params)
+
+        jid = job_id(kind, params, data_version)
+        with self.lock:
+            state = self.status(jid)
+            if state and state['status'] in ('done', 'queued', 'running'):
+                return jid, state['status']
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.prune()
+            if not self.claim(jid, {'job_id': jid, 'kind': kind, 'params': params, 'pid': os.getpid(),
+                                    'submitted_at': datetime.now().isoformat(timespec='seconds')}):
+                return jid, 'running'  # Another worker started it since the status check
+            self.path(jid).unlink(missing_ok=True)  # a previous failure
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='analytics-job')
+            self.futures[jid] = self.executor.submit(self.run, jid, kind, params, data_version)
+        return jid, 'queued'
+
+    def claim(self, jid, marker):
+        """Create the ``.running`` marker of a job; False if a live run in
+        another process holds it"""
+        path = self.path(jid, '.running')
+        while True:
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                break
+            except FileExistsError:
+                if self.running_marker(jid) is not None:
+                    return False
+                # Left by a worker that exited before finishing
+                path.unlink(missing_ok=True)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(marker, f, default=str)
+        return True
+
+    def running_marker(self, jid):
+        """The ``.running`` marker of a live run in another process, or None
+        if there is none or its worker has exited"""
+        path = self.path(jid, '.running')
+        try:
+            with open(path) as f:
+                marker = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Just created by another worker and not written yet, unless long abandoned
+            try:
+                written = time.time() - path.stat().st_mtime < MARKER_WRITE_GRACE
+            except OSError:
+                return None
+            return {'job_id': jid, 'pid': None, 'submitted_at': None} if written else None
+        if marker['pid'] != os.getpid() and _pid_alive(marker['pid']):
+            return marker
+        return None
+
+    def run(self, jid, kind, params, data_version):
+        start = time.perf_counter()
+        record = {'job_id': jid, 'kind': kind, 'params': params, 'data_version': data_version}
+        try:
+            record['result'] = self.kinds[kind][0](**params)
+            record['status'] = 'done'
+        except Exception as e:
+            record['status'] = 'failed'
+            record['error'] = str(e)
+        record['seconds'] = round(time.perf_counter() - start, 3)
+        record['finished_at'] = datetime.now().isoformat(timespec='seconds')
+        self.write(jid, '.json', record)
+        self.path(jid, '.running').unlink(missing_ok=True)
+        with self.lock:
+            self.futures.pop(jid, None)
+
+    def write(self, jid, suffix, record):
+        temp_path = self.path(jid, f"{suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(record, f, default=str)
+        os.replace(temp_path, self.path(jid, suffix))
+
+    def status(self, jid):
+        """{'status': queued|running|done|failed, ...} or None for an unknown job"""
+        try:
+            with open(self.path(jid)) as f:
+                record = json.load(f)
+            return {k: v for k, v in record.items() if k != 'result'}
+        except (OSError, ValueError):
+            pass
+
+        future = self.futures.get(jid)
+        if future is not None:
+            return {'job_id': jid, 'status': 'running' if future.running() else 'queued'}
+
+        marker = self.running_marker(jid)
+        if marker is not None:
+            return {'job_id': jid, 'status': 'running', 'submitted_at': marker['submitted_at']}
+        return None  # Unknown, or its worker exited before finishing
+
+    def prune(self):
+        """Delete finished results older than RESULT_MAX_AGE"""
+        cutoff = time.time() - RESULT_MAX_AGE
+        with os.scandir(self.cache_dir) as listing:
+            for item in listing:
+                if item.name.endswith('.json') and item.stat().st_mtime < cutoff:
+                    try:
+                        os.unlink(item.path)
+                    except OSError:
+                        pass
+
+    def result(self, jid):
+        """The finished job record including its result, or None"""
+        try:
+            with open(self.path(jid)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
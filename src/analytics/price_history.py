@@ -0,0 +1,109 @@
+"""
+Per-vehicle price history.
+
+Every (vehicle, scrape date) record is laid out contiguously by vehicle:
+
+    vehicle_ids  sorted unique Vehicle_IDs (fixed-width bytes)
+    offsets      len(vehicle_ids) + 1 row offsets into the arrays below
+    dates        scrape date as days since 1970-01-01 (int32)
+    prices       Price_USD (float64)
+    mileage      Mileage_Miles (float64, NaN when unknown)
+
+A vehicle's timeline is ``dates[offsets[i]:offsets[i + 1]]`` etc., where
+``i`` is found by binary search over ``vehicle_ids``. The arrays are saved
+as ``.npy`` files and memory-mapped when loaded.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.analytics.storage import load_arrays, save_arrays
+
+HISTORY_DIR = Path("data/processed/price_history")
+ARRAYS = ['vehicle_ids', 'offsets', 'dates', 'prices', 'mileage']
+
+def build_price_history(df, output_dir=HISTORY_DIR):
+    """Build the price history store from the cleaned, deduplicated listings"""
+    print("\nBuilding vehicle price history...")
+
+    history = df[['Vehicle_ID', 'scrape_date', 'Price_USD', 'Mileage_Miles']].dropna(subset=['Vehicle_ID'])
+    history = history.sort_values(['Vehicle_ID', 'scrape_date'], kind='stable')
+
+    ids = history['Vehicle_ID'].astype(str).to_numpy()
+    vehicle_ids, starts = np.unique(ids, return_index=True)
+    offsets = np.append(starts, len(ids)).astype(np.int64)
+
+    arrays = {
+        'vehicle_ids': vehicle_ids.astype('S'),
+        'offsets': offsets,
+        'dates': history['scrape_date'].to_numpy().astype('datetime64[D]').astype(np.int32),
+        'prices': history['Price_USD'].to_numpy(dtype=np.float64),
+        'mileage': history['Mileage_Miles'].to_numpy(dtype=np.float64)
+    }
+    save_arrays(output_dir, arrays, {
+        'vehicles': len(vehicle_ids),
+        'records': len(ids),
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    })
+
+    print(f"✓ Price history: {len(vehicle_ids)} vehicles, {len(ids)} records")
+
+def _value(x):
+    return None if np.isnan(x) else float(x)
+
+class PriceHistoryIndex:
+    """Read side of the price history store"""
+
+    def __init__(self, directory=HISTORY_DIR):
+        arrays, self.manifest = load_arrays(directory, ARRAYS)
+        self.vehicle_ids = arrays['vehicle_ids']
+        self.offsets = arrays['offsets']
+        self.dates = arrays['dates']
+        self.prices = arrays['prices']
+        self.mileage = arrays['mileage']
+
+    def __len__(self):
+        return len(self.vehicle_ids)
+
+    def positions(self, vehicle_ids):
+        """Index of each id in ``vehicle_ids``, or -1 where the id is unknown"""
+        raw_keys = [str(v).strip().encode() for v in vehicle_ids]
+        if len(self.vehicle_ids) == 0:
+            return np.full(len(raw_keys), -1, dtype=np.int64)
+        # Ids longer than the stored width would be truncated into false matches
+        fits = np.array([len(k) <= self.vehicle_ids.dtype.itemsize for k in raw_keys], dtype=bool)
+        keys = np.asarray(raw_keys, dtype=self.vehicle_ids.dtype)
+        positions = np.searchsorted(self.vehicle_ids, keys)
+        positions = np.minimum(positions, len(self.vehicle_ids) - 1)
+        found = fits & (self.vehicle_ids[positions] == keys)
+        return np.where(found, positions, -1)
+
+    def timeline(self, position):
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        dates = np.asarray(self.dates[start:end]).astype('datetime64[D]')
+        prices = np.asarray(self.prices[start:end])
+        mileage = np.asarray(self.mileage[start:end])
+        return {
+            'vehicle_id': self.vehicle_ids[position].decode(),
+            'records': end - start,
+            'first_seen': str(dates[0]),
+            'last_seen': str(dates[-1]),
+            'initial_price': _value(prices[0]),
+            'final_price': _value(prices[-1]),
+            'history': [
+                {'date': str(d), 'price': _value(p), 'mileage': _value(m)}
+                for d, p, m in zip(dates, prices, mileage)
+            ]
+        }
+
+    def history(self, vehicle_id):
+        """Timeline for one vehicle, or None if it is not in the store"""
+        position = self.positions([vehicle_id])[0]
+        return self.timeline(position) if position >= 0 else None
+
+    def histories(self, vehicle_ids):
+        """Timelines for many vehicles in one pass: {vehicle_id: timeline or None}"""
+        positions = self.positions(vehicle_ids)
+        return {str(v): (self.timeline(p) if p >= 0 else None) for v, p in zip(vehicle_ids, positions)}
@@ -0,0 +1,168 @@
+"""
+Price estimation model.
+
+Trains an XGBoost regressor on the public processed dataset and saves it as
+a versioned artifact under data/models/. ``manifest.json`` in that directory
+points at the current version, so the API picks up a newly trained model
+without a restart.
+
+Usage:
+    python -m src.analytics.price_model
+"""
+
+import json
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PUBLIC_PARQUET = Path("data/processed/car_auction_public.parquet")
+MODEL_DIR = Path("data/models")
+
+NUMERIC_FEATURES = ['Year', 'Age', 'Mileage_Miles', 'Damage_Score', 'Keys', 'Seats']
+FLAG_FEATURES = [
+    'Is_Registered', 'Has_Airbag_Deployed', 'Has_Water_Damage',
+    'Has_Fire_Damage', 'Is_Stolen_Recovered', 'Is_Vandalized'
+]
+SEVERITY_CODES = {'None': 0, 'Light': 1, 'Medium': 2, 'Heavy': 3}
+FEATURES = NUMERIC_FEATURES + FLAG_FEATURES + ['Impact_Severity', 'Manufacturer', 'Model']
+
+def category_codes(values, min_count=5):
+    """Frequency-ranked integer codes for categories seen at least ``min_count`` times"""
+    counts = values.str.strip().str.lower().value_counts()
+    counts = counts[counts >= min_count]
+    return {name: code for code, name in enumerate(counts.index)}
+
+def encode(df, manufacturer_codes, model_codes):
+    """Turn listings (cleaned column names) into the model's feature matrix"""
+    X = np.full((len(df), len(FEATURES)), np.nan)
+    column = {name: i for i, name in enumerate(FEATURES)}
+
+    for col in NUMERIC_FEATURES:
+        if col in df:
+            X[:, column[col]] = pd.to_numeric(df[col], errors='coerce')
+    if 'Age' not in df and 'Year' in df:
+        X[:, column['Age']] = np.clip(datetime.now().year - X[:, column['Year']], 0, None)
+    for col in FLAG_FEATURES:
+        if col in df:
+            X[:, column[col]] = pd.to_numeric(df[col].astype(object).map({True: 1, False: 0}), errors='coerce')
+    if 'Impact_Severity' in df:
+        X[:, column['Impact_Severity']] = df['Impact_Severity'].map(SEVERITY_CODES)
+
+    if 'Manufacturer' in df:
+        manufacturer = df['Manufacturer'].astype(str).str.strip().str.lower()
+        X[:, column['Manufacturer']] = manufacturer.map(manufacturer_codes)
+        if 'Model' in df:
+            model = manufacturer + '|' + df['Model'].astype(str).str.strip().str.lower()
+            X[:, column['Model']] = model.map(model_codes)
+    return X
+
+def train(parquet_path=PUBLIC_PARQUET, model_dir=MODEL_DIR):
+    """Fit the price model and save it as a new version"""
+    import joblib
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+    from xgboost import XGBRegressor
+
+    print("Loading training data...")
+    df = pd.read_parquet(parquet_path)
+    # One row per vehicle (its latest state) so long listings don't dominate
+    if 'Is_Latest' in df:
+        df = df[df['Is_Latest'].astype(bool)]
+    df = df.dropna(subset=['Price_USD'])
+    print(f"✓ {len(df)} vehicles")
+
+    manufacturer_codes = category_codes(df['Manufacturer'].astype(str))
+    model_codes = category_codes(df['Manufacturer'].astype(str).str.strip() + '|' + df['Model'].astype(str).str.strip())
+    X = encode(df, manufacturer_codes, model_codes)
+    y = np.log1p(df['Price_USD'].clip(lower=0).to_numpy())
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    print("Training XGBoost model...")
+    model = XGBRegressor(n_estimators=400, max_depth=8, learning_rate=0.05,
+                         subsample=0.8, colsample_bytree=0.8, tree_method='hist', n_jobs=-1)
+    model.fit(X_train, y_train)
+
+    predicted = np.expm1(model.predict(X_test))
+    actual = np.expm1(y_test)
+    metrics = {
+        'mae': round(float(mean_absolute_error(actual, predicted)), 2),
+        'r2_log': round(float(r2_score(y_test, np.log1p(predicted))), 4),
+        'train_rows': len(X_train),
+        'test_rows': len(X_test)
+    }
+    print(f"✓ Test MAE: ${metrics['mae']:.2f}, R² (log price): {metrics['r2_log']}")
+
+    version = datetime.now().strftime('%Y%m%d%H%M%S')
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    artifact = model_dir / f"price_model_{version}.joblib"
+    joblib.dump({
+        'model': model,
+        'manufacturer_codes': manufacturer_codes,
+        'model_codes': model_codes,
+        'features': FEATURES
+    }, artifact)
+
+    manifest = {
+        'version': version,
+        'artifact': artifact.name,
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        'source': str(parquet_path),
+        'metrics': metrics
+    }
+    temp_manifest = model_dir / 'manifest.json.tmp'
+    with open(temp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    temp_manifest.replace(model_dir / 'manifest.json')
+
+    print(f"✓ Saved model version {version} to {artifact}")
+    return manifest
+
+class PriceModel:
+    """Loaded model for batch scoring, with a rolling window of scoring latencies"""
+
+    def __init__(self, model_dir=MODEL_DIR):
+        import joblib
+
+        model_dir = Path(model_dir)
+        with open(model_dir / 'manifest.json') as f:
+            self.manifest = json.load(f)
+        artifact = joblib.load(model_dir / self.manifest['artifact'])
+        self.model = artifact['model']
+        # Gunicorn already runs one process per core; keep scoring single-threaded
+        self.model.set_params(n_jobs=1)
+        self.booster = self.model.get_booster()
+        self.manufacturer_codes = artifact['manufacturer_codes']
+        self.model_codes = artifact['model_codes']
+        self.latencies_ms = deque(maxlen=1000)
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    def estimate(self, vehicles):
+        """Estimate prices for a list of vehicle dicts in one vectorized call"""
+        start = time.perf_counter()
+        X = encode(pd.DataFrame(vehicles), self.manufacturer_codes, self.model_codes)
+        estimates = np.expm1(self.booster.inplace_predict(X)).clip(min=0)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.latencies_ms.append(elapsed_ms)
+        return [round(float(v), 2) for v in estimates], elapsed_ms
+
+    def latency_summary(self):
+        if not self.latencies_ms:
+            return {'p50_ms': 0.0, 'p99_ms': 0.0, 'samples': 0}
+        values = np.fromiter(self.latencies_ms, dtype=float)
+        return {
+            'p50_ms': round(float(np.percentile(values, 50)), 3),
+            'p99_ms': round(float(np.percentile(values, 99)), 3),
+            'samples': len(values)
+        }
+
+if __name__ == '__main__':
+    train()
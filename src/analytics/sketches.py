@@ -0,0 +1,329 @@
+"""
+Mergeable sketches for price quantiles and distinct-vehicle counts.
+
+Price quantiles: prices are summarized per (manufacturer, scrape day) as
+log-spaced bucket counts (the DDSketch scheme). A price x >= 1 falls in
+bucket ``ceil(log(x) / log(gamma)) + 1`` with
+``gamma = (1 + alpha) / (1 - alpha)``, and prices below $1 share bucket 0.
+Merging sketches is adding their bucket counts, so the quantiles of any date
+range and manufacturer set are read from the summed counts without touching
+the listings.
+
+Error bound: for any merge, the estimated q-quantile is within a relative
+``alpha`` (1%) of the exact value at rank ``floor(q * (n - 1))``, or within
+$1 when that value is below $1 (auctions starting at $0 are common).
+
+Sketches are stored per manufacturer spelling as scraped. A query names
+manufacturers in any spelling: every stored spelling with the same key
+(``manufacturer_key`` of suggest.py, as in trends.py) is merged in.
+
+Arrays, sorted by manufacturer then day:
+
+    manufacturers  sorted unique manufacturer names (bytes)
+    offsets        len(manufacturers) + 1 row offsets into the arrays below
+    days           scrape date as days since 1970-01-01 (int32)
+    buckets        bucket index (int16)
+    counts         listings in the bucket (int32)
+
+Distinct vehicles: HyperLogLog sketches with 2**14 registers over a 64-bit
+hash of Vehicle_ID (standard error about 0.8%). The union of sketches is
+the register-wise maximum, so distinct counts over any window cost one pass
+over at most one sketch per day. Per-day sketches are stored dense; the
+per (manufacturer, day) sketches are stored sparse, as the non-zero
+registers only:
+
+    days                 days with data (int32)
+    registers            len(days) x 2**14 register values (uint8)
+    manufacturers        sorted unique manufacturer names (bytes)
+    offsets              row offsets into the arrays below
+    manufacturer_days    scrape day (int32)
+    register_index       register number (uint16)
+    register_value       register value (uint8)
+
+Usage (compare sketch estimates with exact values from data/processed):
+    python -m src.analytics.sketches
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.storage import load_arrays, save_arrays
+from src.analytics.suggest import manufacturer_key, manufacturer_positions
+
+SKETCH_DIR = Path("data/processed/price_sketches")
+ARRAYS = ['manufacturers', 'offsets', 'days', 'buckets', 'counts']
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+
+VEHICLE_SKETCH_DIR = Path("data/processed/vehicle_sketches")
+VEHICLE_ARRAYS = ['days', 'registers', 'manufacturers', 'offsets',
+                  'manufacturer_days', 'register_index', 'register_value']
+HLL_PRECISION = 14
+HLL_REGISTERS = 1 << HLL_PRECISION
+
+def price_buckets(prices):
+    """Sketch bucket of each price"""
+    prices = np.asarray(prices, dtype=np.float64)
+    buckets = np.zeros(len(prices), dtype=np.int16)
+    positive = prices >= 1
+    buckets[positive] = np.ceil(np.log(prices[positive]) / np.log(GAMMA)) + 1
+    return buckets
+
+def bucket_values(buckets):
+    """Representative price of each bucket (0 for the below-$1 bucket)"""
+    buckets = np.asarray(buckets, dtype=np.float64)
+    return np.where(buckets > 0, 2 * GAMMA ** (buckets - 1) / (GAMMA + 1), 0.0)
+
+def sketch_quantiles(counts, quantiles):
+    """Quantile estimates from merged bucket counts (indexed by bucket)"""
+    cumulative = np.cumsum(counts)
+    n = cumulative[-1] if len(cumulative) else 0
+    if n == 0:
+        return [None] * len(quantiles)
+    ranks = np.floor(np.asarray(quantiles, dtype=np.float64) * (n - 1))
+    return [round(float(v), 2) for v in bucket_values(np.searchsorted(cumulative, ranks, side='right'))]
+
+def build_price_sketches(df, output_dir=SKETCH_DIR):
+    """Build per-manufacturer, per-day price sketches from the cleaned listings"""
+    print("\nBuilding price quantile sketches...")
+
+    sketches = pd.DataFrame({
+        'manufacturer': df['Manufacturer'].astype(str).str.strip(),
+        'day': df['scrape_date'].to_numpy().astype('datetime64[D]').astype(np.int32),
+        'bucket': price_buckets(df['Price_USD'])
+    }).groupby(['manufacturer', 'day', 'bucket']).size().reset_index(name='count')
+
+    manufacturers, starts = np.unique(sketches['manufacturer'].to_numpy(dtype=str), return_index=True)
+    arrays = {
+        'manufacturers': manufacturers.astype('S'),
+        'offsets': np.append(starts, len(sketches)).astype(np.int64),
+        'days': sketches['day'].to_numpy(dtype=np.int32),
+        'buckets': sketches['bucket'].to_numpy(dtype=np.int16),
+        'counts': sketches['count'].to_numpy(dtype=np.int32)
+    }
+    save_arrays(output_dir, arrays, {
+        'relative_accuracy': RELATIVE_ACCURACY,
+        'manufacturers': len(manufacturers),
+        'rows': len(sketches),
+        'listings': int(sketches['count'].sum()),
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    })
+
+    print(f"✓ Price sketches: {len(manufacturers)} manufacturers, {len(sketches)} bucket rows")
+
+def _day(date):
+    return int(np.datetime64(str(date), 'D').astype(np.int64))
+
+class ManufacturerSketches:
+    """Base of the sketch stores: ``positions`` groups the stored manufacturer
+    spellings by ``manufacturer_key``"""
+
+    def find(self, manufacturers):
+        """Positions of every stored spelling of ``manufacturers``, each once"""
+        return sorted({i for name in manufacturers for i in self.positions.get(manufacturer_key(name), [])})
+
+class PriceSketches(ManufacturerSketches):
+    """Read side of the price sketch store"""
+
+    def __init__(self, directory=SKETCH_DIR):
+        arrays, self.manifest = load_arrays(directory, ARRAYS)
+        self.manufacturers = [m.decode() for m in arrays['manufacturers']]
+        self.positions = manufacturer_positions(self.manufacturers)
+        self.offsets = arrays['offsets']
+        self.days = arrays['days']
+        self.buckets = arrays['buckets']
+        self.counts = arrays['counts']
+        self.num_buckets = int(self.buckets.max()) + 1 if len(self.buckets) else 1
+
+    def merged_counts(self, start=None, end=None, manufacturers=None):
+        """Bucket counts merged over an inclusive date range and a manufacturer
+        set (all manufacturers when None); unknown manufacturers are ignored"""
+        positions = range(len(self.manufacturers)) if manufacturers is None else self.find(manufacturers)
+        first = _day(start) if start else np.iinfo(np.int32).min
+        last = _day(end) if end else np.iinfo(np.int32).max
+
+        counts = np.zeros(self.num_buckets, dtype=np.int64)
+        for i in positions:
+            lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+            days = self.days[lo:hi]
+            a = lo + np.searchsorted(days, first, side='left')
+            b = lo + np.searchsorted(days, last, side='right')
+            counts += np.bincount(self.buckets[a:b], weights=self.counts[a:b],
+                                  minlength=self.num_buckets).astype(np.int64)
+        return counts
+
+    def quantiles(self, quantiles, start=None, end=None, manufacturers=None):
+        """(listing count, [estimate per quantile]) for the selection"""
+        counts = self.merged_counts(start, end, manufacturers)
+        return int(counts.sum()), sketch_quantiles(counts, quantiles)
+
+def hll_registers(vehicle_ids):
+    """(register number, register value) of each vehicle id"""
+    hashes = pd.util.hash_pandas_object(pd.Series(vehicle_ids, dtype=str), index=False).to_numpy()
+    index = (hashes >> np.uint64(64 - HLL_PRECISION)).astype(np.uint16)
+    remainder = hashes & np.uint64((1 << (64 - HLL_PRECISION)) - 1)
+    # Leading zeros of the remaining 50 bits, plus one (frexp gives the bit length exactly)
+    bit_length = np.frexp(remainder.astype(np.float64))[1]
+    value = (64 - HLL_PRECISION - bit_length + 1).astype(np.uint8)
+    return index, value
+
+def hll_estimate(registers):
+    """Distinct count from a (merged) array of registers"""
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        # Small-range correction (linear counting)
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+def build_vehicle_sketches(df, output_dir=VEHICLE_SKETCH_DIR):
+    """Build per-day and per (manufacturer, day) HyperLogLog sketches of Vehicle_ID"""
+    print("\nBuilding distinct-vehicle sketches...")
+
+    index, value = hll_registers(df['Vehicle_ID'].astype(str).to_numpy())
+    rows = pd.DataFrame({
+        'manufacturer': df['Manufacturer'].astype(str).str.strip().to_numpy(),
+        'day': df['scrape_date'].to_numpy().astype('datetime64[D]').astype(np.int32),
+        'index': index,
+        'value': value
+    })
+
+    daily = rows.groupby(['day', 'index'])['value'].max().reset_index()
+    days, day_rows = np.unique(daily['day'].to_numpy(), return_inverse=True)
+    registers = np.zeros((len(days), HLL_REGISTERS), dtype=np.uint8)
+    registers[day_rows, daily['index'].to_numpy()] = daily['value'].to_numpy()
+
+    sparse = rows.groupby(['manufacturer', 'day', 'index'])['value'].max().reset_index()
+    manufacturers, starts = np.unique(sparse['manufacturer'].to_numpy(dtype=str), return_index=True)
+
+    save_arrays(output_dir, {
+        'days': days.astype(np.int32),
+        'registers': registers,
+        'manufacturers': manufacturers.astype('S'),
+        'offsets': np.append(starts, len(sparse)).astype(np.int64),
+        'manufacturer_days': sparse['day'].to_numpy(dtype=np.int32),
+        'register_index': sparse['index'].to_numpy(dtype=np.uint16),
+        'register_value': sparse['value'].to_numpy(dtype=np.uint8)
+    }, {
+        'precision': HLL_PRECISION,
+        'standard_error': round(1.04 / np.sqrt(HLL_REGISTERS), 4),
+        'days': len(days),
+        'manufacturers': len(manufacturers),
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    })
+
+    print(f"✓ Vehicle sketches: {len(days)} days, {len(manufacturers)} manufacturers")
+
+class VehicleSketches(ManufacturerSketches):
+    """Read side of the distinct-vehicle sketch store"""
+
+    def __init__(self, directory=VEHICLE_SKETCH_DIR):
+        arrays, self.manifest = load_arrays(directory, VEHICLE_ARRAYS)
+        self.days = arrays['days']
+        self.registers = arrays['registers']
+        self.manufacturers = [m.decode() for m in arrays['manufacturers']]
+        self.positions = manufacturer_positions(self.manufacturers)
+        self.offsets = arrays['offsets']
+        self.manufacturer_days = arrays['manufacturer_days']
+        self.register_index = arrays['register_index']
+        self.register_value = arrays['register_value']
+
+    def merged_registers(self, start=None, end=None, manufacturers=None):
+        """Union of the sketches over an inclusive date range and a manufacturer
+        set (all manufacturers when None); unknown manufacturers are ignored"""
+        first = _day(start) if start else np.iinfo(np.int32).min
+        last = _day(end) if end else np.iinfo(np.int32).max
+
+        if manufacturers is None:
+            a, b = np.searchsorted(self.days, first, side='left'), np.searchsorted(self.days, last, side='right')
+            if a == b:
+                return np.zeros(HLL_REGISTERS, dtype=np.uint8)
+            return np.max(self.registers[a:b], axis=0)
+
+        merged = np.zeros(HLL_REGISTERS, dtype=np.uint8)
+        for i in self.find(manufacturers):
+            lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+            days = self.manufacturer_days[lo:hi]
+            a = lo + np.searchsorted(days, first, side='left')
+            b = lo + np.searchsorted(days, last, side='right')
+            np.maximum.at(merged, self.register_index[a:b], self.register_value[a:b])
+        return merged
+
+    def unique_vehicles(self, start=None, end=None, manufacturers=None):
+        return hll_estimate(self.merged_registers(start, end, manufacturers))
+
+def verify_quantiles(parquet_path="data/processed/car_auction_public.parquet", quantiles=(0.1, 0.25, 0.5, 0.75, 0.9, 0.99)):
+    """Check sketch quantiles against exact ones over a few date ranges and manufacturers"""
+    import tempfile
+
+    df = pd.read_parquet(parquet_path, columns=['scrape_date', 'Manufacturer', 'Price_USD'])
+    df = df.dropna(subset=['Price_USD', 'Manufacturer'])
+    df['scrape_date'] = pd.to_datetime(df['scrape_date'])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_price_sketches(df, Path(tmp) / 'sketches')
+        sketches = PriceSketches(Path(tmp) / 'sketches')
+
+        last_day = df['scrape_date'].max()
+        top = df['Manufacturer'].value_counts().index[:3].tolist()
+        cases = [
+            (None, None, None),
+            (last_day - pd.Timedelta(days=29), last_day, None),
+            (last_day - pd.Timedelta(days=364), last_day, top[:1]),
+            (None, None, top)
+        ]
+        failures = 0
+        for start, end, manufacturers in cases:
+            mask = pd.Series(True, index=df.index)
+            if start is not None:
+                mask &= df['scrape_date'].between(start, end)
+            if manufacturers is not None:
+                keys = {manufacturer_key(m) for m in manufacturers}
+                mask &= df['Manufacturer'].map(manufacturer_key).isin(keys)
+            prices = df.loc[mask, 'Price_USD'].to_numpy()
+
+            start_day = start.date() if start is not None else None
+            end_day = end.date() if end is not None else None
+            n, estimates = sketches.quantiles(quantiles, start_day, end_day, manufacturers)
+            exact = np.quantile(prices, quantiles, method='lower')
+            print(f"\n{start_day or 'all'} .. {end_day or 'all'}, {manufacturers or 'all manufacturers'}: {n} listings")
+            for q, e, x in zip(quantiles, estimates, exact):
+                ok = abs(e - x) <= RELATIVE_ACCURACY * x + 0.005 or (x < 1 and e == 0)
+                failures += not ok
+                print(f"  p{q * 100:g}: sketch {e:10.2f}  exact {x:10.2f}  {'✓' if ok else '✗'}")
+
+    print(f"\n{'✓' if failures == 0 else '❌'} {failures} estimates outside the error bound")
+    return failures == 0
+
+def verify_unique_vehicles(sketch_dir=VEHICLE_SKETCH_DIR, history_dir="data/processed/price_history"):
+    """Check distinct-vehicle estimates against exact counts from the price history store"""
+    from src.analytics.price_history import PriceHistoryIndex
+
+    sketches = VehicleSketches(sketch_dir)
+    history = PriceHistoryIndex(history_dir)
+    vehicle = np.repeat(np.arange(len(history)), np.diff(history.offsets))
+    dates = np.asarray(history.dates)
+    last_day = int(dates.max())
+    standard_error = sketches.manifest['standard_error']
+
+    print(f"\nDistinct vehicles (standard error {standard_error:.2%}):")
+    worst = 0.0
+    for window in (1, 7, 30, 365, None):
+        first = last_day - window + 1 if window else int(dates.min())
+        exact = len(np.unique(vehicle[(dates >= first) & (dates <= last_day)]))
+        start, end = np.datetime64(first, 'D'), np.datetime64(last_day, 'D')
+        estimate = sketches.unique_vehicles(start, end)
+        error = abs(estimate - exact) / max(exact, 1)
+        worst = max(worst, error)
+        print(f"  {start} .. {end}: sketch {estimate:8d}  exact {exact:8d}  error {error:.2%}")
+
+    print(f"{'✓' if worst <= 3 * standard_error else '❌'} Worst error {worst:.2%} (bound 3 x standard error)")
+    return worst <= 3 * standard_error
+
+if __name__ == '__main__':
+    verify_quantiles()
+    verify_unique_vehicles()
@@ -0,0 +1,249 @@
+"""
+Snapshot store of the raw daily files.
+
+Consecutive daily files are mostly the same rows, so the store keeps each
+distinct row -- a listing state -- once and records where it occurs:
+
+    states.parquet  distinct rows (raw strings, one column per raw column)
+                    with the first_seen and last_seen dates of the state
+    day_offsets     len(days) + 1 offsets into day_states
+    day_states      the state of every row of every day, in file order
+    intervals       SCD2 validity intervals: (state, first day, last day)
+                    runs of consecutive files on record listing the state,
+                    as positions into ``days``
+
+``manifest.json`` lists the days (date, file, sha256, header). Day ``i`` is
+``states`` taken at ``day_states[day_offsets[i]:day_offsets[i + 1]]`` with
+the day's header columns, which reproduces the file's rows, values and row
+order exactly; ``verify`` checks this for every day against data/raw.
+
+``update_snapshots`` reads only the files not in the store yet (from the
+scraper's Parquet copy of a day when there is one); if a stored
+day's file changed or an earlier day was backfilled, it rebuilds the store.
+clean_data.py loads the full history from here instead of parsing every
+daily file.
+
+Usage:
+    python -m src.analytics.snapshots                 # update the store, report sizes
+    python -m src.analytics.snapshots verify          # rebuild every day, compare with data/raw
+    python -m src.analytics.snapshots 2025-03-03      # print one day as CSV
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.catalog import RawCatalog
+from src.analytics.storage import load_arrays, load_table, save_arrays
+
+SNAPSHOT_DIR = Path("data/processed/snapshots")
+ARRAYS = ['day_offsets', 'day_states', 'intervals']
+# Strings pandas.read_csv reads as missing by default
+NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+def read_raw(path):
+    """A raw daily file exactly as written: every value a string, nothing parsed as missing.
+    The scraper's Parquet copy of the day (SCRAPER_WRITE_PARQUET) is read
+    instead of the CSV when it is at least as new, which skips CSV parsing"""
+    path = Path(path)
+    parquet_path = path.with_suffix('.parquet')
+    try:
+        if parquet_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            # Strings as written, None where the scraper had no value (an empty CSV field)
+            return pd.read_parquet(parquet_path).fillna('')
+    except OSError:
+        pass
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def row_keys(frame, columns):
+    """One string per row identifying its state over ``columns``"""
+    if not columns:
+        return pd.Series('', index=frame.index)
+    first, *rest = columns
+    return frame[first].str.cat([frame[c] for c in rest], sep='\x1f') if rest else frame[first]
+
+def validity_intervals(day_offsets, day_states):
+    """(state, first day, last day) rows for every run of consecutive days listing a state"""
+    days = len(day_offsets) - 1
+    if len(day_states) == 0:
+        return np.zeros((0, 3), dtype=np.int32)
+    day_of_row = np.repeat(np.arange(days, dtype=np.int64), np.diff(day_offsets))
+    pairs = np.unique(day_states.astype(np.int64) * days + day_of_row)
+    state, day = pairs // days, pairs % days
+    starts = np.flatnonzero(np.r_[True, (state[1:] != state[:-1]) | (day[1:] != day[:-1] + 1)])
+    ends = np.r_[starts[1:], len(pairs)] - 1
+    return np.column_stack([state[starts], day[starts], day[ends]]).astype(np.int32)
+
+def update_snapshots(catalog=None, store_dir=SNAPSHOT_DIR):
+    """Add the raw files not yet in the snapshot store"""
+    print("\nUpdating snapshot store...")
+    catalog = catalog or RawCatalog().refresh()
+    store_dir = Path(store_dir)
+
+    try:
+        stored, manifest = load_arrays(store_dir, ARRAYS, mmap=False)
+        states = load_table(store_dir, 'states').drop(columns=['first_seen', 'last_seen'])
+    except (OSError, ValueError):
+        stored, manifest, states = None, {'days': []}, None
+
+    entries = catalog.entries
+    days = list(manifest['days'])
+    # Incremental only if the stored days are an unchanged prefix of the catalog
+    if stored is None or len(days) > len(entries) or \
+            any((d['date'], d['sha256']) != (e['date'], e['sha256']) for d, e in zip(days, entries)):
+        stored, days, states = None, [], pd.DataFrame()
+
+    pending = entries[len(days):]
+    if not pending:
+        print("✓ Snapshot store already up to date")
+        return
+
+    columns = list(states.columns)
+    state_ids = dict(zip(row_keys(states, columns), range(len(states))))
+    new_states = []
+    day_states = [stored['day_states']] if stored is not None else []
+    counts = list(np.diff(stored['day_offsets'])) if stored is not None else []
+    for entry in pending:
+        frame = read_raw(catalog.path(entry))
+        header = list(frame.columns)
+        added_columns = [c for c in header if c not in columns]
+        if added_columns:
+            # A new raw column: earlier states have it empty, and their keys change
+            columns += added_columns
+            states = pd.concat([states] + new_states, ignore_index=True).reindex(columns=columns, fill_value='')
+            new_states = []
+            state_ids = dict(zip(row_keys(states, columns), range(len(states))))
+        frame = frame.reindex(columns=columns, fill_value='')
+
+        ids = np.empty(len(frame), dtype=np.int32)
+        fresh = []
+        for i, key in enumerate(row_keys(frame, columns).tolist()):
+            state = state_ids.get(key)
+            if state is None:
+                state = state_ids[key] = len(state_ids)
+                fresh.append(i)
+            ids[i] = state
+        if fresh:
+            new_states.append(frame.iloc[fresh])
+        day_states.append(ids)
+        counts.append(len(frame))
+        days.append({'date': entry['date'], 'file': entry['file'], 'sha256': entry['sha256'], 'header': header})
+
+    states = pd.concat([states] + new_states, ignore_index=True)
+    day_states = np.concatenate(day_states).astype(np.int32)
+    day_offsets = np.append(0, np.cumsum(counts)).astype(np.int64)
+    intervals = validity_intervals(day_offsets, day_states)
+
+    dates = np.array([d['date'] for d in days], dtype=object)
+    first_day = np.full(len(states), len(days), dtype=np.int64)
+    last_day = np.full(len(states), -1, dtype=np.int64)
+    np.minimum.at(first_day, intervals[:, 0], intervals[:, 1])
+    np.maximum.at(last_day, intervals[:, 0], intervals[:, 2])
+    states['first_seen'] = dates[first_day]
+    states['last_seen'] = dates[last_day]
+
+    save_arrays(store_dir, {
+        'day_offsets': day_offsets,
+        'day_states': day_states,
+        'intervals': intervals
+    }, {
+        'columns': columns,
+        'days': days,
+        'rows': int(len(day_states)),
+        'states': int(len(states)),
+        'intervals': int(len(intervals)),
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    }, tables={'states': states})
+
+    print(f"✓ Snapshot store: added {len(pending)} days; {len(day_states)} rows "
+          f"stored as {len(states)} distinct states in {len(intervals)} intervals")
+
+class SnapshotStore:
+    """Read side of the snapshot store"""
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        arrays, self.manifest = load_arrays(directory, ARRAYS)
+        self.directory = Path(directory)
+        self.day_offsets = arrays['day_offsets']
+        self.day_states = arrays['day_states']
+        self.intervals = arrays['intervals']
+        self.days = self.manifest['days']
+        self.positions = {d['date']: i for i, d in enumerate(self.days)}
+        self.states = load_table(directory, 'states')
+
+    def __len__(self):
+        return len(self.days)
+
+    def day(self, date):
+        """The raw file of ``date`` as read by ``read_raw``, or None if not stored"""
+        i = self.positions.get(date)
+        if i is None:
+            return None
+        rows = self.day_states[self.day_offsets[i]:self.day_offsets[i + 1]]
+        return self.states.take(rows)[self.days[i]['header']].reset_index(drop=True)
+
+    def as_of(self, date):
+        """Distinct listing states valid on ``date`` (from the validity intervals), or None"""
+        i = self.positions.get(date)
+        if i is None:
+            return None
+        valid = self.intervals[(self.intervals[:, 1] <= i) & (self.intervals[:, 2] >= i), 0]
+        return self.states.take(np.sort(valid)).reset_index(drop=True)
+
+    def listings(self, raw_dir=None):
+        """Every row of every day with scrape_date and source_file columns, missing
+        values as None -- what load_all_data in clean_data.py used to read file by file"""
+        raw_dir = Path(raw_dir or 'data/raw')
+        columns = self.manifest['columns']
+        df = self.states.take(self.day_states)[columns].reset_index(drop=True)
+        df = df.astype(object).where(~df.isin(NA_VALUES), None)
+        counts = np.diff(self.day_offsets)
+        df['scrape_date'] = np.repeat(pd.to_datetime([d['date'] for d in self.days]), counts)
+        df['source_file'] = np.repeat([str(raw_dir / d['file']) for d in self.days], counts)
+        return df
+
+    def size_bytes(self):
+        return sum(f.stat().st_size for f in self.directory.iterdir())
+
+def verify(catalog=None, store_dir=SNAPSHOT_DIR):
+    """Rebuild every stored day and compare it with its raw file; returns the mismatching dates"""
+    catalog = catalog or RawCatalog().refresh()
+    store = SnapshotStore(store_dir)
+    mismatches = []
+    for i, d in enumerate(store.days):
+        raw = read_raw(catalog.raw_dir / d['file'])
+        if not store.day(d['date']).equals(raw):
+            mismatches.append(d['date'])
+            continue
+        # Each day's rows are exactly the states whose validity intervals cover it
+        listed = np.unique(store.day_states[store.day_offsets[i]:store.day_offsets[i + 1]])
+        valid = store.intervals[(store.intervals[:, 1] <= i) & (store.intervals[:, 2] >= i), 0]
+        if not np.array_equal(listed, np.sort(valid)):
+            mismatches.append(d['date'])
+    print(f"Verified {len(store.days)} days: {len(mismatches)} mismatches")
+    for date in mismatches:
+        print(f"  {date}")
+    return mismatches
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'verify':
+        sys.exit(1 if verify() else 0)
+    elif len(sys.argv) > 1:
+        day = SnapshotStore().day(sys.argv[1])
+        if day is None:
+            sys.exit(f"No snapshot for {sys.argv[1]}")
+        day.to_csv(sys.stdout, index=False)
+    else:
+        catalog = RawCatalog().refresh()
+        update_snapshots(catalog)
+        store = SnapshotStore()
+        raw_bytes = sum(e['bytes'] for e in catalog.entries)
+        print(f"Raw files: {len(catalog.entries)} files, {raw_bytes / 1e6:.1f} MB")
+        print(f"Snapshot store: {store.manifest['states']} states, {store.manifest['intervals']} intervals, "
+              f"{store.size_bytes() / 1e6:.1f} MB")
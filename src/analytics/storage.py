@@ -0,0 +1,85 @@
+"""
+On-disk layout for array stores.
+
+A store is a directory of ``.npy`` files (and optionally parquet tables for
+string columns) plus a ``manifest.json`` describing it. Stores are written
+to a sibling temp directory and swapped into place, and ``manifest.json`` is
+written last, so its mtime doubles as the store's version for readers that
+cache a loaded store.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+def save_arrays(directory, arrays, manifest, tables=None):
+    """Write ``arrays`` ({name: ndarray}), ``tables`` ({name: DataFrame}) and
+    ``manifest`` as a store at ``directory``"""
+    temp_dir = staging_directory(directory)
+
+    for name, values in arrays.items():
+        np.save(temp_dir / f"{name}.npy", values)
+    for name, frame in (tables or {}).items():
+        frame.to_parquet(temp_dir / f"{name}.parquet", index=False)
+    with open(temp_dir / 'manifest.json', 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+
+    swap_directory(temp_dir, directory)
+
+def staging_directory(directory, copy=False):
+    """An empty sibling temp directory to build a new version of ``directory``
+    in, or with ``copy`` one holding the current files (hard links, so files
+    must be replaced rather than modified in place)"""
+    directory = Path(directory)
+    temp_dir = directory.with_name(directory.name + '.tmp')
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    if copy and directory.exists():
+        shutil.copytree(directory, temp_dir, copy_function=os.link)
+    else:
+        temp_dir.mkdir(parents=True)
+    return temp_dir
+
+def swap_directory(temp_dir, directory):
+    """Put a directory built by staging_directory in place of ``directory``"""
+    directory = Path(directory)
+    old_dir = directory.with_name(directory.name + '.old')
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, old_dir)
+    os.replace(temp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+def load_arrays(directory, names, mmap=True):
+    """Load the named arrays and the manifest of a store; arrays are memory-mapped by default"""
+    directory = Path(directory)
+    with open(directory / 'manifest.json') as f:
+        manifest = json.load(f)
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode='r' if mmap else None)
+              for name in names}
+    return arrays, manifest
+
+def load_table(directory, name):
+    """Load a parquet table of a store"""
+    return pd.read_parquet(Path(directory) / f"{name}.parquet")
+
+def store_version(directory):
+    """Version stamp of a store (manifest mtime), or None if it has not been built"""
+    try:
+        return os.stat(Path(directory) / 'manifest.json').st_mtime_ns
+    except OSError:
+        return None
+
+def day_digests(df, columns):
+    """{YYYY-MM-DD: sha256 of the day's rows of ``columns``} of the cleaned
+    frame, for stores that apply days incrementally: a day whose digest
+    changed (its raw file was rewritten, or cleaning now derives other
+    values) has to be applied again"""
+    days = df['scrape_date'].dt.strftime('%Y-%m-%d')
+    hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return {day: hashlib.sha256(hashes[rows].tobytes()).hexdigest()
+            for day, rows in days.groupby(days).indices.items()}
@@ -0,0 +1,177 @@
+"""
+Manufacturer and model autocomplete.
+
+The raw manufacturer and model strings come in many spellings
+("Harley-Davidson" / "HARLEY DAVIDSON", "SEADOO" / "SEA DOO", "I30" /
+"i30"). ``normalize`` reduces a name to lowercase letters and digits, and
+names with the same normal form (or an ``ALIASES`` entry, for abbreviations
+such as "VW") are one vocabulary entry, labelled with its most common
+spelling and weighted by the number of vehicles listed under it.
+
+Every entry is reachable by one or more keys, stored as a sorted array:
+
+    keys         sorted normalized keys (fixed-width bytes): a manufacturer's
+                 name and aliases; a model's name, and manufacturer + model
+                 so "toyota cor" finds the Corolla
+    key_entries  the entry of each key
+    counts       vehicles listed per entry
+    kinds        0 for a manufacturer, 1 for a model
+    makers       the manufacturer entry of each entry
+
+Suggestions for a prefix are the keys in ``searchsorted(keys, prefix)`` up
+to the prefix followed by '{' (the character after 'z'), ranked by count.
+Labels are in the ``entries`` table.
+"""
+
+import html
+import re
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.storage import load_arrays, load_table, save_arrays
+
+SUGGEST_DIR = Path("data/processed/suggest")
+ARRAYS = ['keys', 'key_entries', 'counts', 'kinds', 'makers']
+KINDS = ['manufacturer', 'model']
+# Normalized abbreviations and short forms -> the manufacturer they stand for
+ALIASES = {
+    'vw': 'volkswagen',
+    'alfa': 'alfaromeo',
+    'cat': 'caterpillar',
+    'chevy': 'chevrolet',
+    'massey': 'masseyferguson',
+    'ud': 'udtrucks',
+    'greatwallmotors': 'greatwall'
+}
+
+def normalize(name):
+    """Lowercase letters and digits of a name ('Mercedes-Benz' -> 'mercedesbenz')"""
+    return re.sub(r'[^0-9a-z]+', '', html.unescape(str(name)).casefold())
+
+def manufacturer_key(name):
+    """Key shared by every spelling and alias of a manufacturer ('VW' -> 'volkswagen')"""
+    key = normalize(name)
+    return ALIASES.get(key, key)
+
+def manufacturer_positions(manufacturers):
+    """{manufacturer key: positions of the spellings in ``manufacturers`` with that key}"""
+    positions = {}
+    for i, name in enumerate(manufacturers):
+        positions.setdefault(manufacturer_key(name), []).append(i)
+    return positions
+
+def _labels(frame, key_columns, name_column):
+    """Most common spelling of ``name_column`` per group of ``key_columns``"""
+    spellings = frame.groupby(key_columns + [name_column]).size().reset_index(name='n')
+    spellings = spellings.sort_values('n', ascending=False, kind='stable').drop_duplicates(key_columns)
+    return spellings.set_index(key_columns)[name_column]
+
+def build_suggest(df, output_dir=SUGGEST_DIR):
+    """Build the autocomplete vocabulary from the cleaned listings"""
+    print("\nBuilding manufacturer/model vocabulary...")
+
+    listings = df[['Vehicle_ID', 'Manufacturer', 'Model']].dropna().astype(str)
+    listings['Manufacturer'] = listings['Manufacturer'].map(html.unescape).str.strip()
+    listings['Model'] = listings['Model'].map(html.unescape).str.strip()
+    listings['maker_key'] = listings['Manufacturer'].map(normalize)
+    listings['maker_key'] = listings['maker_key'].map(lambda key: ALIASES.get(key, key))
+    listings['model_key'] = listings['Model'].map(normalize)
+    listings = listings[listings['maker_key'] != '']
+
+    makers = listings.groupby('maker_key')['Vehicle_ID'].nunique().rename('count').to_frame()
+    makers['label'] = _labels(listings, ['maker_key'], 'Manufacturer')
+    models = listings[listings['model_key'] != ''].groupby(['maker_key', 'model_key'])['Vehicle_ID'] \
+        .nunique().rename('count').to_frame()
+    models['label'] = _labels(listings, ['maker_key', 'model_key'], 'Model')
+
+    entries = pd.DataFrame({
+        'kind': ['manufacturer'] * len(makers) + ['model'] * len(models),
+        'manufacturer': list(makers['label']) + [makers.at[m, 'label'] for m, _ in models.index],
+        'model': [None] * len(makers) + list(models['label']),
+        'count': np.concatenate([makers['count'].to_numpy(), models['count'].to_numpy()]).astype(np.int64)
+    })
+    maker_ids = {key: i for i, key in enumerate(makers.index)}
+    makers_of = np.array(list(range(len(makers))) + [maker_ids[m] for m, _ in models.index], dtype=np.int32)
+
+    keys = []
+    aliases_of = {}
+    for alias, key in ALIASES.items():
+        aliases_of.setdefault(key, []).append(alias)
+    for i, key in enumerate(makers.index):
+        keys += [(key, i)] + [(alias, i) for alias in aliases_of.get(key, [])]
+    for j, (maker_key, model_key) in enumerate(models.index, start=len(makers)):
+        keys += [(model_key, j), (maker_key + model_key, j)]
+    keys = sorted(set(keys))
+
+    save_arrays(output_dir, {
+        'keys': np.array([k for k, _ in keys], dtype='S'),
+        'key_entries': np.array([i for _, i in keys], dtype=np.int32),
+        'counts': entries['count'].to_numpy(),
+        'kinds': (entries['kind'] == 'model').to_numpy().astype(np.int8),
+        'makers': makers_of
+    }, {
+        'manufacturers': len(makers),
+        'models': len(models),
+        'keys': len(keys),
+        'aliases': ALIASES,
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    }, tables={'entries': entries})
+
+    print(f"✓ Vocabulary: {len(makers)} manufacturers (from {listings['Manufacturer'].nunique()} spellings), "
+          f"{len(models)} models, {len(keys)} keys")
+
+class SuggestIndex:
+    """Read side of the autocomplete vocabulary"""
+
+    def __init__(self, directory=SUGGEST_DIR):
+        arrays, self.manifest = load_arrays(directory, ARRAYS, mmap=False)
+        self.keys = arrays['keys']
+        self.key_entries = arrays['key_entries']
+        self.counts = arrays['counts']
+        self.kinds = arrays['kinds']
+        self.makers = arrays['makers']
+        entries = load_table(directory, 'entries')
+        self.manufacturers = entries['manufacturer'].tolist()
+        self.models = entries['model'].tolist()
+
+    def suggest(self, prefix, limit=10, kind=None, manufacturer=None):
+        """Entries with a key starting with the normalized ``prefix``, most
+        listed first; optionally of one ``kind`` or within one manufacturer"""
+        prefix = normalize(prefix).encode()
+        if not prefix:
+            return []
+        lo = np.searchsorted(self.keys, prefix, side='left')
+        hi = np.searchsorted(self.keys, prefix + b'{', side='left')
+        candidates = np.unique(self.key_entries[lo:hi])
+
+        if kind is not None:
+            candidates = candidates[self.kinds[candidates] == KINDS.index(kind)]
+        if manufacturer is not None:
+            maker = self.manufacturer_entry(manufacturer)
+            if maker is None:
+                return []
+            candidates = candidates[(self.makers[candidates] == maker) & (self.kinds[candidates] == 1)]
+
+        top = candidates[np.argsort(-self.counts[candidates], kind='stable')[:limit]]
+        return [self._suggestion(int(i)) for i in top]
+
+    def manufacturer_entry(self, name):
+        """Entry of a manufacturer name in any spelling, or None"""
+        key = manufacturer_key(name).encode()
+        i = np.searchsorted(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            entry = self.key_entries[i]
+            if self.kinds[entry] == 0:
+                return int(entry)
+            i += 1
+        return None
+
+    def _suggestion(self, i):
+        if self.kinds[i] == 0:
+            return {'type': 'manufacturer', 'manufacturer': self.manufacturers[i],
+                    'label': self.manufacturers[i], 'listings': int(self.counts[i])}
+        return {'type': 'model', 'manufacturer': self.manufacturers[i], 'model': self.models[i],
+                'label': f"{self.manufacturers[i]} {self.models[i]}", 'listings': int(self.counts[i])}
@@ -0,0 +1,152 @@
+"""
+Per-manufacturer daily price series.
+
+clean_data.py's manufacturer trends table (date × manufacturer mean price,
+count and distinct vehicles) is stored grouped by manufacturer, each
+manufacturer's days one contiguous, date-sorted run:
+
+    offsets      len(manufacturers) + 1 offsets into the arrays below;
+                 manufacturer ``i`` is rows ``offsets[i]:offsets[i + 1]``
+    days         date of each row, as days since 1970-01-01
+    price_sum    sum of the priced listings' prices
+    price_count  priced listings
+    vehicles     distinct vehicles listed that day
+
+Spellings of one manufacturer are merged by ``manufacturer_key`` of
+suggest.py (``normalize`` and ``ALIASES``) and the ``manufacturers`` table
+labels each series with its most common spelling. A date range is two binary searches within the
+manufacturer's run; resampling to weeks or months sums consecutive rows of
+the same period (``np.add.reduceat``) and the moving average is a ratio of
+cumulative sums, so both are weighted by listings and cost O(rows in
+range).
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.storage import load_arrays, load_table, save_arrays
+from src.analytics.suggest import manufacturer_key
+
+TRENDS_DIR = Path("data/processed/manufacturer_trends")
+ARRAYS = ['offsets', 'days', 'price_sum', 'price_count', 'vehicles']
+FREQUENCIES = ['D', 'W', 'M']
+EPOCH = date(1970, 1, 1)
+
+def build_manufacturer_trends(mfg_trends, output_dir=TRENDS_DIR):
+    """Store the manufacturer trends table (from create_aggregated_dataset) as per-manufacturer series"""
+    print("\nBuilding manufacturer trend series...")
+
+    df = pd.DataFrame({
+        'manufacturer': mfg_trends['Manufacturer'].astype(object),
+        'day': (pd.to_datetime(mfg_trends['scrape_date']) - pd.Timestamp(EPOCH)).dt.days.astype(np.int32),
+        'price_sum': (mfg_trends['Price_USD_mean'].fillna(0) * mfg_trends['Price_USD_count']).astype(float),
+        'price_count': mfg_trends['Price_USD_count'].astype(np.int64),
+        'vehicles': mfg_trends['Vehicle_ID_nunique'].astype(np.int64)
+    }).dropna(subset=['manufacturer'])
+    names = df['manufacturer'].unique()
+    df['key'] = df['manufacturer'].map(dict(zip(names, [manufacturer_key(n) for n in names])))
+    df = df[df['key'] != '']
+
+    series = df.groupby(['key', 'day'], sort=True)[['price_sum', 'price_count', 'vehicles']].sum().reset_index()
+    spellings = df.groupby(['key', 'manufacturer'])['price_count'].sum().reset_index() \
+        .sort_values('price_count', ascending=False, kind='stable').drop_duplicates('key').set_index('key')
+    keys, starts = np.unique(series['key'].to_numpy(dtype=str), return_index=True)
+    offsets = np.append(starts, len(series)).astype(np.int64)
+    days = series['day'].to_numpy(dtype=np.int32)
+    manufacturers = pd.DataFrame({
+        'key': keys,
+        'manufacturer': spellings.loc[keys, 'manufacturer'].to_numpy(dtype=object),
+        'first_date': days[offsets[:-1]].astype('datetime64[D]').astype(str),
+        'last_date': days[offsets[1:] - 1].astype('datetime64[D]').astype(str),
+        'days': np.diff(offsets)
+    })
+
+    save_arrays(output_dir, {
+        'offsets': offsets,
+        'days': days,
+        'price_sum': series['price_sum'].to_numpy(dtype=float),
+        'price_count': series['price_count'].to_numpy(dtype=np.int64),
+        'vehicles': series['vehicles'].to_numpy(dtype=np.int32)
+    }, {
+        'manufacturers': len(keys),
+        'rows': len(series),
+        'built_at': datetime.now().isoformat(timespec='seconds')
+    }, tables={'manufacturers': manufacturers})
+
+    print(f"✓ Manufacturer trends: {len(keys)} manufacturers, {len(series)} daily points "
+          f"(from {len(mfg_trends)} records)")
+
+def to_days(text):
+    return (date.fromisoformat(text) - EPOCH).days
+
+def period_starts(days, freq):
+    """First day of the period (day, Monday-start week or month) of each day"""
+    if freq == 'D':
+        return days
+    if freq == 'W':
+        return days - (days + 3) % 7  # 1970-01-01 was a Thursday
+    months = days.astype('datetime64[D]').astype('datetime64[M]')
+    return months.astype('datetime64[D]').astype(np.int64)
+
+class TrendSeries:
+    """Read side of the per-manufacturer series"""
+
+    def __init__(self, directory=TRENDS_DIR):
+        arrays, self.manifest = load_arrays(directory, ARRAYS)
+        self.offsets = arrays['offsets']
+        self.days = arrays['days']
+        self.price_sum = arrays['price_sum']
+        self.price_count = arrays['price_count']
+        self.vehicles = arrays['vehicles']
+        table = load_table(directory, 'manufacturers')
+        self.labels = table['manufacturer'].tolist()
+        self.positions = {key: i for i, key in enumerate(table['key'])}
+
+    def find(self, name):
+        """Position of a manufacturer in any spelling, or None"""
+        return self.positions.get(manufacturer_key(name))
+
+    def series(self, position, start=None, end=None, freq='D', window=None):
+        """Points of one manufacturer in the inclusive date range, resampled
+        to ``freq``, with a ``window``-point moving average of the price"""
+        lo, hi = self.offsets[position], self.offsets[position + 1]
+        days = self.days[lo:hi]
+        if start:
+            lo += np.searchsorted(days, to_days(start), side='left')
+        if end:
+            hi = self.offsets[position] + np.searchsorted(days, to_days(end), side='right')
+        if hi <= lo:
+            return []
+
+        days = self.days[lo:hi].astype(np.int64)
+        periods = period_starts(days, freq)
+        bounds = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        price_sum = np.add.reduceat(self.price_sum[lo:hi], bounds)
+        price_count = np.add.reduceat(self.price_count[lo:hi], bounds)
+        # Distinct vehicles cannot be added across days: average them per period
+        vehicles = np.add.reduceat(self.vehicles[lo:hi].astype(np.int64), bounds) / np.diff(np.r_[bounds, len(days)])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_price = price_sum / price_count
+            if window:
+                sums, counts = np.r_[0.0, np.cumsum(price_sum)], np.r_[0, np.cumsum(price_count)]
+                ends = np.arange(1, len(bounds) + 1)
+                starts = np.maximum(ends - window, 0)
+                moving = (sums[ends] - sums[starts]) / (counts[ends] - counts[starts])
+                moving[:window - 1] = np.nan  # Not a full window yet
+
+        columns = {
+            'date': periods[bounds].astype('datetime64[D]').astype(str).tolist(),
+            'avg_price': _rounded(avg_price),
+            'listings': price_count.tolist(),
+            'vehicles': self.vehicles[lo:hi].tolist() if freq == 'D' else _rounded(vehicles)
+        }
+        if window:
+            columns['moving_avg_price'] = _rounded(moving)
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+def _rounded(values):
+    """Floats rounded to cents, NaN as None"""
+    return [None if v != v else v for v in np.round(values, 2).tolist()]
@@ -1,28 +1,134 @@
 import csv
+import os
+import time
+
+FIELDNAMES = [
+    'Manufacturer', 'Model', 'Registration Status', 'Price', 'Mileage',
+    'Keys', 'Damage description', 'Transmission', 'Seats', 'Fuel Type', 'Link'
+]
 
 class CarDataWriter:
-    def __init__(self, filename):
-        self.filename = filename
+    """Buffered CSV writer for a day's scrape.
+
+    Rows are written to ``<filename>.tmp`` and flushed every ``flush_every``
+    rows, or sooner when a row is saved ``flush_interval`` seconds or more
+    after the last flush, so the web app's live feed (which tails the temp
+    file) shows new rows within seconds. ``wrap_up`` renames the temp file
+    onto ``filename`` so readers never see a half-written day.
+
+    If ``parquet_filename`` is given the same rows are also kept column-wise
+    and written as a Parquet file on ``wrap_up``, after the CSV; the snapshot
+    store reads it instead of parsing the CSV.
+
+    With a ``checkpoint`` (see ScrapeCheckpoint) every flush records the
+    written links and file offset, and ``initialize`` reopens an existing
+    temp file at the checkpointed offset instead of starting over.
+    """
+
+    def __init__(self, filename, flush_every=50, parquet_filename=None, checkpoint=None, flush_interval=5.0):
+        self.filename = str(filename)
+        self.temp_filename = self.filename + '.tmp'
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.parquet_filename = str(parquet_filename) if parquet_filename else None
         self.file = None
         self.writer = None
+        self.checkpoint = checkpoint
+        self.columns = None
+        self.pending = 0
+        self.pending_ids = []
+        self.written_ids = set()
 
     def initialize(self):
         print("Initializing CSV file...")
-        self.file = open(self.filename, 'w', newline='')
-        self.writer = csv.DictWriter(self.file, fieldnames=[
-            'Manufacturer', 'Model', 'Registration Status', 'Price', 'Mileage',
-            'Keys', 'Damage description', 'Transmission', 'Seats', 'Fuel Type', 'Link'
-        ])
+        if self.parquet_filename:
+            # Fail before scraping starts rather than after, if pyarrow is missing
+            import pyarrow  # noqa: F401
+            self.columns = {name: [] for name in FIELDNAMES}
+
+        if self.can_resume():
+            print(f"Resuming CSV file at byte {self.checkpoint.offset}...")
+            self.file = open(self.temp_filename, 'r+', newline='', buffering=1024 * 1024)
+            self.file.truncate(self.checkpoint.offset)
+            self.file.seek(self.checkpoint.offset)
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDNAMES)
+            self.written_ids = set(self.checkpoint.written_ids)
+            if self.columns is not None:
+                self.reload_columns()
+            return
+
+        if self.checkpoint:
+            self.checkpoint.reset()
+        self.file = open(self.temp_filename, 'w', newline='', buffering=1024 * 1024)
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDNAMES)
         self.writer.writeheader()
 
+    def can_resume(self):
+        return (self.checkpoint is not None
+                and self.checkpoint.offset > 0
+                and os.path.exists(self.temp_filename)
+                and os.path.getsize(self.temp_filename) >= self.checkpoint.offset)
+
+    def reload_columns(self):
+        """Refill the Parquet column buffers from the rows already on disk"""
+        self.file.seek(0)
+        for row in csv.DictReader(self.file):
+            for name in FIELDNAMES:
+                self.columns[name].append(row[name])
+        self.file.seek(self.checkpoint.offset)
+
+    def has_entry(self, link):
+        return link in self.written_ids
+
     def save_entry(self, data, entry_number):
-        print("Saving entry..." + str(entry_number))
         self.writer.writerow(data)
+        self.written_ids.add(data.get('Link'))
+        self.pending_ids.append(data.get('Link'))
+        if self.columns is not None:
+            for name in FIELDNAMES:
+                value = data.get(name)
+                self.columns[name].append(None if value is None else str(value))
+        self.pending += 1
+        if self.pending >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_interval:
+            print("Saving entries up to " + str(entry_number) + "...")
+            self.flush()
+
+    def flush(self):
         self.file.flush()
+        if self.checkpoint:
+            os.fsync(self.file.fileno())
+            self.checkpoint.record_flush(self.pending_ids, self.file.tell())
+        self.pending = 0
+        self.pending_ids = []
+        self.last_flush = time.monotonic()
+
+    def complete_page(self, page_number):
+        """Flush and mark a list page as done so a restart skips it"""
+        self.flush()
+        if self.checkpoint:
+            self.checkpoint.complete_page(page_number)
 
     def wrap_up(self):
         print("Wrapping up CSV file...")
+        self.flush()
+        os.fsync(self.file.fileno())
         self.file.close()
+        os.replace(self.temp_filename, self.filename)
+        if self.columns is not None:
+            self.write_parquet()
+        if self.checkpoint:
+            self.checkpoint.remove()
+
+    def write_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        print("Writing Parquet file...")
+        table = pa.table({name: pa.array(values, type=pa.string()) for name, values in self.columns.items()})
+        temp_filename = self.parquet_filename + '.tmp'
+        pq.write_table(table, temp_filename, compression='snappy')
+        os.replace(temp_filename, self.parquet_filename)
 
 # Example usage:
 if __name__ == '__main__':
@@ -40,8 +146,9 @@ if __name__ == '__main__':
         'Damage description': 'Minor scratches on the bumper',
         'Transmission': 'Automatic',
         'Seats': 4,
-        'Fuel Type': 'Gasoline'
+        'Fuel Type': 'Gasoline',
+        'Link': 'https://manheim.co.nz/damaged-vehicles/000000000000000001/2015-ford-mustang'
     }
 
-    writer.save_entry(car_data)
+    writer.save_entry(car_data, 1)
     writer.wrap_up()
@@ -0,0 +1,85 @@
+import queue
+import threading
+import time
+
+from bs4 import BeautifulSoup
+
+from PageLengthFinder import count_pages_in_soup
+
+# Queue sentinel marking the end of the list pages
+DONE = object()
+
+class ListPagePipeline:
+    """Prefetches search result pages on a background thread.
+
+    The producer fetches page 1 once and uses it both to count the pages and
+    as the first page of data, then keeps fetching and parsing later pages
+    while the consumer works through the detail pages of the current one. A
+    bounded queue of ``prefetch`` pages sits between the two, so the producer
+    never runs far ahead of the consumer.
+
+    Iterating yields ``(page_number, soup)``; ``soup`` is None when the page
+    could not be fetched. Pages for which ``skip_page(page_number)`` is true
+    are not fetched (page 1 is always fetched for discovery) or yielded. If
+    the producer fails -- a request exception, or any other error such as a
+    page that does not parse -- the exception is re-raised in the consumer
+    instead of ending the pages early, so a partial day is never taken for a
+    complete one.
+    """
+
+    def __init__(self, fetcher, url_template, per_page, skip_page=None, prefetch=2, delay=2):
+        self.fetcher = fetcher
+        self.url_template = url_template
+        self.per_page = per_page
+        self.skip_page = skip_page or (lambda page_number: False)
+        self.delay = delay
+        self.queue = queue.Queue(maxsize=prefetch)
+        self.number_of_pages = None
+        self.discovered = threading.Event()
+        self.thread = threading.Thread(target=self.produce, name='list-page-producer', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        self.discovered.wait()
+        return self.number_of_pages
+
+    def fetch_page(self, page_number):
+        response = self.fetcher.fetch(self.url_template.format(self.per_page, page_number), 'list',
+                                      backoff=5, label=f"Page {page_number}")
+        if not response or response.status_code != 200:
+            return None
+        parse_start = time.perf_counter()
+        soup = BeautifulSoup(response.content, "html.parser")
+        self.fetcher.observe_parse('list', parse_start)
+        return soup
+
+    def produce(self):
+        try:
+            soup = self.fetch_page(1)
+            self.number_of_pages = count_pages_in_soup(soup) if soup else 0
+            self.discovered.set()
+            if self.number_of_pages and not self.skip_page(1):
+                self.queue.put((1, soup))
+
+            for page_number in range(2, self.number_of_pages + 1):
+                if self.skip_page(page_number):
+                    continue
+                # Add delay between pages to avoid rate limiting
+                self.fetcher.pause(self.delay)
+                self.queue.put((page_number, self.fetch_page(page_number)))
+        except Exception as e:
+            self.queue.put(e)
+        finally:
+            if self.number_of_pages is None:
+                self.number_of_pages = 0
+            self.discovered.set()
+            self.queue.put(DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class ArchivedPage:
+    """Stand-in for a requests.Response built from an archived page"""
+
+    def __init__(self, url, content, status_code=200):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+class PageArchive:
+    """Compressed, content-addressed archive of fetched list and detail pages.
+
+    Page bodies are stored once per distinct content under
+    ``objects/<first two hex chars>/<sha256>.<codec>`` (zstd when the
+    ``zstandard`` package is installed, gzip otherwise). Each scrape date has
+    a JSON-lines index at ``index/<date>.jsonl`` mapping URL to digest, so a
+    day can be replayed without touching the network.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.lock = threading.Lock()
+        self.codec = 'zst' if zstandard else 'gz'
+
+    def blob_path(self, digest, codec):
+        return self.root / 'objects' / digest[:2] / f"{digest}.{codec}"
+
+    def index_path(self, date):
+        return self.root / 'index' / f"{date}.jsonl"
+
+    def store(self, url, content, kind, date):
+        """Archive a page body and record it in the index for ``date``"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.blob_path(digest, self.codec)
+        entry = {'url': url, 'kind': kind, 'sha256': digest, 'codec': self.codec, 'bytes': len(content)}
+        index_path = self.index_path(date)
+        with self.lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_name(path.name + '.tmp')
+                with open(temp_path, 'wb') as f:
+                    f.write(self.compress(content))
+                os.replace(temp_path, path)
+
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(index_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+    def load_index(self, date):
+        """Return {url: entry} for a date; later fetches of a URL win"""
+        index_path = self.index_path(date)
+        if not index_path.exists():
+            return {}
+        entries = {}
+        with open(index_path) as f:
+            for line in f:
+                entry = json.loads(line)
+                entries[entry['url']] = entry
+        return entries
+
+    def read(self, entry):
+        with open(self.blob_path(entry['sha256'], entry['codec']), 'rb') as f:
+            data = f.read()
+        return self.decompress(data, entry['codec'])
+
+    def compress(self, content):
+        if self.codec == 'zst':
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return gzip.compress(content, compresslevel=6)
+
+    def decompress(self, data, codec):
+        if codec == 'zst':
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed archive pages")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
@@ -0,0 +1,103 @@
+import copy
+import time
+
+import requests
+
+from PageArchive import ArchivedPage
+
+class PageFetcher:
+    """Shared HTTP access for the scraper, with optional record/replay.
+
+    In normal mode pages are fetched through one ``requests.Session`` with
+    retries and linear backoff, and successful responses are written to
+    ``archive`` when one is given. In replay mode (``replay_date`` set) pages
+    come straight from the archive index for that date: nothing touches the
+    network and politeness delays are skipped.
+
+    When ``metrics`` (a ScraperMetrics) is given, every request, retry and
+    backoff is recorded against the page kind.
+    """
+
+    def __init__(self, session=None, archive=None, archive_date=None, replay_date=None, metrics=None):
+        self.session = session or requests.Session()
+        self.metrics = metrics
+        self.archive = archive
+        self.archive_date = archive_date
+        self.replay_date = replay_date
+        self.replay_index = archive.load_index(replay_date) if replay_date else None
+
+    def clone(self):
+        """Copy for use on another thread: same archive, replay index and
+        metrics, but its own session"""
+        other = copy.copy(self)
+        other.session = requests.Session()
+        other.session.headers.update(self.session.headers)
+        return other
+
+    @property
+    def replaying(self):
+        return self.replay_index is not None
+
+    def pause(self, seconds):
+        """Politeness delay between requests; a no-op when replaying"""
+        if not self.replaying:
+            time.sleep(seconds)
+
+    def fetch(self, url, kind, headers=None, max_retries=3, backoff=5, label="Page"):
+        """Fetch ``url``, retrying non-200 responses and request errors.
+
+        Returns the last response, which may be non-200 once retries run out.
+        Re-raises the request exception if the final attempt fails outright.
+        """
+        if self.replaying:
+            request_start = time.perf_counter()
+            response = self.replay(url)
+            self.observe_request(kind, request_start, response.status_code, len(response.content))
+            return response
+
+        response = None
+        for attempt in range(max_retries):
+            request_start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=30)
+                self.observe_request(kind, request_start, response.status_code, len(response.content))
+                if response.status_code == 200:
+                    break
+                elif attempt < max_retries - 1:
+                    wait_time = (attempt + 1) * backoff
+                    print(f"{label} got status {response.status_code}, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
+                    self.observe_retry(kind, response.status_code, wait_time)
+                    time.sleep(wait_time)
+            except requests.exceptions.RequestException as e:
+                self.observe_request(kind, request_start, 'error')
+                if attempt < max_retries - 1:
+                    wait_time = (attempt + 1) * backoff
+                    print(f"{label} request failed: {e}, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
+                    self.observe_retry(kind, 'error', wait_time)
+                    time.sleep(wait_time)
+                else:
+                    print(f"{label} failed after {max_retries} attempts: {e}")
+                    raise
+
+        if self.archive and response.status_code == 200:
+            self.archive.store(url, response.content, kind, self.archive_date)
+        return response
+
+    def observe_request(self, kind, request_start, status, num_bytes=0):
+        if self.metrics:
+            self.metrics.observe_request(kind, time.perf_counter() - request_start, status, num_bytes)
+
+    def observe_retry(self, kind, status, wait_time):
+        if self.metrics:
+            self.metrics.observe_retry(kind, status, wait_time)
+
+    def observe_parse(self, kind, parse_start):
+        if self.metrics:
+            self.metrics.observe_parse(kind, time.perf_counter() - parse_start)
+
+    def replay(self, url):
+        entry = self.replay_index.get(url)
+        if entry is None:
+            print(f"Not in archive for {self.replay_date}: {url}")
+            return ArchivedPage(url, b'', status_code=404)
+        return ArchivedPage(url, self.archive.read(entry))
@@ -1,8 +1,23 @@
 import requests
 from bs4 import BeautifulSoup
 import time
+from PageFetcher import PageFetcher
 
-def count_number_of_pages(url):
+def count_pages_in_soup(soup):
+    """Count the pages listed in a parsed search results page"""
+    # Find the <ul> tag with class="pages"
+    ul_tag = soup.find('ul', class_='pages')
+
+    if ul_tag:
+        # Count the number of <li> tags inside the <ul>
+        li_count = len(ul_tag.find_all('li'))
+        print(f"Number of <li> tags inside <ul class='pages'>: {li_count}")
+        return li_count
+    else:
+        print("No <ul> tag with class='pages' found on the page.")
+        return 0
+
+def count_number_of_pages(url, fetcher=None):
     # Headers to mimic a real browser
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -17,54 +32,29 @@ def count_number_of_pages(url):
         'Sec-Fetch-Site': 'same-origin'
     }
     
-    # Retry logic with exponential backoff
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # Send a GET request to the specified URL with timeout
-            response = requests.get(url, headers=headers, timeout=30)
-            
-            # Check if the request was successful
-            if response.status_code == 200:
-                break
-            elif attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 5
-                print(f"Got status {response.status_code}, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 5
-                print(f"Request failed: {e}, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-            else:
-                print(f"Failed after {max_retries} attempts: {e}")
-                return 0
+    fetcher = fetcher or PageFetcher()
+    try:
+        response = fetcher.fetch(url, 'list', headers=headers, backoff=5)
+    except requests.exceptions.RequestException:
+        return 0
     
     if response.status_code == 200:
         # Parse the HTML content of the page
+        parse_start = time.perf_counter()
         soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Find the <ul> tag with class="pages"
-        ul_tag = soup.find('ul', class_='pages')
-
-        if ul_tag:
-            # Count the number of <li> tags inside the <ul>
-            li_count = len(ul_tag.find_all('li'))
-            print(f"Number of <li> tags inside <ul class='pages'>: {li_count}")
-            return li_count
-        else:
-            print("No <ul> tag with class='pages' found on the page.")
-            return 0
+        fetcher.observe_parse('list', parse_start)
+        return count_pages_in_soup(soup)
     else:
         print("Failed to retrieve the webpage.")
         return 0
 
-# Test the function with the given URL
-url = "https://manheim.co.nz/damaged-vehicles/search?PageNumber=1&RecordsPerPage={}&searchType=Z&page={}"
+if __name__ == '__main__':
+    # Test the function with the given URL
+    url = "https://manheim.co.nz/damaged-vehicles/search?PageNumber=1&RecordsPerPage={}&searchType=Z&page={}"
 
-N = 120  # Specify the value of N here
-pageNumber = 1  # Specify the value of page here
+    N = 120  # Specify the value of N here
+    pageNumber = 1  # Specify the value of page here
 
-# Format the URL with the values of N and page
-formatted_url = url.format(N, pageNumber)
-count_number_of_pages(formatted_url)
+    # Format the URL with the values of N and page
+    formatted_url = url.format(N, pageNumber)
+    count_number_of_pages(formatted_url)
@@ -0,0 +1,60 @@
+import json
+import os
+
+class ScrapeCheckpoint:
+    """Sidecar state file that lets an interrupted day's scrape resume.
+
+    Records the list pages that finished, the vehicle links already written
+    and the byte offset of the temp CSV at the last flush. Everything up to
+    ``offset`` is known to be on disk; anything after it is discarded on
+    resume and re-scraped.
+    """
+
+    def __init__(self, filename):
+        self.filename = str(filename)
+        self.completed_pages = set()
+        self.written_ids = set()
+        self.offset = 0
+
+    def load(self):
+        """Load saved state, returning True if there was any to resume from"""
+        if not os.path.exists(self.filename):
+            return False
+        with open(self.filename) as f:
+            state = json.load(f)
+        self.completed_pages = set(state.get('completed_pages', []))
+        self.written_ids = set(state.get('written_ids', []))
+        self.offset = state.get('offset', 0)
+        return self.offset > 0
+
+    def save(self):
+        state = {
+            'completed_pages': sorted(self.completed_pages),
+            'written_ids': sorted(self.written_ids),
+            'offset': self.offset
+        }
+        temp_filename = self.filename + '.tmp'
+        with open(temp_filename, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_filename, self.filename)
+
+    def reset(self):
+        self.completed_pages = set()
+        self.written_ids = set()
+        self.offset = 0
+
+    def record_flush(self, ids, offset):
+        self.written_ids.update(ids)
+        self.offset = offset
+        self.save()
+
+    def complete_page(self, page_number):
+        self.completed_pages.add(page_number)
+        self.save()
+
+    def is_page_complete(self, page_number):
+        return page_number in self.completed_pages
+
+    def remove(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
@@ -2,8 +2,9 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import time
+from PageFetcher import PageFetcher
 
-def scrape_vehicle_page(url):
+def scrape_vehicle_page(url, fetcher=None):
     # Headers to mimic a real browser
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -18,32 +19,17 @@ def scrape_vehicle_page(url):
         'Sec-Fetch-Site': 'same-origin'
     }
     
-    # Retry logic with exponential backoff
-    max_retries = 3
-    response = None
-    for attempt in range(max_retries):
-        try:
-            # Send a GET request to the URL with timeout
-            response = requests.get(url, headers=headers, timeout=30)
-            if response.status_code == 200:
-                break
-            elif attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 3
-                print(f"Vehicle page got status {response.status_code}, retrying in {wait_time}s...")
-                time.sleep(wait_time)
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 3
-                print(f"Vehicle page request failed, retrying in {wait_time}s...")
-                time.sleep(wait_time)
-            else:
-                print(f"Failed to fetch vehicle page after {max_retries} attempts")
-                return json.dumps({"Vehicle Comments": "N/A", "Vehicle Location": "N/A", "Vehicle Info": "N/A", "Vehicle Details": "N/A", "Vehicle Damage": "N/A"})
+    fetcher = fetcher or PageFetcher()
+    try:
+        response = fetcher.fetch(url, 'detail', headers=headers, backoff=3, label="Vehicle page")
+    except requests.exceptions.RequestException:
+        return json.dumps({"Vehicle Comments": "N/A", "Vehicle Location": "N/A", "Vehicle Info": "N/A", "Vehicle Details": "N/A", "Vehicle Damage": "N/A"})
     
     if not response or response.status_code != 200:
         return json.dumps({"Vehicle Comments": "N/A", "Vehicle Location": "N/A", "Vehicle Info": "N/A", "Vehicle Details": "N/A", "Vehicle Damage": "N/A"})
     
     # Parse the HTML content using BeautifulSoup
+    parse_start = time.perf_counter()
     soup = BeautifulSoup(response.content, "html.parser")
     
     # Create a dictionary to store the attribute values
@@ -76,11 +62,13 @@ def scrape_vehicle_page(url):
 
     # Convert the dictionary to a JSON string
     json_data = json.dumps(vehicle_data, indent=4)
+    fetcher.observe_parse('detail', parse_start)
 
     # Return the JSON string
     return json_data
 
 # Example usage:
-url = "https://manheim.co.nz/damaged-vehicles/000000000006640001/2018-suzuki-swift-glc-1-2p-cvt-hatch?referringPage=SearchResults"
-json_data = scrape_vehicle_page(url)
-#print(json_data)
+if __name__ == '__main__':
+    url = "https://manheim.co.nz/damaged-vehicles/000000000006640001/2018-suzuki-swift-glc-1-2p-cvt-hatch?referringPage=SearchResults"
+    json_data = scrape_vehicle_page(url)
+    #print(json_data)
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+def histogram(values):
+    """Cumulative bucket counts in Prometheus ``le`` form"""
+    buckets = {str(bound): sum(1 for v in values if v <= bound) for bound in LATENCY_BUCKETS}
+    buckets['+Inf'] = len(values)
+    return buckets
+
+def describe(values):
+    return {
+        'count': len(values),
+        'sum': round(sum(values), 4),
+        'p50': round(percentile(values, 50), 4),
+        'p95': round(percentile(values, 95), 4),
+        'p99': round(percentile(values, 99), 4),
+        'max': round(max(values), 4) if values else 0.0,
+        'buckets': histogram(values)
+    }
+
+class ScraperMetrics:
+    """Run-level telemetry for one scrape.
+
+    Request latencies and parse times are kept per page kind ("list" or
+    "detail") so percentiles in the summary are exact; a nightly run is a
+    few thousand requests at most. Safe to update from several threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.request_seconds = defaultdict(list)
+        self.parse_seconds = defaultdict(list)
+        self.responses = Counter()
+        self.retries = Counter()
+        self.backoff_seconds = Counter()
+        self.bytes_downloaded = Counter()
+        self.rows = 0
+
+    def observe_request(self, kind, seconds, status, num_bytes=0):
+        with self.lock:
+            self.request_seconds[kind].append(seconds)
+            self.responses[(kind, str(status))] += 1
+            self.bytes_downloaded[kind] += num_bytes
+
+    def observe_retry(self, kind, status, wait_seconds):
+        with self.lock:
+            self.retries[(kind, str(status))] += 1
+            self.backoff_seconds[kind] += wait_seconds
+
+    def observe_parse(self, kind, seconds):
+        with self.lock:
+            self.parse_seconds[kind].append(seconds)
+
+    def count_row(self):
+        with self.lock:
+            self.rows += 1
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def rows_per_second(self):
+        return self.rows / max(self.elapsed(), 1e-9)
+
+    def summary(self, **extra):
+        elapsed = self.elapsed()
+        summary = {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.start_time)),
+            'total_seconds': round(elapsed, 3),
+            'rows': self.rows,
+            'rows_per_second': round(self.rows / max(elapsed, 1e-9), 3),
+            'bytes_downloaded': dict(self.bytes_downloaded),
+            'request_seconds': {kind: describe(v) for kind, v in self.request_seconds.items()},
+            'parse_seconds': {kind: describe(v) for kind, v in self.parse_seconds.items()},
+            'responses': {f"{kind}:{status}": n for (kind, status), n in sorted(self.responses.items())},
+            'retries': {f"{kind}:{status}": n for (kind, status), n in sorted(self.retries.items())},
+            'backoff_seconds': dict(self.backoff_seconds)
+        }
+        summary.update(extra)
+        return summary
+
+    def write_json(self, filename, **extra):
+        os.makedirs(os.path.dirname(str(filename)) or '.', exist_ok=True)
+        with open(filename, 'w') as f:
+            json.dump(self.summary(**extra), f, indent=2)
+
+    def write_prometheus(self, filename):
+        """Write a Prometheus text-format file (e.g. for node_exporter's textfile collector)"""
+        lines = []
+
+        def histogram_lines(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for kind, values in sorted(series.items()):
+                for bound, count in histogram(values).items():
+                    lines.append(f'{name}_bucket{{kind="{kind}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{kind="{kind}"}} {sum(values):.6f}')
+                lines.append(f'{name}_count{{kind="{kind}"}} {len(values)}')
+
+        histogram_lines('scraper_request_seconds', 'HTTP request latency by page kind.', self.request_seconds)
+        histogram_lines('scraper_parse_seconds', 'HTML parse time by page kind.', self.parse_seconds)
+
+        lines.append("# HELP scraper_responses_total Responses by page kind and status code.")
+        lines.append("# TYPE scraper_responses_total counter")
+        for (kind, status), n in sorted(self.responses.items()):
+            lines.append(f'scraper_responses_total{{kind="{kind}",status="{status}"}} {n}')
+        lines.append("# HELP scraper_retries_total Retries by page kind and status code.")
+        lines.append("# TYPE scraper_retries_total counter")
+        for (kind, status), n in sorted(self.retries.items()):
+            lines.append(f'scraper_retries_total{{kind="{kind}",status="{status}"}} {n}')
+        lines.append("# HELP scraper_backoff_seconds_total Time spent sleeping before retries.")
+        lines.append("# TYPE scraper_backoff_seconds_total counter")
+        for kind, seconds in sorted(self.backoff_seconds.items()):
+            lines.append(f'scraper_backoff_seconds_total{{kind="{kind}"}} {seconds}')
+        lines.append("# HELP scraper_downloaded_bytes_total Response bytes by page kind.")
+        lines.append("# TYPE scraper_downloaded_bytes_total counter")
+        for kind, n in sorted(self.bytes_downloaded.items()):
+            lines.append(f'scraper_downloaded_bytes_total{{kind="{kind}"}} {n}')
+        lines.append("# HELP scraper_rows_total Rows written to the day's CSV.")
+        lines.append("# TYPE scraper_rows_total gauge")
+        lines.append(f"scraper_rows_total {self.rows}")
+        lines.append("# HELP scraper_run_seconds Wall-clock duration of the run.")
+        lines.append("# TYPE scraper_run_seconds gauge")
+        lines.append(f"scraper_run_seconds {self.elapsed():.3f}")
+
+        temp_filename = str(filename) + '.tmp'
+        with open(temp_filename, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_filename, filename)
@@ -8,6 +8,11 @@ Modules:
     ScrapeVehiclePage: Vehicle page scraping logic
     CSVSaver: CSV file writing utilities
     PageLengthFinder: Utility for determining page lengths
+    ListPagePipeline: Background prefetch of search result pages
+    ScrapeCheckpoint: Resume state for interrupted scrapes
+    PageFetcher: HTTP fetching with retries and record/replay
+    PageArchive: Compressed on-disk archive of fetched pages
+    ScraperMetrics: Run telemetry with JSON and Prometheus export
 """
 
 __version__ = "1.0.0"
@@ -1,37 +1,80 @@
 from calendar import c
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from ScrapeVehiclePage import scrape_vehicle_page
 from CSVSaver import CarDataWriter
-from PageLengthFinder import count_number_of_pages
+from ScrapeCheckpoint import ScrapeCheckpoint
+from ListPagePipeline import ListPagePipeline
+from PageArchive import PageArchive
+from PageFetcher import PageFetcher
+from ScraperMetrics import ScraperMetrics
+import atexit
 import json
 import datetime
 import os
 import time
 from pathlib import Path
 
+metrics = ScraperMetrics()
+project_dir = Path(__file__).parent.parent.parent
+
 # Get today's date
 today = datetime.date.today()
 
 # Ensure data/raw directory exists
-data_dir = Path(__file__).parent.parent.parent / "data" / "raw"
+data_dir = project_dir / "data" / "raw"
+
+# Archive every fetched page when SCRAPER_ARCHIVE_DIR is set. Setting
+# SCRAPER_REPLAY_DATE instead re-runs that day from the archive with no
+# network, writing to data/replay/ unless SCRAPER_OUTPUT_DIR says otherwise.
+archive_dir = os.environ.get('SCRAPER_ARCHIVE_DIR')
+replay_date = os.environ.get('SCRAPER_REPLAY_DATE')
+if replay_date:
+    today = replay_date
+    archive_dir = archive_dir or project_dir / "data" / "archive"
+    data_dir = Path(os.environ.get('SCRAPER_OUTPUT_DIR', project_dir / "data" / "replay"))
+    print(f"Replaying {replay_date} from archive {archive_dir}")
+archive = PageArchive(archive_dir) if archive_dir else None
+
 data_dir.mkdir(parents=True, exist_ok=True)
 
+# Run summary goes to data/metrics/ (or SCRAPER_METRICS_DIR); set
+# SCRAPER_PROMETHEUS_FILE to also write Prometheus text format
+metrics_dir = Path(os.environ.get('SCRAPER_METRICS_DIR', project_dir / "data" / "metrics"))
+prometheus_file = os.environ.get('SCRAPER_PROMETHEUS_FILE')
+run_status = 'failed'
+
+def write_metrics():
+    metrics.write_json(metrics_dir / f"scrape_{today}.json", date=str(today), status=run_status,
+                       replay=bool(replay_date))
+    if prometheus_file:
+        metrics.write_prometheus(prometheus_file)
+
+atexit.register(write_metrics)
+
 # Create the filename with today's date in data/raw/
 filename = data_dir / f"car_data_{today}.csv"
 
+# Optionally write the same day as Parquet alongside the CSV (the snapshot store reads it instead)
+write_parquet = os.environ.get('SCRAPER_WRITE_PARQUET', 'False') == 'True'
+parquet_filename = data_dir / f"car_data_{today}.parquet" if write_parquet else None
+
+# Sidecar state so a crashed run can resume where it stopped
+checkpoint = ScrapeCheckpoint(data_dir / f"car_data_{today}.state.json")
+if checkpoint.load():
+    print(f"Resuming from checkpoint: {len(checkpoint.completed_pages)} pages and "
+          f"{len(checkpoint.written_ids)} vehicles already saved")
+
 # Create an instance of CarDataWriter with the filename
-writer = CarDataWriter(str(filename))
+writer = CarDataWriter(str(filename), parquet_filename=parquet_filename, checkpoint=checkpoint)
 writer.initialize()
 
 url = "https://manheim.co.nz/damaged-vehicles/search?PageNumber=1&RecordsPerPage={}&searchType=Z&page={}"
 
 numberOfEntries = 120  # Specify the value of N here
-current_page = 1 # Specify the value of page here
 
-# Format the URL with the values of N and page
-formatted_url = url.format(numberOfEntries, current_page)
+# Number of list pages fetched ahead of the one being processed
+prefetch_pages = int(os.environ.get('SCRAPER_PREFETCH_PAGES', 2))
 
 # Headers to mimic a real browser
 headers = {
@@ -50,46 +93,35 @@ headers = {
 # Create a session to persist cookies
 session = requests.Session()
 session.headers.update(headers)
+fetcher = PageFetcher(session, archive=archive, archive_date=str(today), replay_date=replay_date, metrics=metrics)
 
-number_of_pages = count_number_of_pages(formatted_url)
-
-while current_page <= number_of_pages:
-    
-    # Add delay between pages to avoid rate limiting
-    if current_page > 1:
-        time.sleep(2)
-    
-    # Send a GET request to the formatted_url with retry logic
-    max_retries = 3
-    response = None
-    for attempt in range(max_retries):
-        try:
-            response = session.get(formatted_url, timeout=30)
-            if response.status_code == 200:
-                break
-            elif attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 5
-                print(f"Page {current_page} got status {response.status_code}, retrying in {wait_time}s...")
-                time.sleep(wait_time)
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 5
-                print(f"Page {current_page} request failed, retrying in {wait_time}s...")
-                time.sleep(wait_time)
-            else:
-                print(f"Failed to fetch page {current_page} after {max_retries} attempts")
-                writer.wrap_up()
-                exit(1)
-    
-    if not response or response.status_code != 200:
+# List pages are fetched and parsed on their own thread (and session) while
+# this loop works through the detail pages of the current one
+pipeline = ListPagePipeline(fetcher.clone(), url, numberOfEntries,
+                            skip_page=checkpoint.is_page_complete, prefetch=prefetch_pages)
+number_of_pages = pipeline.start()
+if checkpoint.completed_pages:
+    print(f"Skipping completed pages: {sorted(checkpoint.completed_pages)}")
+
+pages = iter(pipeline)
+while True:
+    try:
+        current_page, soup = next(pages)
+    except StopIteration:
+        break
+    except requests.exceptions.RequestException:
+        # Keep the temp file and checkpoint so the next run resumes here
+        writer.flush()
+        exit(1)
+    except Exception:
+        # A list page failed to parse: not a complete day, keep the temp file
+        writer.flush()
+        raise
+
+    if soup is None:
         print(f"Failed to fetch page {current_page}, skipping...")
-        current_page += 1
-        formatted_url = url.format(numberOfEntries, current_page)
         continue
 
-    # Parse the HTML content using BeautifulSoup
-    soup = BeautifulSoup(response.content, "html.parser")
-
     # Find the section with class "vehicle-list"
     vehicle_list_section = soup.find("section", class_="vehicle-list")
 
@@ -167,10 +199,14 @@ while current_page <= number_of_pages:
             span_id = item.find("span", id=lambda value: value and value.startswith("stprice-"))
             price = span_id.get_text(strip=True) if span_id else "N/A"
 
+            # Already saved by this run or by the run we resumed from
+            if writer.has_entry(href):
+                continue
+
             # Call the scrape_vehicle_page() function from ScrapeVehiclePage.py
             # Add small delay between vehicle page requests
-            time.sleep(0.5)
-            json_data = scrape_vehicle_page(href)
+            fetcher.pause(0.5)
+            json_data = scrape_vehicle_page(href, fetcher)
             
             # Display the results
             # print("Vehicle:", vehicle)
@@ -200,19 +236,24 @@ while current_page <= number_of_pages:
 
             writer.save_entry(car_data, ((current_page-1)*numberOfEntries)+current_entry)
             current_entry += 1
+            metrics.count_row()
 
     except Exception as exception:
-        print("An error occurred. Program crashed." + exception)
-        writer.wrap_up()          
+        print("An error occurred. Program crashed. " + str(exception))
+        # Keep the temp file and checkpoint so the next run resumes here
+        writer.flush()
+        raise
+
+    writer.complete_page(current_page)
 
     #end of while loop
-    current_page += 1
-    formatted_url = url.format(numberOfEntries, current_page)
     print("Page {} of {} completed".format(current_page, number_of_pages))
 
 
 # Wrap up the CSV file writing process
 writer.wrap_up()
+run_status = 'completed'
+print(f"Saved {metrics.rows} entries in {metrics.elapsed():.1f}s ({metrics.rows_per_second():.1f} rows/s)")
 print("Program completed successfully.")
 
 
@@ -0,0 +1,14 @@
+"""
+Web Serving Package
+
+This package contains the serving-side helpers used by app_main.py.
+
+Modules:
+    coldstart: Import time, readiness and first-response report for a fresh Gunicorn worker
+    live: Server-Sent Events feed of the listings being scraped, tailed once per worker
+    loadtest: Gunicorn load test replaying a traffic mix against per-endpoint latency budgets
+    metrics: Per-route latency, size and phase histograms and cache counters for /metrics
+    offload: Bounded thread pool for heavy API handlers with timeouts and backpressure
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,122 @@
+"""
+Cold start report for the web app.
+
+Measures, for the current tree and a data directory:
+
+    import time        ``import app_main`` in a fresh interpreter (median of runs)
+    first response     from launching Gunicorn until a worker answers /about
+    ready              until /ready answers 200 (the worker has warmed up)
+    first fast         until the landing page and the dashboard both answer
+                       within FAST_MS, polling from the first response on
+                       (for up to FAST_TIMEOUT seconds)
+    first requests     latency of the first request to each of FIRST_PATHS
+                       once ready
+
+Usage:
+    python -m src.web.coldstart                     # data in the current directory
+    python -m src.web.coldstart --data /srv/data --workers 4 --report coldstart.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.web.loadtest import REPO_DIR, start_server
+
+FAST_MS = 100
+FAST_TIMEOUT = 60  # seconds to wait for fast responses before reporting none
+FIRST_PATHS = ['/', '/api/v1/dashboard', '/api/v1/stats/overview', '/api/v1/manufacturers']
+
+def import_time(data_dir, runs=5):
+    """Median seconds to import app_main, and whether pandas was imported with it"""
+    code = ("import sys, time; start = time.perf_counter(); import app_main; "
+            "print(time.perf_counter() - start, 'pandas' in sys.modules)")
+    env = dict(os.environ, PYTHONPATH=str(REPO_DIR))
+    samples, pandas_loaded = [], False
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=data_dir, env=env, check=True,
+                                capture_output=True, text=True).stdout.split()
+        samples.append(float(output[0]))
+        pandas_loaded = output[1] == 'True'
+    return statistics.median(samples), pandas_loaded
+
+def timed_get(url, path):
+    """(status, milliseconds) of one GET on a new connection"""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+    began = time.perf_counter()
+    conn.request('GET', path)
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    return response.status, (time.perf_counter() - began) * 1000
+
+def measure(data_dir, mode='sync', workers=1):
+    report = {}
+    report['import_seconds'], report['import_loads_pandas'] = import_time(data_dir)
+
+    with tempfile.TemporaryDirectory(prefix='coldstart-') as temp_dir:
+        launched = time.perf_counter()
+        process, url = start_server(data_dir, mode, Path(temp_dir) / 'gunicorn.log', workers)
+        try:
+            report['first_response_seconds'] = round(time.perf_counter() - launched, 3)
+
+            status, _ = timed_get(url, '/ready')
+            while status == 503:
+                time.sleep(0.05)
+                status, _ = timed_get(url, '/ready')
+            report['ready_seconds'] = round(time.perf_counter() - launched, 3) if status == 200 else None
+
+            fast = {path: False for path in FIRST_PATHS[:2]}
+            first = {}
+            deadline = time.perf_counter() + FAST_TIMEOUT
+            while not all(fast.values()) and time.perf_counter() < deadline:
+                for path in fast:
+                    status, ms = timed_get(url, path)
+                    first.setdefault(path, (status, round(ms, 1)))
+                    fast[path] = fast[path] or (status == 200 and ms <= FAST_MS)
+            report['first_fast_seconds'] = round(time.perf_counter() - launched, 3) if all(fast.values()) else None
+            for path in FIRST_PATHS[2:]:
+                status, ms = timed_get(url, path)
+                first[path] = (status, round(ms, 1))
+            report['first_requests_ms'] = {path: ms for path, (status, ms) in first.items()}
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the web app's cold start")
+    parser.add_argument('--data', default='.', help="Directory with data/raw and data/processed (default: .)")
+    parser.add_argument('--mode', choices=['sync', 'threaded'], default=os.environ.get('SERVING_MODE', 'sync'))
+    parser.add_argument('--workers', type=int, default=1, help="Gunicorn workers (default: 1)")
+    parser.add_argument('--report', help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = measure(Path(args.data).resolve(), args.mode, args.workers)
+    print(f"Import app_main:       {report['import_seconds']:.2f} s "
+          f"({'with' if report['import_loads_pandas'] else 'without'} pandas)")
+    print(f"First response:        {report['first_response_seconds']:.2f} s after launch")
+    if report['ready_seconds'] is not None:
+        print(f"Ready (/ready = 200):  {report['ready_seconds']:.2f} s after launch")
+    if report['first_fast_seconds'] is not None:
+        print(f"First fast (<{FAST_MS} ms) landing page and dashboard: {report['first_fast_seconds']:.2f} s after launch")
+    else:
+        print(f"Landing page and dashboard not both under {FAST_MS} ms within {FAST_TIMEOUT} s")
+    print("First requests:")
+    for path, ms in report['first_requests_ms'].items():
+        print(f"  {path:<28} {ms:>8.1f} ms")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Live feed of the listings the scraper is writing, as Server-Sent Events.
+
+``CarDataWriter`` appends rows to ``data/raw/car_data_<date>.csv.tmp`` and
+flushes them every few rows or seconds. ``LiveFeed`` runs one tailer thread
+per worker while anyone is subscribed: it polls the size of the file being
+written, parses the complete rows appended since the last poll and hands
+each one to every subscriber's queue, so the file is read once however many
+clients are connected.
+
+Every event's id is ``<date>:<offset>``, the byte offset just past the row
+in that day's file (the ``.tmp`` file keeps its bytes when the writer
+renames it onto the ``.csv``). A client that reconnects with
+``Last-Event-ID`` -- EventSource does this by itself -- gets the rows after
+that offset read back from the file before the live rows, so it misses
+nothing; replay covers the rest of the client's day and the current one.
+A client that falls more than ``QUEUE_SIZE`` rows behind is disconnected
+and catches up the same way.
+
+A stream ends after ``max_seconds`` (the client reconnects and resumes),
+which returns threads to the pool, and once it has been idle for a
+heartbeat with no file being written. The app serves the feed only in
+threaded mode and only while a scrape is in progress, answering 204 (which
+stops EventSource reconnecting) otherwise.
+"""
+
+import csv
+import json
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+
+RAW_DIR = Path("data/raw")
+TEMP_PATTERN = re.compile(r'car_data_(\d{4}-\d{2}-\d{2})\.csv\.tmp$')
+EVENT_ID = re.compile(r'(\d{4}-\d{2}-\d{2}):(\d+)$')
+POLL_INTERVAL = 0.5  # seconds between checks of the file being written
+QUEUE_SIZE = 1000  # rows a subscriber may fall behind before it is dropped
+HEARTBEAT = 15.0  # seconds between keep-alive comments on an idle stream
+RETRY_MS = 2000  # reconnect delay suggested to clients
+
+def complete_rows(data, offset):
+    """(end offset, CSV record) of each complete row in ``data`` (bytes read
+    from ``offset``); a row ends at a newline outside quotes"""
+    rows = []
+    start = scanned = quotes = 0
+    position = data.find(b'\n')
+    while position != -1:
+        quotes += data.count(b'"', scanned, position)
+        scanned = position
+        if quotes % 2 == 0:
+            rows.append((offset + position + 1, data[start:position + 1]))
+            start = position + 1
+        position = data.find(b'\n', position + 1)
+    return rows
+
+class Subscriber:
+    """A connected client's queue of live events"""
+
+    def __init__(self, date, offset):
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.date = date  # where the live events start
+        self.offset = offset
+        self.dropped = False
+
+class LiveFeed:
+    """One tailer per worker, fanned out to every connected client"""
+
+    def __init__(self, raw_dir=RAW_DIR, poll_interval=POLL_INTERVAL):
+        self.raw_dir = Path(raw_dir)
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.thread = None
+        self.date = None  # day being tailed
+        self.offset = 0  # end of the last row published
+        self.headers = {}  # date -> CSV header
+
+    # ---- files ----
+
+    def path(self, date):
+        """The file of ``date``: the temp file while it is written, then the final one"""
+        temp = self.raw_dir / f"car_data_{date}.csv.tmp"
+        return temp if temp.exists() else self.raw_dir / f"car_data_{date}.csv"
+
+    def writing(self):
+        """Date of the newest file being written, or None"""
+        dates = [m.group(1) for m in map(TEMP_PATTERN.match, (p.name for p in self.raw_dir.glob('car_data_*.csv.tmp'))) if m]
+        return max(dates) if dates else None
+
+    def header(self, date):
+        if date not in self.headers:
+            try:
+                with open(self.path(date), newline='', encoding='utf-8') as f:
+                    line = f.readline()
+            except OSError:
+                return None
+            if not line.endswith('\n'):
+                return None
+            self.headers[date] = next(csv.reader([line]))
+        return self.headers[date]
+
+    def read(self, date, offset, until=None):
+        """Events of the complete rows of ``date``'s file from ``offset`` (0
+        for the first row) up to ``until``; returns (events, end offset)"""
+        header = self.header(date)
+        if header is None:
+            return [], offset
+        try:
+            with open(self.path(date), 'rb') as f:
+                if offset == 0:
+                    offset = len(f.readline())
+                f.seek(offset - 1)
+                mid_row = f.read(1) != b'\n'
+                data = f.read() if until is None else f.read(max(until - offset, 0))
+        except OSError:
+            return [], offset
+        rows = complete_rows(data, offset)
+        if mid_row and rows:
+            # Not an event id of ours: resume at the next row
+            rows = rows[1:]
+        events = [(f"{date}:{end}", dict(zip(header, next(csv.reader([record.decode('utf-8', errors='replace')]), []))))
+                  for end, record in rows]
+        return events, rows[-1][0] if rows else offset
+
+    def row_end(self, date, size):
+        """End of the last complete row in the first ``size`` bytes of ``date``'s file"""
+        with open(self.path(date), 'rb') as f:
+            data = f.read(size)
+        start = data.find(b'\n') + 1  # Past the header
+        if not start:
+            return 0
+        rows = complete_rows(data[start:], start)
+        return rows[-1][0] if rows else start
+
+    # ---- tailer ----
+
+    def subscribe(self):
+        with self.lock:
+            if self.thread is None:
+                # Live from the rows already written, not from the start of the day
+                self.date = self.writing()
+                self.offset = self.read(self.date, 0)[1] if self.date else 0
+                self.thread = threading.Thread(target=self.run, name='live-feed', daemon=True)
+                self.thread.start()
+            subscriber = Subscriber(self.date, self.offset)
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            with self.lock:
+                if not self.subscribers:
+                    self.thread = None
+                    return
+            try:
+                self.poll()
+            except OSError:
+                pass  # The file moved under us; the next poll sees where it went
+
+    def poll(self):
+        if self.date is not None:
+            size = self.path(self.date).stat().st_size if self.path(self.date).exists() else 0
+            if size < self.offset:
+                # Cut back (a resumed scrape truncates to its checkpoint): rows
+                # written from there on are new, so publish them as they come
+                self.offset = self.row_end(self.date, size)
+            if size > self.offset:
+                events, offset = self.read(self.date, self.offset)
+                self.publish(events, self.date, offset)
+        newest = self.writing()
+        # Move to a new day once the current one is finished (no longer a temp file)
+        if newest != self.date and newest is not None and \
+                (self.date is None or not (self.raw_dir / f"car_data_{self.date}.csv.tmp").exists()):
+            self.publish([], newest, 0)
+
+    def publish(self, events, date, offset):
+        with self.lock:
+            self.date, self.offset = date, offset
+            for subscriber in list(self.subscribers):
+                for event in events:
+                    try:
+                        subscriber.queue.put_nowait(event)
+                    except queue.Full:
+                        subscriber.dropped = True
+                        self.subscribers.discard(subscriber)
+                        break
+
+    # ---- streams ----
+
+    def replay(self, last_event_id, subscriber):
+        """Events after ``last_event_id`` up to where ``subscriber``'s live events start"""
+        match = EVENT_ID.match(last_event_id or '')
+        if not match:
+            return
+        date, offset = match.group(1), int(match.group(2))
+        if subscriber.date is None or date < subscriber.date:
+            yield from self.read(date, offset)[0]
+            if subscriber.date is not None:
+                yield from self.read(subscriber.date, 0, subscriber.offset)[0]
+        elif date == subscriber.date:
+            yield from self.read(date, offset, subscriber.offset)[0]
+
+    def stream(self, last_event_id=None, max_seconds=300, heartbeat=HEARTBEAT):
+        """SSE text: the missed rows after ``last_event_id``, then live rows
+        for up to ``max_seconds``"""
+        subscriber = self.subscribe()
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            for event in self.replay(last_event_id, subscriber):
+                yield format_event(*event)
+            deadline = time.monotonic() + max_seconds
+            while not subscriber.dropped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = subscriber.queue.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    if self.writing() is None:
+                        break  # The scrape finished: free the connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_event(*event)
+        finally:
+            self.unsubscribe(subscriber)
+
+    def client_count(self):
+        with self.lock:
+            return len(self.subscribers)
+
+def format_event(event_id, row):
+    return f"id: {event_id}\nevent: listing\ndata: {json.dumps(row)}\n\n"
@@ -0,0 +1,414 @@
+"""
+Load test of the web app with per-endpoint latency budgets.
+
+Starts the app under Gunicorn with the settings of gunicorn_config.py in a
+data directory (one holding ``data/raw`` and ``data/processed``), replays a
+weighted mix of traffic from concurrent users and reports, per scenario,
+throughput and p50/p95/p99 latency. The exit status is 1 if any scenario is
+over its budget (``BUDGETS``, or a JSON file of the same shape), so the test
+can gate a deploy.
+
+In threaded mode ``--live-clients`` more clients follow ``/api/v1/live``
+like the landing page's EventSource does, holding a stream open for the
+whole run and reconnecting with ``Last-Event-ID``; with a generated dataset
+a scrape is simulated by appending rows to a temp raw file. Their
+``live`` scenario measures the time to the stream's first line, and the
+streams they hold show up in the other scenarios' latencies.
+
+The data directory is either a snapshot of real data (``--data``, default:
+the current directory) or a synthetic one (``--generate DAYS``): daily raw
+files with listings coming, changing price and going, run through
+clean_data.py so every processed store the API reads exists.
+
+Usage:
+    python -m src.web.loadtest                          # 30 s, 8 users, current data
+    python -m src.web.loadtest --generate 90 --users 16 --mode threaded
+    python -m src.web.loadtest --generate 30 --mode threaded --live-clients 8
+    python -m src.web.loadtest --url http://127.0.0.1:8000 --duration 60
+    python -m src.web.loadtest --budgets budgets.json --report report.json
+"""
+
+import argparse
+import csv
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+
+# Latency budgets in milliseconds, and the share of requests allowed to fail
+BUDGETS = {
+    'landing': {'p95': 1500, 'p99': 3000},
+    'dashboard': {'p95': 1000, 'p99': 2500},
+    'analytics_page': {'p95': 250, 'p99': 500},
+    'search': {'p95': 1000, 'p99': 2500},
+    'quantiles': {'p95': 500, 'p99': 1000},
+    'events': {'p95': 1000, 'p99': 2500},
+    'export': {'p95': 5000, 'p99': 10000},
+    'download_latest': {'p95': 1000, 'p99': 2500},
+    'live': {'p95': 500, 'p99': 1000},
+    '*': {'error_rate': 0.01}
+}
+DEFAULT_MANUFACTURERS = ['Toyota', 'Nissan', 'Mazda', 'Honda', 'Mitsubishi', 'Subaru', 'Suzuki', 'Ford']
+
+def _search(rng, manufacturers):
+    params = {'manufacturer': rng.choice(manufacturers)}
+    if rng.random() < 0.5:
+        params['max_price'] = rng.choice([500, 1000, 2000, 5000, 10000])
+    if rng.random() < 0.2:
+        params['min_price'] = rng.choice([100, 500, 1000])
+    return '/api/v1/search?' + urlencode(params)
+
+def _export(rng, manufacturers):
+    start = date.today() - timedelta(days=rng.choice([30, 90, 365]))
+    return '/api/v1/export?' + urlencode({'format': rng.choice(['csv', 'jsonl']),
+                                          'manufacturer': rng.choice(manufacturers),
+                                          'start': start.isoformat()})
+
+def _events(rng, manufacturers):
+    start = date.today() - timedelta(days=rng.choice([7, 30, 90]))
+    return '/api/v1/events?' + urlencode({'start': start.isoformat(), 'limit': 500})
+
+# (name, weight, path(rng, manufacturers)) -- roughly the site's traffic
+SCENARIOS = [
+    ('landing', 20, lambda rng, m: '/'),
+    ('dashboard', 20, lambda rng, m: '/api/v1/dashboard'),
+    ('analytics_page', 10, lambda rng, m: '/analytics'),
+    ('search', 25, _search),
+    ('quantiles', 8, lambda rng, m: '/api/v1/stats/quantiles?' + urlencode({'manufacturer': rng.choice(m)})),
+    ('events', 7, _events),
+    ('export', 5, _export),
+    ('download_latest', 5, lambda rng, m: '/api/v1/download/latest')
+]
+
+# ==================== SYNTHETIC DATA ====================
+
+MODELS = {
+    'Toyota': ['Corolla', 'Vitz', 'Prius', 'Aqua', 'Hilux'], 'Nissan': ['Tiida', 'Leaf', 'Note', 'Navara'],
+    'Mazda': ['Demio', 'Axela', 'Atenza', 'CX-5'], 'Honda': ['Fit', 'Civic', 'Odyssey'],
+    'Mitsubishi': ['Mirage', 'Outlander', 'Lancer'], 'Subaru': ['Legacy', 'Impreza', 'Forester'],
+    'Suzuki': ['Swift', 'Alto'], 'Ford': ['Focus', 'Ranger', 'Falcon']
+}
+DAMAGE = ['Front Damage', 'Rear Damage', 'Left Front Damage', 'Right Rear Damage', 'Airbags Deployed',
+          'Water Damage', 'Fire Damage', 'Vandalised - Interior', 'Stolen & Recovered', 'Glass Broken',
+          'Impact Heavy', 'Impact Medium', 'Impact Light', 'Structural Damage']
+RAW_COLUMNS = ['Manufacturer', 'Model', 'Registration Status', 'Price', 'Mileage', 'Keys',
+               'Damage description', 'Transmission', 'Seats', 'Fuel Type', 'Link']
+
+def _listing(rng, vehicle_id):
+    manufacturer = rng.choice(list(MODELS))
+    model = rng.choice(MODELS[manufacturer])
+    year = rng.randint(1995, 2022)
+    registered = rng.random() < 0.5
+    damage = rng.sample(DAMAGE, rng.randint(1, 3))
+    return {
+        'Manufacturer': manufacturer,
+        'Model': model,
+        'Registration Status': 'Yes' if registered else 'No',
+        'Price': f"${rng.choice([0, rng.randint(1, 150) * 100]):,}",
+        'Mileage': f"{rng.randint(20, 350) * 1000:,}" if rng.random() < 0.8 else 'N/A',
+        'Keys': rng.choice(['Yes', 'No', '']),
+        'Damage description': ' ' + ', '.join(damage + ['Selling Registered' if registered else 'Selling De-Registered']),
+        'Transmission': rng.choice(['Automatic,', 'Manual,', '4spd,', 'CVT,']),
+        'Seats': rng.choice([2, 4, 5, 7]),
+        'Fuel Type': rng.choice(['Petrol', 'Diesel', 'Hybrid', 'Electric']),
+        'Link': f"https://manheim.co.nz/damaged-vehicles/{vehicle_id:018d}/"
+                f"{year}-{manufacturer.lower()}-{model.lower()}?referringPage=SearchResults"
+    }
+
+def generate_dataset(directory, days=90, listings=500, seed=0):
+    """Write ``days`` daily raw files ending today into ``directory``/data/raw,
+    with about ``listings`` vehicles a day, and build the processed data"""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    raw_dir = directory / 'data' / 'raw'
+    raw_dir.mkdir(parents=True, exist_ok=True)
+
+    active, next_id = {}, 7_000_000
+    for offset in range(days - 1, -1, -1):
+        for vehicle_id in [v for v in active if rng.random() < 0.08]:
+            del active[vehicle_id]  # Sold
+        for row in active.values():
+            if rng.random() < 0.03:
+                row['Price'] = f"${rng.randint(1, 150) * 100:,}"
+        while len(active) < listings:
+            active[next_id] = _listing(rng, next_id)
+            next_id += rng.randint(1, 3)
+        day = date.today() - timedelta(days=offset)
+        with open(raw_dir / f"car_data_{day.isoformat()}.csv", 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=RAW_COLUMNS)
+            writer.writeheader()
+            writer.writerows(active.values())
+
+    subprocess.run([sys.executable, str(REPO_DIR / 'clean_data.py')], cwd=directory, check=True,
+                   stdout=subprocess.DEVNULL)
+
+def simulate_scrape(directory, stop, interval=0.2, seed=1):
+    """Append a listing every ``interval`` seconds to tomorrow's temp raw file
+    in ``directory``/data/raw, as the scraper's writer does, until ``stop`` is set"""
+    rng = random.Random(seed)
+    path = Path(directory) / 'data' / 'raw' / f"car_data_{(date.today() + timedelta(days=1)).isoformat()}.csv.tmp"
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RAW_COLUMNS)
+        writer.writeheader()
+        vehicle_id = 9_000_000
+        while not stop.wait(interval):
+            writer.writerow(_listing(rng, vehicle_id))
+            f.flush()
+            vehicle_id += 1
+    path.unlink()
+
+# ==================== SERVER ====================
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(data_dir, mode, log_path, workers=None):
+    """Gunicorn with gunicorn_config.py serving from ``data_dir``; returns (process, base url)"""
+    port = _free_port()
+    env = dict(os.environ, SERVING_MODE=mode)
+    if workers:
+        env['GUNICORN_WORKERS'] = str(workers)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', str(REPO_DIR / 'gunicorn_config.py'),
+         '--chdir', str(data_dir), '--pythonpath', str(REPO_DIR),
+         '-b', f'127.0.0.1:{port}', '--error-logfile', str(log_path), 'app_main:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Gunicorn exited with status {process.returncode}, see {log_path}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/about')
+            if conn.getresponse().status == 200:
+                return process, url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Gunicorn did not answer within 60 s, see {log_path}")
+
+# ==================== LOAD ====================
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+def fetch_manufacturers(url):
+    try:
+        parts = urlsplit(url)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+        conn.request('GET', '/api/v1/manufacturers')
+        response = conn.getresponse()
+        if response.status == 200:
+            return [m['manufacturer'] for m in json.loads(response.read())[:20]] or DEFAULT_MANUFACTURERS
+    except (OSError, ValueError, KeyError):
+        pass
+    return DEFAULT_MANUFACTURERS
+
+def run_load(url, duration, users, warmup=5.0, think=0.0, seed=0, live_clients=0):
+    """Replay SCENARIOS from ``users`` concurrent clients, alongside
+    ``live_clients`` followers of the live feed; returns
+    {scenario: {'latencies': [ms of 2xx responses], 'statuses': Counter}}"""
+    parts = urlsplit(url)
+    manufacturers = fetch_manufacturers(url)
+    names = [name for name, _, _ in SCENARIOS]
+    weights = [weight for _, weight, _ in SCENARIOS]
+    paths = {name: path for name, _, path in SCENARIOS}
+    results = {name: {'latencies': [], 'statuses': Counter()} for name in names}
+    if live_clients:
+        results['live'] = {'latencies': [], 'statuses': Counter()}
+    lock = threading.Lock()
+    start = time.time()
+    measure_from, stop = start + warmup, start + warmup + duration
+
+    def user(index):
+        rng = random.Random(seed * 1000 + index)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+        while time.time() < stop:
+            name = rng.choices(names, weights)[0]
+            began = time.perf_counter()
+            try:
+                conn.request('GET', paths[name](rng, manufacturers))
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+                if response.getheader('Connection', '').lower() == 'close':
+                    conn.close()
+            except OSError:
+                status = 'error'
+                conn.close()
+            record(name, status, (time.perf_counter() - began) * 1000)
+            if think:
+                time.sleep(rng.expovariate(1 / think))
+
+    def record(name, status, elapsed, warm=False):
+        if warm or time.time() >= measure_from:
+            with lock:
+                results[name]['statuses'][status] += 1
+                if isinstance(status, int) and status < 400:
+                    results[name]['latencies'].append(elapsed)
+
+    def follower():
+        # What EventSource does: hold the stream, reconnect with the last id
+        last_event_id = None
+        while time.time() < stop:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=120)
+            headers = {'Accept': 'text/event-stream'}
+            if last_event_id:
+                headers['Last-Event-ID'] = last_event_id
+            began = time.perf_counter()
+            try:
+                conn.request('GET', '/api/v1/live', headers=headers)
+                response = conn.getresponse()
+                status = response.status
+                if status == 200:
+                    response.readline()  # The retry: field, sent first
+                # Streams opened in the warmup are held through the run, so they count
+                record('live', status, (time.perf_counter() - began) * 1000, warm=True)
+                if status == 200:
+                    conn.sock.settimeout(5)  # Reconnect after an idle spell, to notice the end of the run
+                    while time.time() < stop:
+                        line = response.readline()
+                        if not line:
+                            break
+                        if line.startswith(b'id: '):
+                            last_event_id = line[4:].strip().decode()
+            except TimeoutError:
+                pass
+            except OSError:
+                if time.time() < stop:
+                    record('live', 'error', (time.perf_counter() - began) * 1000)
+            finally:
+                conn.close()
+            if time.time() < stop:
+                time.sleep(2)  # The retry delay the feed suggests
+
+    threads = [threading.Thread(target=follower, daemon=True) for _ in range(live_clients)]
+    threads += [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def summarize(results, duration, budgets):
+    """Per-scenario report rows and the list of budget violations"""
+    rows, violations = [], []
+    for name, result in results.items():
+        latencies = sorted(result['latencies'])
+        total = sum(result['statuses'].values())
+        failed = total - len(latencies)
+        row = {
+            'scenario': name,
+            'requests': total,
+            'throughput': round(total / duration, 2),
+            'error_rate': round(failed / total, 4) if total else 0.0,
+            'statuses': {str(k): v for k, v in sorted(result['statuses'].items(), key=str)},
+            **{p: round(percentile(latencies, q), 1) if latencies else None
+               for p, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))}
+        }
+        rows.append(row)
+        budget = {**budgets.get('*', {}), **budgets.get(name, {})}
+        for key, limit in budget.items():
+            value = row.get(key)
+            if value is not None and value > limit:
+                violations.append(f"{name}: {key} {value} > {limit}")
+    return rows, violations
+
+def print_report(rows, violations):
+    print(f"\n{'scenario':<16} {'req':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  statuses")
+    for row in rows:
+        p50, p95, p99 = (f"{row[p]:.0f}" if row[p] is not None else '-' for p in ('p50', 'p95', 'p99'))
+        print(f"{row['scenario']:<16} {row['requests']:>6} {row['throughput']:>7.1f} {p50:>8} {p95:>8} {p99:>8} "
+              f"{row['error_rate']:>7.1%}  {row['statuses']}")
+    total = sum(row['requests'] for row in rows)
+    print(f"\nTotal: {total} requests")
+    if violations:
+        print(f"\n❌ {len(violations)} budget(s) exceeded:")
+        for violation in violations:
+            print(f"  {violation}")
+    else:
+        print("\n✅ All latency budgets met")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the web app against latency budgets")
+    parser.add_argument('--url', help="Test a running server instead of starting one")
+    parser.add_argument('--data', default='.', help="Directory with data/raw and data/processed (default: .)")
+    parser.add_argument('--generate', type=int, metavar='DAYS', help="Serve a generated dataset of DAYS days")
+    parser.add_argument('--mode', choices=['sync', 'threaded'], default=os.environ.get('SERVING_MODE', 'sync'))
+    parser.add_argument('--workers', type=int, help="Gunicorn workers (default: gunicorn_config.py)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Measured seconds (default: 30)")
+    parser.add_argument('--warmup', type=float, default=5.0, help="Unmeasured seconds first (default: 5)")
+    parser.add_argument('--users', type=int, default=8, help="Concurrent clients (default: 8)")
+    parser.add_argument('--live-clients', type=int,
+                        help="Clients following the live feed (default: 4 in threaded mode, else 0)")
+    parser.add_argument('--think', type=float, default=0.0, help="Mean pause between a client's requests (s)")
+    parser.add_argument('--budgets', help="JSON file of budgets, shaped like BUDGETS")
+    parser.add_argument('--report', help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    live_clients = args.live_clients if args.live_clients is not None else (4 if args.mode == 'threaded' else 0)
+    budgets = BUDGETS
+    if args.budgets:
+        with open(args.budgets) as f:
+            budgets = json.load(f)
+
+    process, temp_dir, scrape = None, None, None
+    scrape_stop = threading.Event()
+    try:
+        url = args.url
+        if not url:
+            data_dir = Path(args.data).resolve()
+            temp_dir = Path(tempfile.mkdtemp(prefix='loadtest-'))
+            if args.generate:
+                print(f"Generating {args.generate} days of data...")
+                data_dir = temp_dir
+                generate_dataset(data_dir, days=args.generate)
+            process, url = start_server(data_dir, args.mode, temp_dir / 'gunicorn.log', args.workers)
+            print(f"Started Gunicorn ({args.mode}) on {url}, serving {data_dir}")
+            if args.generate and live_clients:
+                scrape = threading.Thread(target=simulate_scrape, args=(data_dir, scrape_stop), daemon=True)
+                scrape.start()
+
+        print(f"Running {args.users} users and {live_clients} live clients "
+              f"for {args.warmup:.0f} s warmup + {args.duration:.0f} s...")
+        results = run_load(url, args.duration, args.users, args.warmup, args.think, live_clients=live_clients)
+    finally:
+        if scrape:
+            scrape_stop.set()
+            scrape.join()
+        if process:
+            process.terminate()
+            process.wait(timeout=30)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    rows, violations = summarize(results, args.duration, budgets)
+    print_report(rows, violations)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'mode': args.mode, 'users': args.users, 'live_clients': live_clients, 'duration': args.duration,
+                       'scenarios': rows, 'violations': violations}, f, indent=2)
+    return 1 if violations else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
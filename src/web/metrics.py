@@ -0,0 +1,279 @@
+"""
+Request metrics for the web app, exported in Prometheus text format.
+
+``WebMetrics.init_app(app)`` records for every request
+
+    http_requests_total            by route, method and status
+    http_request_duration_seconds  histogram by route (until the response,
+                                   streamed or not, is closed)
+    http_response_size_bytes       histogram by route (when the size is known)
+    http_request_phase_seconds     histogram by route and phase: ``catalog``
+                                   (raw file catalog refresh), ``load`` (files
+                                   and stores read), ``serialize`` (JSON
+                                   encoding) and ``compute`` (the rest)
+
+and ``cache_requests_total`` (by cache and hit/miss) counts what the caches
+report. Handlers time a phase with ``with metrics.phase('load'):``.
+
+Histograms are fixed bucket counts, so memory does not grow with traffic
+and recording a request is a few dictionary updates under a lock. Each
+Gunicorn worker is a separate process, so every worker writes its totals to
+``data/metrics/web/<pid>.json`` every few seconds while it serves requests,
+and ``render()`` merges the snapshots of the workers still running into one
+exposition (the other workers' figures lag by up to ``SNAPSHOT_INTERVAL``).
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+METRICS_DIR = Path("data/metrics/web")
+SNAPSHOT_INTERVAL = 5.0  # seconds between a worker's snapshot writes
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+PHASES = ('catalog', 'load', 'serialize', 'compute')
+
+FAMILIES = {
+    'http_requests_total': ('counter', 'Requests by route, method and status code.'),
+    'http_request_duration_seconds': ('histogram', 'Request latency by route.'),
+    'http_response_size_bytes': ('histogram', 'Response body size by route.'),
+    'http_request_phase_seconds': ('histogram', 'Time per request phase by route.'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result.'),
+    'offload_rejected_total': ('counter', 'Heavy requests refused with 503 because the offload pool was full.'),
+    'offload_timeouts_total': ('counter', 'Heavy requests answered with 504 after their timeout.')
+}
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+def _labels(labels):
+    return ','.join(f'{k}="{v}"' for k, v in labels)
+
+class Histogram:
+    """Cumulative-on-export bucket counts plus sum and count"""
+
+    def __init__(self, bounds, counts=None, total=0.0, count=0):
+        self.bounds = tuple(bounds)
+        self.counts = list(counts) if counts else [0] * (len(bounds) + 1)
+        self.total = total
+        self.count = count
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.count += other.count
+
+    def to_dict(self):
+        return {'bounds': self.bounds, 'counts': self.counts, 'sum': self.total, 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['bounds'], d['counts'], d['sum'], d['count'])
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, timing encoding as the ``serialize`` phase"""
+
+    def dumps(self, obj, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            _add_phase('serialize', time.perf_counter() - start)
+
+def _add_phase(phase, seconds):
+    # Kept in the WSGI environ, which offloaded handlers share with the request
+    if has_request_context():
+        phases = request.environ.setdefault('metrics.phases', Counter())
+        phases[phase] += seconds
+
+class WebMetrics:
+    """Per-worker request metrics with snapshot merging across workers"""
+
+    def __init__(self, snapshot_dir=METRICS_DIR, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.snapshot_interval = snapshot_interval
+        self.lock = threading.Lock()
+        self.counters = Counter()  # (family, labels) -> value
+        self.histograms = {}  # (family, labels) -> Histogram
+        self.routes = {}  # route -> its histograms
+        self.sources = []
+        self.last_snapshot = 0.0
+        self.snapshot_timer = None
+
+    def init_app(self, app):
+        app.json = TimedJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def add_source(self, source):
+        """Register ``source()`` returning {(family, labels): value} of counters
+        kept elsewhere (e.g. cache statistics), read at snapshot time"""
+        self.sources.append(source)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _add_phase(name, time.perf_counter() - start)
+
+    def count_cache(self, cache, hit):
+        with self.lock:
+            self.counters[('cache_requests_total', (('cache', cache), ('result', 'hit' if hit else 'miss')))] += 1
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+
+    def _after_request(self, response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        handled = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        phases = request.environ.get('metrics.phases', {})
+        size = response.content_length if not response.is_streamed else None
+        method, status = request.method, str(response.status_code)
+
+        def record():
+            elapsed = time.perf_counter() - start
+            compute = max(handled - sum(phases.values()), 0.0)
+            with self.lock:
+                self.counters[('http_requests_total', (('method', method), ('route', route), ('status', status)))] += 1
+                duration, sizes, phase_histograms = self._route_histograms(route)
+                duration.observe(elapsed)
+                if size is not None:
+                    sizes.observe(size)
+                for phase, histogram in phase_histograms.items():
+                    histogram.observe(compute if phase == 'compute' else phases.get(phase, 0.0))
+            self._schedule_snapshot()
+
+        response.call_on_close(record)
+        return response
+
+    def _schedule_snapshot(self):
+        # Write now if due, otherwise once the interval is up, so the last
+        # requests before a worker goes idle are not left out of the snapshot
+        if time.time() - self.last_snapshot > self.snapshot_interval:
+            self.write_snapshot()
+        elif self.snapshot_timer is None:
+            with self.lock:
+                if self.snapshot_timer is None:
+                    self.snapshot_timer = threading.Timer(self.snapshot_interval, self.write_snapshot)
+                    self.snapshot_timer.daemon = True
+                    self.snapshot_timer.start()
+
+    def _route_histograms(self, route):
+        # Created together on a route's first request; called under the lock
+        if route not in self.routes:
+            def histogram(family, labels, bounds):
+                return self.histograms.setdefault((family, labels), Histogram(bounds))
+            self.routes[route] = (
+                histogram('http_request_duration_seconds', (('route', route),), LATENCY_BUCKETS),
+                histogram('http_response_size_bytes', (('route', route),), SIZE_BUCKETS),
+                {phase: histogram('http_request_phase_seconds', (('phase', phase), ('route', route)), LATENCY_BUCKETS)
+                 for phase in PHASES}
+            )
+        return self.routes[route]
+
+    def snapshot(self):
+        counters = Counter()
+        for source in self.sources:
+            counters.update(source())
+        with self.lock:
+            counters.update(self.counters)
+            histograms = {key: h.to_dict() for key, h in self.histograms.items()}
+        return {
+            'pid': os.getpid(),
+            'written_at': time.time(),
+            'counters': [[family, labels, value] for (family, labels), value in counters.items()],
+            'histograms': [[family, labels, h] for (family, labels), h in histograms.items()]
+        }
+
+    def write_snapshot(self):
+        self.last_snapshot = time.time()
+        self.snapshot_timer = None
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            path = self.snapshot_dir / f"{os.getpid()}.json"
+            temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            with open(temp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(temp_path, path)
+        except OSError:
+            pass  # Metrics must never fail a request
+
+    def merged(self):
+        """This worker's live totals merged with the other live workers' snapshots"""
+        snapshots = [self.snapshot()]
+        if self.snapshot_dir.exists():
+            for path in self.snapshot_dir.glob('*.json'):
+                pid = int(path.stem) if path.stem.isdigit() else None
+                if pid is None or pid == os.getpid():
+                    continue
+                if not _pid_alive(pid):
+                    path.unlink(missing_ok=True)  # An exited worker: its counters reset
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    pass
+
+        counters = Counter()
+        histograms = {}
+        for snapshot in snapshots:
+            for family, labels, value in snapshot['counters']:
+                counters[(family, tuple(map(tuple, labels)))] += value
+            for family, labels, h in snapshot['histograms']:
+                key = (family, tuple(map(tuple, labels)))
+                if key in histograms:
+                    histograms[key].merge(Histogram.from_dict(h))
+                else:
+                    histograms[key] = Histogram.from_dict(h)
+        return counters, histograms, len(snapshots)
+
+    def render(self):
+        """Prometheus text exposition of all workers"""
+        counters, histograms, workers = self.merged()
+        lines = []
+        for family, (kind, help_text) in FAMILIES.items():
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            if kind == 'counter':
+                for (name, labels), value in sorted(counters.items()):
+                    if name == family:
+                        lines.append(f"{family}{{{_labels(labels)}}} {value}" if labels else f"{family} {value}")
+                continue
+            for (name, labels), h in sorted(histograms.items(), key=lambda item: item[0]):
+                if name != family:
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(h.bounds) + ['+Inf'], h.counts):
+                    cumulative += count
+                    lines.append(f'{family}_bucket{{{_labels(labels + (("le", bound),))}}} {cumulative}')
+                lines.append(f"{family}_sum{{{_labels(labels)}}} {h.total:.6f}")
+                lines.append(f"{family}_count{{{_labels(labels)}}} {h.count}")
+        lines.append("# HELP web_workers Worker processes included in these metrics.")
+        lines.append("# TYPE web_workers gauge")
+        lines.append(f"web_workers {workers}")
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,84 @@
+"""
+Bounded offload pool for heavy API handlers.
+
+Handlers decorated with ``offload(pool, timeout)`` run on a small per-worker
+thread pool instead of the thread serving the request:
+
+    - at most ``max_workers`` heavy handlers run at once, so cheap requests
+      (page renders, cached endpoints) served by the worker's other threads
+      are not starved by pandas work;
+    - at most ``max_pending`` more wait for a slot; beyond that the request
+      is refused at once with 503 and ``Retry-After`` (backpressure) rather
+      than queueing without bound;
+    - a handler that has not finished within its timeout answers 504. The
+      work itself cannot be interrupted and keeps its slot until it ends, so
+      a burst of slow requests turns into 503s instead of a growing queue.
+
+With the default sync Gunicorn workers each worker serves one request at a
+time and the pool only adds the timeouts; with ``SERVING_MODE=threaded``
+(see gunicorn_config.py) it bounds the heavy work among the threads.
+"""
+
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import copy_current_request_context, jsonify
+
+class Overloaded(Exception):
+    """Raised when the pool and its queue are full"""
+
+class OffloadPool:
+    """Thread pool with a bounded number of running plus waiting tasks"""
+
+    def __init__(self, max_workers=2, max_pending=8):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.executor = None
+        self.lock = threading.Lock()
+        self.rejected = 0
+        self.timed_out = 0
+
+    def submit(self, fn, *args, **kwargs):
+        """Start ``fn`` on the pool, or raise Overloaded if it is full"""
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise Overloaded()
+        try:
+            with self.lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='offload')
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def run(self, fn, timeout, *args, **kwargs):
+        """``fn(*args, **kwargs)`` on the pool; raises Overloaded or TimeoutError"""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            with self.lock:
+                self.timed_out += 1
+            raise
+
+def offload(pool, timeout):
+    """Decorator running a Flask view on ``pool`` with a ``timeout`` in seconds"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                return pool.run(copy_current_request_context(view), timeout, *args, **kwargs)
+            except Overloaded:
+                response = jsonify({'error': 'Server busy, try again shortly'})
+                response.headers['Retry-After'] = '1'
+                return response, 503
+            except TimeoutError:
+                return jsonify({'error': f'Request timed out after {timeout}s'}), 504
+        return wrapper
+    return decorator
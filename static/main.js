@@ -1,31 +1,43 @@
-const socket = io('/console');
+// Live feed of the listings being scraped (Server-Sent Events from /api/v1/live).
+// EventSource reconnects by itself and sends Last-Event-ID, so the server
+// replays any rows written while the connection was down. The page only
+// includes this script while a scrape is in progress.
 
-socket.on('connect', () => {
-  console.log('Connected to console namespace');
-});
+const MAX_LIVE_ROWS = 50;
 
-socket.on('console_output', (data) => {
-  // Update the webpage with the console output
-  const outputContainer = document.getElementById('console-output');
-  outputContainer.innerText += data.output + '\n';
-});
+function startLiveFeed(container, status) {
+  const source = new EventSource('/api/v1/live');
 
-socket.on('console_connected', (data) => {
-  console.log('Console connected:', data.data);
-});
+  source.onopen = () => {
+    if (status) status.textContent = 'Live';
+  };
 
-socket.on('disconnect', () => {
-  console.log('Disconnected from console namespace');
-});
+  source.onerror = () => {
+    // The server answers 204 once the scrape is over, which closes the source
+    if (status) status.textContent = source.readyState === EventSource.CLOSED ? 'Finished' : 'Reconnecting...';
+  };
 
-function runScript() {
-  const xhr = new XMLHttpRequest();
-  xhr.open('POST', '/run_script', true);
-  xhr.onload = function () {
-    if (xhr.readyState === 4 && xhr.status === 200) {
-      // Start running the script
-      console.log(xhr.responseText);
+  source.addEventListener('listing', (event) => {
+    const listing = JSON.parse(event.data);
+    const item = document.createElement('li');
+    item.className = 'list-group-item';
+    const link = document.createElement('a');
+    link.href = listing.Link;
+    link.target = '_blank';
+    link.textContent = `${listing.Manufacturer} ${listing.Model}`;
+    item.append(link, ` ${listing.Price} - ${listing['Damage description'] || ''}`);
+    container.prepend(item);
+    while (container.children.length > MAX_LIVE_ROWS) {
+      container.lastChild.remove();
     }
-  };
-  xhr.send();
+  });
+
+  return source;
 }
+
+document.addEventListener('DOMContentLoaded', () => {
+  const container = document.getElementById('live-listings');
+  if (container) {
+    startLiveFeed(container, document.getElementById('live-status'));
+  }
+});
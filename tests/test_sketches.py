@@ -0,0 +1,96 @@
+"""
+Sketch estimates against exact values on a synthetic listings frame.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.sketches import (
+    HLL_REGISTERS, RELATIVE_ACCURACY, PriceSketches, VehicleSketches,
+    build_price_sketches, build_vehicle_sketches
+)
+
+QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+STANDARD_ERROR = 1.04 / np.sqrt(HLL_REGISTERS)
+
+@pytest.fixture(scope='module')
+def listings():
+    """60 days of listings: three spellings of Toyota, lognormal prices with
+    some $0 and sub-$1 starting bids, vehicles relisted over several days"""
+    rng = np.random.default_rng(0)
+    n = 200_000
+    manufacturers = np.array(['Toyota', 'TOYOTA', 'toyota ', 'Honda', 'Mazda', 'Nissan'])
+    prices = np.round(rng.lognormal(mean=8, sigma=1.2, size=n), 2)
+    prices[rng.random(n) < 0.05] = 0.0
+    prices[rng.random(n) < 0.01] = 0.5
+    return pd.DataFrame({
+        'Manufacturer': manufacturers[rng.integers(0, len(manufacturers), n)],
+        'scrape_date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 60, n), unit='D'),
+        'Price_USD': prices,
+        'Vehicle_ID': rng.integers(0, 60_000, n).astype(str)
+    })
+
+@pytest.fixture(scope='module')
+def price_sketches(listings, tmp_path_factory):
+    directory = tmp_path_factory.mktemp('price_sketches')
+    build_price_sketches(listings, directory)
+    return PriceSketches(directory)
+
+@pytest.fixture(scope='module')
+def vehicle_sketches(listings, tmp_path_factory):
+    directory = tmp_path_factory.mktemp('vehicle_sketches')
+    build_vehicle_sketches(listings, directory)
+    return VehicleSketches(directory)
+
+def select(listings, start=None, end=None, keys=None):
+    mask = np.ones(len(listings), dtype=bool)
+    if start is not None:
+        mask &= listings['scrape_date'].between(pd.Timestamp(start), pd.Timestamp(end)).to_numpy()
+    if keys is not None:
+        mask &= listings['Manufacturer'].str.strip().str.lower().isin(keys).to_numpy()
+    return listings[mask]
+
+CASES = [
+    (None, None, None, None),
+    ('2025-02-01', '2025-02-28', None, None),
+    ('2025-01-10', '2025-01-10', None, None),
+    (None, None, ['Toyota'], {'toyota'}),
+    ('2025-01-15', '2025-02-14', ['honda', 'MAZDA'], {'honda', 'mazda'}),
+]
+
+@pytest.mark.parametrize('start, end, manufacturers, keys', CASES)
+def test_quantiles_within_relative_accuracy(listings, price_sketches, start, end, manufacturers, keys):
+    prices = select(listings, start, end, keys)['Price_USD'].to_numpy()
+    n, estimates = price_sketches.quantiles(QUANTILES, start, end, manufacturers)
+
+    assert n == len(prices)
+    exact = np.quantile(prices, QUANTILES, method='lower')
+    for q, estimate, value in zip(QUANTILES, estimates, exact):
+        if value < 1:
+            assert estimate == 0, q
+        else:
+            # Estimates are rounded to cents
+            assert abs(estimate - value) <= RELATIVE_ACCURACY * value + 0.005, q
+
+def test_manufacturer_spellings_are_merged(price_sketches):
+    assert price_sketches.find(['Toyota']) == price_sketches.find(['TOYOTA'])
+    assert len(price_sketches.find(['toyota'])) == 3
+    assert price_sketches.find(['Unknown']) == []
+
+def test_empty_selection(price_sketches):
+    assert price_sketches.quantiles(QUANTILES, '2030-01-01', '2030-01-31') == (0, [None] * len(QUANTILES))
+
+@pytest.mark.parametrize('start, end, manufacturers, keys', CASES)
+def test_unique_vehicles_within_error(listings, vehicle_sketches, start, end, manufacturers, keys):
+    exact = select(listings, start, end, keys)['Vehicle_ID'].nunique()
+    estimate = vehicle_sketches.unique_vehicles(start, end, manufacturers)
+
+    assert abs(estimate - exact) <= 3 * STANDARD_ERROR * exact
+
+def test_unique_vehicles_empty_range(vehicle_sketches):
+    assert vehicle_sketches.unique_vehicles('2030-01-01', '2030-01-31') == 0
+    assert vehicle_sketches.unique_vehicles(manufacturers=['Unknown']) == 0